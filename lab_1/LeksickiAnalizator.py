@@ -1,6 +1,81 @@
+import mmap
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+from collections import namedtuple
 
-def obradi_izraz(izraz, rbr_redka):
+KLJUCNE_RIJECI = {
+    "za": "KR_ZA",
+    "od": "KR_OD",
+    "do": "KR_DO",
+    "az": "KR_AZ",
+}
+
+OPERATORI = {
+    "=": "OP_PRIDRUZI",
+    "+": "OP_PLUS",
+    "-": "OP_MINUS",
+    "*": "OP_PUTA",
+    "/": "OP_DIJELI",
+    "(": "L_ZAGRADA",
+    ")": "D_ZAGRADA",
+}
+
+# zapis jednog tokena koji daje tokenize()
+Token = namedtuple("Token", ["vrsta", "redak", "leksem"])
+
+KOMENTAR = "KOMENTAR"
+GRESKA = "NE odgovara sintaksi"
+
+VELICINA_SERIJE = 4096
+NAJMANJI_DIO = 1 << 16 # znakova po dijelu ulaza u paralelnom nacinu rada
+
+# kodovi vrsta tokena u NizTokena; redoslijed je isti kao stupci ulaznih znakova u lab_2
+VRSTE_TOKENA = [
+    "IDN",
+    "BROJ",
+    "OP_PRIDRUZI",
+    "OP_PLUS",
+    "OP_MINUS",
+    "OP_PUTA",
+    "OP_DIJELI",
+    "L_ZAGRADA",
+    "D_ZAGRADA",
+    "KR_ZA",
+    "KR_OD",
+    "KR_DO",
+    "KR_AZ",
+    GRESKA,
+]
+KODOVI_VRSTA = {vrsta: kod for kod, vrsta in enumerate(VRSTE_TOKENA)}
+VRSTE_B = {vrsta: vrsta.encode() for vrsta in VRSTE_TOKENA}
+GRESKA_B = GRESKA.encode()
+
+# rijeci koje su cijele jedan leksem prepoznajemo jednim pogledom u tablicu
+CIJELE_RIJECI = {**KLJUCNE_RIJECI, **OPERATORI}
+
+# uzorak za rijeci u kojima je vise leksema zaredom, npr. "x=2*(y+1)"
+UZORAK_RIJECI = re.compile(r"([A-Za-z][A-Za-z0-9]*)|([0-9]+)|(//|\S)")
+
+# isti jezik nad ASCII bajtovima za nacin rada s mmap; praznine su one koje priznaje str.split(),
+# a prelazak u novi redak je zasebna grupa pa se redci broje u istom prolazu
+PRAZNINE_B = rb"\t\n\x0b\x0c\r\x1c-\x1f "
+UZORAK_BAJTOVA = re.compile(rb"""
+    (\n)                                   # 1 - novi redak
+  | (?<![^%s])(za|od|do|az)(?![^%s])      # 2 - kljucna rijec
+  | ([A-Za-z][A-Za-z0-9]*)                # 3 - identifikator
+  | ([0-9]+)                              # 4 - broj
+  | (//[^\n]*)                            # 5 - komentar do kraja retka
+  | ([=+\-*/()])                          # 6 - operator ili zagrada
+  | ([^%s])                               # 7 - znak koji ne pripada jeziku
+""" % (PRAZNINE_B, PRAZNINE_B, PRAZNINE_B), re.VERBOSE)
+
+KLJUCNE_RIJECI_B = {rijec.encode(): vrsta for rijec, vrsta in KLJUCNE_RIJECI.items()}
+OPERATORI_B = {ord(znak): vrsta for znak, vrsta in OPERATORI.items()}
+
+
+def obradi_izraz(izraz):
     i = 0
 
     while i < len(izraz):
@@ -10,7 +85,7 @@ def obradi_izraz(izraz, rbr_redka):
             while i < len(izraz) and (izraz[i].isalnum()):
                 temp += izraz[i]
                 i += 1
-            print(f"IDN {rbr_redka} {temp}")
+            yield ("IDN", temp)
 
         elif izraz[i].isnumeric():
             temp = izraz[i]
@@ -18,58 +93,301 @@ def obradi_izraz(izraz, rbr_redka):
             while i < len(izraz) and (izraz[i].isnumeric()):
                 temp += izraz[i]
                 i += 1
-            print(f"BROJ {rbr_redka} {temp}")
+            yield ("BROJ", temp)
 
         else:
             if i is not len(izraz) - 1 and izraz[i] == "/" and izraz[i + 1] == "/":
-                return True
+                yield (KOMENTAR, izraz[i:])
+                return
             elif izraz[i] == "=":
-                print(f"OP_PRIDRUZI {rbr_redka} =")
+                yield ("OP_PRIDRUZI", "=")
             elif izraz[i] == "+":
-                print(f"OP_PLUS {rbr_redka} +")
+                yield ("OP_PLUS", "+")
             elif izraz[i] == "-":
-                print(f"OP_MINUS {rbr_redka} -")
+                yield ("OP_MINUS", "-")
             elif izraz[i] == "*":
-                print(f"OP_PUTA {rbr_redka} *")
+                yield ("OP_PUTA", "*")
             elif izraz[i] == "/":
-                print(f"OP_DIJELI {rbr_redka} /")
+                yield ("OP_DIJELI", "/")
             elif izraz[i] == "(":
-                print(f"L_ZAGRADA {rbr_redka} (")
+                yield ("L_ZAGRADA", "(")
             elif izraz[i] == ")":
-                print(f"D_ZAGRADA {rbr_redka} )")
+                yield ("D_ZAGRADA", ")")
             else:
-                print("NE odgovara sintaksi")
+                yield (GRESKA, izraz[i])
             i += 1
-    return False
-
-# Čitanje svega sa standardnog ulaza
-input_tekst = sys.stdin.read()
-rbr_redka = 0
 
-# Ispis pročitanih podataka
-# print("Pročitani podaci:\n")
-# print(input_tekst)
 
-polje_redaka = input_tekst.split("\n")
-# print(polje_redaka)
-
-for redak in polje_redaka:
-    rbr_redka += 1
+def obradi_redak_klasicno(redak):
     polje_izraza = redak.split()
-    # print(f"polje izraza je: {polje_izraza}")
 
     for izraz in polje_izraza:
         # provjera kljucnih rjeci
         if izraz == "za":
-            print(f"KR_ZA {rbr_redka} za")
+            yield ("KR_ZA", "za")
         elif izraz == "od":
-            print(f"KR_OD {rbr_redka} od")
+            yield ("KR_OD", "od")
         elif izraz == "do":
-            print(f"KR_DO {rbr_redka} do")
+            yield ("KR_DO", "do")
         elif izraz == "az":
-            print(f"KR_AZ {rbr_redka} az")
+            yield ("KR_AZ", "az")
+
+        else:
+            for vrsta, leksem in obradi_izraz(izraz):
+                if vrsta == KOMENTAR:
+                    return
+                yield (vrsta, leksem)
+
+
+def obradi_redak(redak):
+    tokeni = []
+    dodaj = tokeni.append
+
+    for izraz in redak.split():
+        vrsta = CIJELE_RIJECI.get(izraz)
+        if vrsta is not None:
+            dodaj((vrsta, izraz))
+
+        elif not izraz.isascii():
+            # isalpha/isnumeric su svjesni Unicodea, pa takve rijeci prepustamo
+            # klasicnom skeneru da bi niz tokena ostao isti
+            for vrsta, leksem in obradi_izraz(izraz):
+                if vrsta == KOMENTAR:
+                    return tokeni
+                dodaj((vrsta, leksem))
+
+        elif izraz.isalnum() and izraz[0] > "9":
+            dodaj(("IDN", izraz))
+
+        elif izraz.isdigit():
+            dodaj(("BROJ", izraz))
+
+        else:
+            for idn, broj, znak in UZORAK_RIJECI.findall(izraz):
+                if idn:
+                    dodaj(("IDN", idn))
+                elif broj:
+                    dodaj(("BROJ", broj))
+                elif znak == "//":
+                    return tokeni
+                else:
+                    dodaj((OPERATORI.get(znak, GRESKA), znak))
+
+    return tokeni
+
+
+def formatiraj(vrsta, rbr_redka, leksem):
+    if vrsta == GRESKA:
+        return GRESKA
+    return f"{vrsta} {rbr_redka} {leksem}"
+
+
+# lijeno cita ulaz redak po redak i vraca tokene kao zapise Token(vrsta, redak, leksem);
+# stream je bilo sto po cemu se iterira po redcima (datoteka, sys.stdin, lista stringova),
+# pa memorija ovisi samo o najduljem retku, a ne o velicini ulaza
+def tokenize(stream, obradi=obradi_redak):
+    rbr_redka = 0
+    for redak in stream:
+        rbr_redka += 1
+        for vrsta, leksem in obradi(redak):
+            yield Token(vrsta, rbr_redka, leksem)
+
+
+# leksira datoteku kroz mmap kao ASCII bajtove, bez dekodiranja i bez kopiranja u str;
+# leksemi su memoryview isjecci mapirane datoteke sve dok se ne ispisu
+def tokenize_mmap(putanja):
+    with open(putanja, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return
+        # mapa ostaje ziva dok god postoji neki isjecak, pa je ne zatvaramo rucno
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
+    pogled = memoryview(mapa)
+    rbr_redka = 1
+    for pogodak in UZORAK_BAJTOVA.finditer(mapa):
+        razred = pogodak.lastindex
+        if razred == 1:
+            rbr_redka += 1
+        elif razred == 5:
+            continue
         else:
-            izraz_je_komentar = obradi_izraz(izraz, rbr_redka)
-            if izraz_je_komentar:
-                break
\ No newline at end of file
+            pocetak, kraj = pogodak.span()
+            leksem = pogled[pocetak:kraj]
+            if razred == 3:
+                yield Token("IDN", rbr_redka, leksem)
+            elif razred == 6:
+                yield Token(OPERATORI_B[mapa[pocetak]], rbr_redka, leksem)
+            elif razred == 4:
+                yield Token("BROJ", rbr_redka, leksem)
+            elif razred == 2:
+                yield Token(KLJUCNE_RIJECI_B[leksem], rbr_redka, leksem)
+            else:
+                yield Token(GRESKA, rbr_redka, leksem)
+
+
+def formatiraj_bajtove(vrsta, rbr_redka, leksem):
+    if vrsta == GRESKA:
+        return GRESKA_B
+    return b"%b %d %b" % (VRSTE_B[vrsta], rbr_redka, leksem)
+
+
+class NizTokena:
+    # kompaktni niz tokena: vrste su kodovi u array('B'), redci u array('I'), a leksemi
+    # su indeksi u tablicu u kojoj je svaki razliciti leksem spremljen samo jednom
+    def __init__(self):
+        self.vrste = array("B")
+        self.redci = array("I")
+        self.leksemi = array("I")
+        self.tablica_leksema = []
+        self.indeksi_leksema = {}
+
+    @classmethod
+    def iz_tokena(cls, tokeni):
+        niz = cls()
+        for vrsta, redak, leksem in tokeni:
+            niz.dodaj(vrsta, redak, leksem)
+        return niz
+
+    # iz gotovih stupaca (bajtova polja vrsta, redaka i indeksa leksema) i tablice leksema
+    @classmethod
+    def iz_polja(cls, vrste, redci, leksemi, tablica_leksema):
+        niz = cls()
+        niz.vrste.frombytes(vrste)
+        niz.redci.frombytes(redci)
+        niz.leksemi.frombytes(leksemi)
+        niz.tablica_leksema = tablica_leksema
+        niz.indeksi_leksema = {leksem: indeks for indeks, leksem in enumerate(tablica_leksema)}
+        return niz
+
+    # redci oblika "IDN 3 x", kakve ispisuje lab_1
+    @classmethod
+    def iz_teksta(cls, redci):
+        niz = cls()
+        for redak in redci:
+            redak = redak.strip()
+            if not redak:
+                continue
+            if redak == GRESKA:
+                niz.dodaj(GRESKA, 0, "")
+                continue
+            vrsta, rbr_redka, leksem = redak.split(" ", 2)
+            niz.dodaj(vrsta, int(rbr_redka), leksem)
+        return niz
+
+    def dodaj(self, vrsta, redak, leksem):
+        indeks = self.indeksi_leksema.get(leksem)
+        if indeks is None:
+            indeks = len(self.tablica_leksema)
+            self.tablica_leksema.append(leksem)
+            self.indeksi_leksema[leksem] = indeks
+        self.vrste.append(KODOVI_VRSTA[vrsta])
+        self.redci.append(redak)
+        self.leksemi.append(indeks)
+
+    # odbacuje sve tokene od indeksa duljina nadalje; tablica leksema ostaje kakva je
+    def skrati(self, duljina):
+        del self.vrste[duljina:]
+        del self.redci[duljina:]
+        del self.leksemi[duljina:]
+
+    def __len__(self):
+        return len(self.vrste)
+
+    def vrsta(self, i):
+        return VRSTE_TOKENA[self.vrste[i]]
+
+    def redak(self, i):
+        return self.redci[i]
+
+    def leksem(self, i):
+        return self.tablica_leksema[self.leksemi[i]]
+
+    def __getitem__(self, i):
+        return Token(VRSTE_TOKENA[self.vrste[i]], self.redci[i], self.tablica_leksema[self.leksemi[i]])
+
+    # vrste i leksemi dolaze iz zajednickih tablica, pa se pri prolasku ne stvara novi string po tokenu
+    def __iter__(self):
+        tablica = self.tablica_leksema
+        for kod, redak, indeks in zip(self.vrste, self.redci, self.leksemi):
+            yield Token(VRSTE_TOKENA[kod], redak, tablica[indeks])
+
+    def redak_ispisa(self, i):
+        return formatiraj(self.vrsta(i), self.redci[i], self.leksem(i))
+
+
+# tokeni i komentari nikad ne prelaze preko kraja retka, pa ulaz mozemo rezati na granicama redaka;
+# svaki dio nosi redni broj svog prvog retka da bi redci u ispisu bili isti kao u serijskom radu
+def podijeli_na_dijelove(input_tekst, broj_dijelova):
+    velicina = max(NAJMANJI_DIO, len(input_tekst) // broj_dijelova)
+    pocetak = 0
+    rbr_redka = 1
+    while True:
+        kraj = input_tekst.find("\n", pocetak + velicina)
+        if kraj == -1:
+            yield (input_tekst[pocetak:], rbr_redka)
+            return
+        dio = input_tekst[pocetak:kraj]
+        yield (dio, rbr_redka)
+        rbr_redka += dio.count("\n") + 1
+        pocetak = kraj + 1
+
+
+def leksiraj_dio(dio):
+    tekst, rbr_redka = dio
+    izlaz = []
+    for redak in tekst.split("\n"):
+        for vrsta, leksem in obradi_redak(redak):
+            izlaz.append(formatiraj(vrsta, rbr_redka, leksem))
+        rbr_redka += 1
+    return "\n".join(izlaz)
+
+
+def leksiraj_paralelno(input_tekst, broj_poslova):
+    dijelovi = podijeli_na_dijelove(input_tekst, broj_poslova * 4)
+    with ProcessPoolExecutor(max_workers=broj_poslova) as izvrsitelj:
+        # map vraca rezultate redom kojim su dijelovi poslani
+        for ispis_dijela in izvrsitelj.map(leksiraj_dio, dijelovi):
+            if ispis_dijela:
+                yield ispis_dijela + "\n"
+
+
+def main():
+    if "--mmap" in sys.argv[1:]:
+        putanja = sys.argv[sys.argv.index("--mmap") + 1]
+        serija = []
+        for token in tokenize_mmap(putanja):
+            serija.append(formatiraj_bajtove(*token))
+            if len(serija) >= VELICINA_SERIJE:
+                sys.stdout.buffer.write(b"\n".join(serija) + b"\n")
+                serija.clear()
+        if serija:
+            sys.stdout.buffer.write(b"\n".join(serija) + b"\n")
+        return
+
+    if "--jobs" in sys.argv[1:]:
+        try:
+            broj_poslova = int(sys.argv[sys.argv.index("--jobs") + 1])
+        except (IndexError, ValueError):
+            broj_poslova = 0
+        if broj_poslova < 1:
+            print("upotreba: LeksickiAnalizator.py --jobs N < program.pj (N je broj procesa, barem 1)", file=sys.stderr)
+            sys.exit(2)
+        for ispis_dijela in leksiraj_paralelno(sys.stdin.read(), broj_poslova):
+            sys.stdout.write(ispis_dijela)
+        return
+
+    obradi = obradi_redak_klasicno if "--klasicno" in sys.argv[1:] else obradi_redak
+
+    # ispis skupljamo u serije da ne pozivamo write za svaki token
+    serija = []
+    for token in tokenize(sys.stdin, obradi):
+        serija.append(formatiraj(*token))
+        if len(serija) >= VELICINA_SERIJE:
+            sys.stdout.write("\n".join(serija) + "\n")
+            serija.clear()
+    if serija:
+        sys.stdout.write("\n".join(serija) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import hashlib
+import io
+import itertools
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lab_1.LeksickiAnalizator import (
+    NizTokena, formatiraj, formatiraj_bajtove, obradi_redak, obradi_redak_klasicno, tokenize, tokenize_mmap,
+)
+
+
+# Generiranje velikog PJ programa za mjerenje
+def generiraj_izraz(rnd, dubina=0):
+    if dubina > 2 or rnd.random() < 0.4:
+        return rnd.choice([rnd.choice(["x", "y", "brojac", "rez", "a1"]), str(rnd.randint(0, 999))])
+    if rnd.random() < 0.2:
+        return "( " + generiraj_izraz(rnd, dubina + 1) + " )"
+    return generiraj_izraz(rnd, dubina + 1) + " " + rnd.choice("+-*/") + " " + generiraj_izraz(rnd, dubina + 1)
+
+
+def generiraj_izvorni_kod(broj_redaka, seed=0):
+    rnd = random.Random(seed)
+    redci = []
+    otvorene_petlje = 0
+    while len(redci) < broj_redaka:
+        uvlaka = "  " * otvorene_petlje
+        odabir = rnd.random()
+        if odabir < 0.1 and otvorene_petlje < 5:
+            redci.append(f"{uvlaka}za i{otvorene_petlje} od {generiraj_izraz(rnd)} do {rnd.randint(1, 9)}")
+            otvorene_petlje += 1
+        elif odabir < 0.2 and otvorene_petlje > 0:
+            otvorene_petlje -= 1
+            redci.append("  " * otvorene_petlje + "az")
+        elif odabir < 0.25:
+            redci.append(f"{uvlaka}// komentar {rnd.randint(0, 99)}")
+        else:
+            redci.append(f"{uvlaka}{rnd.choice(['x', 'y', 'rez', 'a1'])} = {generiraj_izraz(rnd)}")
+    while otvorene_petlje > 0:
+        otvorene_petlje -= 1
+        redci.append("  " * otvorene_petlje + "az")
+    return "\n".join(redci) + "\n"
+
+
+def izmjeri(naziv, funkcija, tekst, ponavljanja=3):
+    najbolje = None
+    for _ in range(ponavljanja):
+        pocetak = time.perf_counter()
+        tokeni = funkcija(tekst)
+        trajanje = time.perf_counter() - pocetak
+        najbolje = trajanje if najbolje is None else min(najbolje, trajanje)
+    print(f"{naziv:12} {len(tokeni):10d} tokena  {najbolje:8.3f} s  {len(tokeni) / najbolje:14,.0f} tokena/s")
+    return tokeni, najbolje
+
+
+# vrsna potrosnja memorije za citanje cijelog ulaza odjednom i za tokenize() nad datotekom
+def izmjeri_memoriju(broj_redaka):
+    with tempfile.TemporaryDirectory() as mapa:
+        putanja = os.path.join(mapa, f"benchmark_{broj_redaka}.pj")
+        with open(putanja, "w") as f:
+            f.write(generiraj_izvorni_kod(broj_redaka))
+
+        tracemalloc.start()
+        with open(putanja) as f:
+            tekst = f.read()
+            izlaz = []
+            for redak in tekst.split("\n"):
+                izlaz.extend(obradi_redak(redak))
+        _, vrh_cijeli = tracemalloc.get_traced_memory()
+        del tekst, izlaz
+        tracemalloc.reset_peak()
+
+        with open(putanja) as f:
+            broj_tokena = 0
+            for token in tokenize(f):
+                formatiraj(*token)
+                broj_tokena += 1
+        _, vrh_tok = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"{broj_redaka:9d} redaka  cijeli ulaz: {vrh_cijeli / 1e6:8.2f} MB  tokenize: {vrh_tok / 1e6:8.2f} MB")
+
+
+# bajtovi po tokenu: lista tekstualnih redaka "IDN 3 x" (kako ih dosad cita lab_2) prema NizTokena
+def izmjeri_niz_tokena(broj_redaka):
+    tekst = generiraj_izvorni_kod(broj_redaka)
+
+    tracemalloc.start()
+    redci = [formatiraj(*token) for token in tokenize(io.StringIO(tekst))]
+    zauzeto_redci, _ = tracemalloc.get_traced_memory()
+    broj_tokena = len(redci)
+    del redci
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    niz = NizTokena.iz_tokena(tokenize(io.StringIO(tekst)))
+    zauzeto_niz, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{broj_tokena:9d} tokena  lista stringova: {zauzeto_redci / broj_tokena:6.1f} B/token"
+          f"  NizTokena: {zauzeto_niz / broj_tokena:6.1f} B/token  ({len(niz.tablica_leksema)} razlicitih leksema)")
+
+
+def ispisi_tekst(putanja):
+    with open(putanja) as f:
+        for token in tokenize(f):
+            formatiraj(*token).encode()
+
+
+def ispisi_mmap(putanja):
+    for token in tokenize_mmap(putanja):
+        formatiraj_bajtove(*token)
+
+
+# tekstualni tokenize() nad otvorenom datotekom prema tokenize_mmap() nad bajtovima iste datoteke
+def izmjeri_mmap(broj_redaka):
+    with tempfile.TemporaryDirectory() as mapa:
+        putanja = os.path.join(mapa, f"benchmark_{broj_redaka}.pj")
+        with open(putanja, "w") as f:
+            f.write(generiraj_izvorni_kod(broj_redaka))
+
+        # zip_longest: ako jedan nacin izgubi ili doda token, par s None nije jednak
+        with open(putanja) as f:
+            jednako = all(
+                token is not None and token_mmap is not None
+                and formatiraj(*token).encode() == formatiraj_bajtove(*token_mmap)
+                for token, token_mmap in itertools.zip_longest(tokenize(f), tokenize_mmap(putanja))
+            )
+
+        rezultati = []
+        for ispisi in (ispisi_tekst, ispisi_mmap):
+            pocetak = time.perf_counter()
+            ispisi(putanja)
+            trajanje = time.perf_counter() - pocetak
+
+            tracemalloc.start()
+            ispisi(putanja)
+            _, vrh = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rezultati.append((trajanje, vrh))
+
+    (t_tekst, vrh_tekst), (t_mmap, vrh_mmap) = rezultati
+    print(f"{broj_redaka:9d} redaka  tekst: {t_tekst:6.2f} s {vrh_tekst / 1e3:8.1f} kB"
+          f"  mmap: {t_mmap:6.2f} s {vrh_mmap / 1e3:8.1f} kB  {'jednako' if jednako else 'RAZLIKA!'}")
+
+
+# skaliranje nacina rada --jobs N od jedne jezgre do svih jezgri racunala
+def izmjeri_paralelno(megabajta):
+    program = os.path.join(os.path.dirname(os.path.abspath(__file__)), "LeksickiAnalizator.py")
+    with tempfile.TemporaryDirectory() as mapa:
+        putanja = os.path.join(mapa, f"benchmark_{megabajta}MB.pj")
+        with open(putanja, "w") as f:
+            dio = generiraj_izvorni_kod(100000)
+            for _ in range(max(1, round(megabajta * 1e6 / len(dio)))):
+                f.write(dio)
+
+        def pokreni(argumenti):
+            pocetak = time.perf_counter()
+            with open(putanja) as ulaz:
+                izlaz = subprocess.run([sys.executable, program, *argumenti], stdin=ulaz, stdout=subprocess.PIPE).stdout
+            return time.perf_counter() - pocetak, hashlib.sha256(izlaz).hexdigest()
+
+        t_serijski, sazetak = pokreni([])
+        print(f"Ulaz: {os.path.getsize(putanja) / 1e6:.0f} MB")
+        print(f"serijski    {t_serijski:8.2f} s")
+        broj_poslova = 1
+        while True:
+            trajanje, sazetak_paralelno = pokreni(["--jobs", str(broj_poslova)])
+            print(f"--jobs {broj_poslova:<4} {trajanje:8.2f} s  ubrzanje {t_serijski / trajanje:5.2f}x"
+                  f"  {'isti ispis' if sazetak_paralelno == sazetak else 'RAZLICIT ISPIS!'}")
+            if broj_poslova >= os.cpu_count():
+                break
+            broj_poslova = min(broj_poslova * 2, os.cpu_count())
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--memorija":
+        for broj_redaka in (10000, 100000, 1000000):
+            izmjeri_memoriju(broj_redaka)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--mmap":
+        for broj_redaka in (10000, 100000, 1000000):
+            izmjeri_mmap(broj_redaka)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--paralelno":
+        izmjeri_paralelno(int(sys.argv[2]) if len(sys.argv) > 2 else 100)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--niz":
+        for broj_redaka in (10000, 100000, 1000000):
+            izmjeri_niz_tokena(broj_redaka)
+        return
+
+    broj_redaka = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    tekst = generiraj_izvorni_kod(broj_redaka)
+    print(f"Ulaz: {broj_redaka} redaka, {len(tekst) / 1e6:.1f} MB")
+
+    klasicni, t_klasicni = izmjeri("klasicni", lambda t: list(tokenize(io.StringIO(t), obradi_redak_klasicno)), tekst)
+    tablicni, t_tablicni = izmjeri("tablicni", lambda t: list(tokenize(io.StringIO(t))), tekst)
+
+    if klasicni != tablicni:
+        print("GRESKA: nizovi tokena se razlikuju!")
+        sys.exit(1)
+    print(f"Nizovi tokena su jednaki, ubrzanje {t_klasicni / t_tablicni:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
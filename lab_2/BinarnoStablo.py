@@ -0,0 +1,137 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_1.LeksickiAnalizator import VRSTE_TOKENA, NizTokena
+from lab_2.SintaksniAnalizator import CVOR_EPSILON, nazivi_simbola
+
+# binarni zapis generiranog stabla, zamjena za tekstualni ispis s uvlakama:
+#   zaglavlje, nazivi simbola, tablica leksema, pa stupci:
+#   uspon    bajt po cvoru: za koliko je razina cvor visi od djeteta prethodnog cvora (preorder);
+#            255 znaci da je vrijednost u sljedecem elementu stupca preljevi
+#   simboli  bajt po cvoru: kod simbola; kodovi manji od broja vrsta tokena su listovi (tokeni)
+#   preljevi uint32 za svaki uspon 255
+#   redci    uint32 za svaki list: redak tokena
+#   leksemi  uint32 za svaki list: indeks u tablicu leksema
+# unutarnji cvorovi nemaju redak ni leksem pa se za njih ne pise nista; listovi su redom tokeni
+# programa, pa citac niz tokena dobiva izravno iz stupaca bez obrade redak po redak
+
+POTPIS = b"PJSB"
+VERZIJA = 1
+ZAGLAVLJE = struct.Struct("<4sHIIIII") # potpis, verzija, cvorovi, listovi, preljevi, nazivi, leksemi
+PRELJEV = 255
+
+# kodovi simbola: vrste tokena, zatim znakovi stoga (nezavrsni) i na kraju epsilon
+PRVI_NEZAVRSNI = len(VRSTE_TOKENA)
+NAZIVI_SIMBOLA = [*VRSTE_TOKENA, *(nazivi_simbola[kod] for kod in range(len(nazivi_simbola))), "$"]
+SIMBOL_EPSILON = len(NAZIVI_SIMBOLA) - 1
+
+
+def _u_little_endian(polje):
+    if sys.byteorder == "big":
+        polje = array(polje.typecode, polje)
+        polje.byteswap()
+    return polje.tobytes()
+
+
+def zapisi(stablo, niz_tokena, datoteka):
+    uspon = bytearray()
+    simboli = bytearray()
+    preljevi = array("I")
+    redci = array("I")
+    leksemi = array("I")
+
+    prethodna = -1
+    for dubina, cvor in zip(stablo.dubine, stablo.cvorovi):
+        penjanje = prethodna + 1 - dubina
+        if penjanje < PRELJEV:
+            uspon.append(penjanje)
+        else:
+            uspon.append(PRELJEV)
+            preljevi.append(penjanje)
+        prethodna = dubina
+
+        if cvor >= 0:
+            simboli.append(niz_tokena.vrste[cvor])
+            redci.append(niz_tokena.redci[cvor])
+            leksemi.append(niz_tokena.leksemi[cvor])
+        elif cvor == CVOR_EPSILON:
+            simboli.append(SIMBOL_EPSILON)
+        else:
+            simboli.append(PRVI_NEZAVRSNI - 2 - cvor)
+
+    nazivi = "\n".join(NAZIVI_SIMBOLA).encode()
+    tablica_leksema = "\n".join(niz_tokena.tablica_leksema).encode()
+    datoteka.write(ZAGLAVLJE.pack(POTPIS, VERZIJA, len(uspon), len(redci), len(preljevi),
+                                  len(nazivi), len(tablica_leksema)))
+    for dio in (nazivi, tablica_leksema, uspon, simboli, _u_little_endian(preljevi),
+                _u_little_endian(redci), _u_little_endian(leksemi)):
+        datoteka.write(dio)
+
+
+class BinarnoStablo:
+    # stupci procitane datoteke; niz_tokena su listovi stabla, kakve lab_3 i lab_4 inace citaju iz teksta
+    def __init__(self, nazivi, uspon, simboli, preljevi, niz_tokena):
+        self.nazivi = nazivi
+        self.uspon = uspon
+        self.simboli = simboli
+        self.preljevi = preljevi
+        self.niz_tokena = niz_tokena
+
+    def __len__(self):
+        return len(self.simboli)
+
+    def dubine(self):
+        preljevi = iter(self.preljevi)
+        dubina = -1
+        for penjanje in self.uspon:
+            dubina += 1 - (penjanje if penjanje != PRELJEV else next(preljevi))
+            yield dubina
+
+    # isti redci kakve ispisuje SintaksniAnalizator
+    def redci(self):
+        rbr_lista = 0
+        for dubina, simbol in zip(self.dubine(), self.simboli):
+            if simbol < PRVI_NEZAVRSNI:
+                yield " " * dubina + self.niz_tokena.redak_ispisa(rbr_lista) + "\n"
+                rbr_lista += 1
+            else:
+                yield " " * dubina + self.nazivi[simbol] + "\n"
+
+
+def ucitaj(putanja):
+    with open(putanja, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as podaci:
+        potpis, verzija, broj_cvorova, broj_listova, broj_preljeva, duljina_naziva, duljina_leksema = \
+            ZAGLAVLJE.unpack_from(podaci)
+        if potpis != POTPIS or verzija != VERZIJA:
+            raise ValueError(f"{putanja} nije binarno stablo verzije {VERZIJA}")
+
+        pomak = ZAGLAVLJE.size
+        def citaj(duljina):
+            nonlocal pomak
+            dio = podaci[pomak:pomak + duljina]
+            pomak += duljina
+            return dio
+
+        def citaj_polje(broj):
+            polje = array("I")
+            polje.frombytes(citaj(broj * polje.itemsize))
+            if sys.byteorder == "big":
+                polje.byteswap()
+            return polje
+
+        nazivi = citaj(duljina_naziva).decode().split("\n")
+        tablica_leksema = citaj(duljina_leksema).decode().split("\n")
+        uspon = citaj(broj_cvorova)
+        simboli = citaj(broj_cvorova)
+        preljevi = citaj_polje(broj_preljeva)
+        redci = citaj_polje(broj_listova)
+        leksemi = citaj_polje(broj_listova)
+
+    # vrste listova su simboli bez kodova unutarnjih cvorova; translate ih brise u jednom prolazu
+    niz_tokena = NizTokena.iz_polja(simboli.translate(None, bytes(range(PRVI_NEZAVRSNI, 256))),
+                                    redci.tobytes(), leksemi.tobytes(), tablica_leksema)
+    return BinarnoStablo(nazivi, uspon, simboli, preljevi, niz_tokena)
@@ -0,0 +1,269 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+
+# generator tablice LL(1) parsera: iz gramatike (gramatika.txt) racuna skupove PRVI i SLIJEDI,
+# provjerava da gramatika nema LL(1) konflikata i slaze tablicu prijelaza u obliku koji koristi
+# SintaksniAnalizator; slozena tablica se sprema marshalom u __pycache__ pod sazetkom gramatike
+
+GRAMATIKA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gramatika.txt")
+SPREMISTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+# mijenja se kad se promijeni oblik slozene tablice, da se stare datoteke u spremistu ne koriste
+VERZIJA_TABLICE = 1
+
+EPSILON_ZNAK = "$"
+KRAJ_NIZA = "kraj_niza"
+DNO_STOGA = "dno_stoga"
+
+# akcije u celijama tablice: svaka celija je (akcija, simboli koje treba staviti na stog), simboli
+# su vec okrenuti redom kojim idu na stog pa se produkcije ne dijele pri parsiranju
+GRESKA, PRIHVATI, NEZAVRSNI_PRVI, ZAVRSNI_PRVI, EPSILON, POKLAPANJE = range(6)
+
+
+class KonfliktLL1(Exception):
+    def __init__(self, konflikti):
+        self.konflikti = konflikti
+        super().__init__("\n".join(
+            f"{nezavrsni}, {zavrsni}: " + " | ".join(ispisi_produkciju(p) for p in produkcije)
+            for nezavrsni, zavrsni, produkcije in konflikti
+        ))
+
+
+def je_li_nezavrsni(simbol):
+    return simbol.startswith("<") and simbol.endswith(">")
+
+
+def ispisi_produkciju(desna_strana):
+    return " ".join(desna_strana) if desna_strana else EPSILON_ZNAK
+
+
+# vraca (produkcije, pocetni znak); produkcije su rjecnik nezavrsni -> lista desnih strana (tuple)
+def procitaj_gramatiku(tekst):
+    produkcije = {}
+    for rbr_redka, redak in enumerate(tekst.split("\n"), 1):
+        redak = redak.strip()
+        if not redak or redak.startswith("#"):
+            continue
+        lijevo, razdvojnik, desno = redak.partition("::=")
+        lijevo = lijevo.strip()
+        if not razdvojnik or not je_li_nezavrsni(lijevo):
+            raise ValueError(f"gramatika, redak {rbr_redka}: ocekivano '<nezavrsni> ::= ...'")
+        for alternativa in desno.split("|"):
+            simboli = alternativa.split()
+            if simboli == [EPSILON_ZNAK]:
+                simboli = []
+            elif not simboli or EPSILON_ZNAK in simboli:
+                raise ValueError(f"gramatika, redak {rbr_redka}: neispravna alternativa '{alternativa.strip()}'")
+            produkcije.setdefault(lijevo, []).append(tuple(simboli))
+
+    if not produkcije:
+        raise ValueError("gramatika je prazna")
+    for desne_strane in produkcije.values():
+        for desna_strana in desne_strane:
+            for simbol in desna_strana:
+                if je_li_nezavrsni(simbol) and simbol not in produkcije:
+                    raise ValueError(f"gramatika: nezavrsni znak {simbol} nema produkcija")
+    return produkcije, next(iter(produkcije))
+
+
+def prvi_niza(simboli, prvi):
+    skup = set()
+    for simbol in simboli:
+        if not je_li_nezavrsni(simbol):
+            skup.add(simbol)
+            return skup
+        skup |= prvi[simbol] - {EPSILON_ZNAK}
+        if EPSILON_ZNAK not in prvi[simbol]:
+            return skup
+    skup.add(EPSILON_ZNAK)
+    return skup
+
+
+# skupovi PRVI; $ u skupu znaci da se nezavrsni moze prazniti
+def izracunaj_prve(produkcije):
+    prvi = {nezavrsni: set() for nezavrsni in produkcije}
+    promjena = True
+    while promjena:
+        promjena = False
+        for nezavrsni, desne_strane in produkcije.items():
+            for desna_strana in desne_strane:
+                novi = prvi_niza(desna_strana, prvi) - prvi[nezavrsni]
+                if novi:
+                    prvi[nezavrsni] |= novi
+                    promjena = True
+    return prvi
+
+
+def izracunaj_sljedece(produkcije, pocetni, prvi):
+    sljedeci = {nezavrsni: set() for nezavrsni in produkcije}
+    sljedeci[pocetni].add(KRAJ_NIZA)
+    promjena = True
+    while promjena:
+        promjena = False
+        for nezavrsni, desne_strane in produkcije.items():
+            for desna_strana in desne_strane:
+                for i, simbol in enumerate(desna_strana):
+                    if not je_li_nezavrsni(simbol):
+                        continue
+                    ostatak = prvi_niza(desna_strana[i + 1:], prvi)
+                    novi = ostatak - {EPSILON_ZNAK}
+                    if EPSILON_ZNAK in ostatak:
+                        novi |= sljedeci[nezavrsni]
+                    novi -= sljedeci[simbol]
+                    if novi:
+                        sljedeci[simbol] |= novi
+                        promjena = True
+    return sljedeci
+
+
+# slaze tablicu prijelaza kao rjecnik koji se moze spremiti marshalom:
+# znakovi_stoga (naziv -> kod), unif_znakovi_ul_niza (naziv -> stupac), tablica_prijelaza, pocetni_znak
+def izgradi_tablicu(produkcije, pocetni):
+    prvi = izracunaj_prve(produkcije)
+    sljedeci = izracunaj_sljedece(produkcije, pocetni, prvi)
+
+    # zavrsni znakovi redom pojavljivanja; na stog idu samo oni koji nisu prvi u produkciji
+    zavrsni = []
+    zavrsni_na_stogu = []
+    for desne_strane in produkcije.values():
+        for desna_strana in desne_strane:
+            for i, simbol in enumerate(desna_strana):
+                if je_li_nezavrsni(simbol):
+                    continue
+                if simbol not in zavrsni:
+                    zavrsni.append(simbol)
+                if i > 0 and simbol not in zavrsni_na_stogu:
+                    zavrsni_na_stogu.append(simbol)
+
+    znakovi_stoga = {simbol: kod for kod, simbol in enumerate([*produkcije, *zavrsni_na_stogu, DNO_STOGA])}
+    unif_znakovi_ul_niza = {simbol: stupac for stupac, simbol in enumerate([*zavrsni, KRAJ_NIZA])}
+    if len(znakovi_stoga) > 256:
+        raise ValueError("gramatika ima previse znakova stoga za stog s jednim bajtom po znaku")
+
+    def prevedi(desna_strana):
+        if not desna_strana:
+            return (EPSILON, ())
+        if je_li_nezavrsni(desna_strana[0]):
+            return (NEZAVRSNI_PRVI, tuple(znakovi_stoga[simbol] for simbol in reversed(desna_strana)))
+        # prvi zavrsni znak odmah trosi ulazni znak, pa na stog idu samo ostali
+        return (ZAVRSNI_PRVI, tuple(znakovi_stoga[simbol] for simbol in reversed(desna_strana[1:])))
+
+    prazna_celija = (GRESKA, ())
+    tablica_prijelaza = [[prazna_celija] * len(unif_znakovi_ul_niza) for _ in znakovi_stoga]
+    konflikti = []
+    for nezavrsni, desne_strane in produkcije.items():
+        odabrane = {}
+        for desna_strana in desne_strane:
+            skup = prvi_niza(desna_strana, prvi)
+            if EPSILON_ZNAK in skup:
+                skup = (skup - {EPSILON_ZNAK}) | sljedeci[nezavrsni]
+            for simbol in skup:
+                odabrane.setdefault(simbol, []).append(desna_strana)
+        for simbol, kandidati in odabrane.items():
+            if len(kandidati) > 1:
+                konflikti.append((nezavrsni, simbol, kandidati))
+            tablica_prijelaza[znakovi_stoga[nezavrsni]][unif_znakovi_ul_niza[simbol]] = prevedi(kandidati[0])
+    if konflikti:
+        raise KonfliktLL1(sorted(konflikti, key=lambda k: (znakovi_stoga[k[0]], unif_znakovi_ul_niza[k[1]])))
+
+    for simbol in zavrsni_na_stogu:
+        tablica_prijelaza[znakovi_stoga[simbol]][unif_znakovi_ul_niza[simbol]] = (POKLAPANJE, ())
+    tablica_prijelaza[znakovi_stoga[DNO_STOGA]][unif_znakovi_ul_niza[KRAJ_NIZA]] = (PRIHVATI, ())
+
+    return {
+        "znakovi_stoga": znakovi_stoga,
+        "unif_znakovi_ul_niza": unif_znakovi_ul_niza,
+        "tablica_prijelaza": tablica_prijelaza,
+        "pocetni_znak": pocetni,
+    }
+
+
+def sazetak_gramatike(tekst):
+    return hashlib.sha256(f"{VERZIJA_TABLICE}\n{tekst}".encode()).hexdigest()
+
+
+# ucitava slozenu tablicu iz spremista, a ako je nema (ili je gramatika promijenjena) gradi je i sprema
+def ucitaj_tablicu(putanja=GRAMATIKA, spremiste=SPREMISTE):
+    with open(putanja) as f:
+        tekst = f.read()
+    datoteka = os.path.join(spremiste, f"tablica_{sazetak_gramatike(tekst)[:32]}.marshal")
+    try:
+        # marshal.load nad datotekom cita malim citanjima, pa je loads nad cijelim sadrzajem brzi
+        with open(datoteka, "rb") as f:
+            return marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    tablica = izgradi_tablicu(*procitaj_gramatiku(tekst))
+    # pisemo u privremenu datoteku pa je preimenujemo, da istovremeno pokrenuti parser ne procita pola tablice
+    try:
+        os.makedirs(spremiste, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=spremiste, delete=False) as f:
+            f.write(marshal.dumps(tablica))
+        os.replace(f.name, datoteka)
+    except OSError:
+        pass    # bez spremista tablica se gradi pri svakom pokretanju
+    return tablica
+
+
+# usporedba dviju tablica po nazivima znakova (kodovi znakova ne moraju biti isti); vraca popis razlika
+def usporedi_tablice(prva, druga):
+    razlike = []
+    nazivi_prve = {kod: simbol for simbol, kod in prva["znakovi_stoga"].items()}
+    nazivi_druge = {kod: simbol for simbol, kod in druga["znakovi_stoga"].items()}
+    znakovi = prva["znakovi_stoga"].keys() | druga["znakovi_stoga"].keys()
+    stupci = prva["unif_znakovi_ul_niza"].keys() | druga["unif_znakovi_ul_niza"].keys()
+    for simbol in sorted(znakovi):
+        for stupac in sorted(stupci):
+            celije = []
+            for tablica, nazivi in ((prva, nazivi_prve), (druga, nazivi_druge)):
+                redak = tablica["znakovi_stoga"].get(simbol)
+                kod_stupca = tablica["unif_znakovi_ul_niza"].get(stupac)
+                if redak is None or kod_stupca is None:
+                    celije.append((GRESKA, ()))
+                    continue
+                akcija, na_stog = tablica["tablica_prijelaza"][redak][kod_stupca]
+                celije.append((akcija, tuple(nazivi[kod] for kod in na_stog)))
+            if celije[0] != celije[1]:
+                razlike.append((simbol, stupac, celije[0], celije[1]))
+    return razlike
+
+
+def main():
+    putanja = sys.argv[1] if len(sys.argv) > 1 else GRAMATIKA
+    with open(putanja) as f:
+        produkcije, pocetni = procitaj_gramatiku(f.read())
+
+    prvi = izracunaj_prve(produkcije)
+    sljedeci = izracunaj_sljedece(produkcije, pocetni, prvi)
+    for nezavrsni in produkcije:
+        print(f"PRVI({nezavrsni}) = {{{', '.join(sorted(prvi[nezavrsni]))}}}")
+    for nezavrsni in produkcije:
+        print(f"SLIJEDI({nezavrsni}) = {{{', '.join(sorted(sljedeci[nezavrsni]))}}}")
+
+    try:
+        tablica = izgradi_tablicu(produkcije, pocetni)
+    except KonfliktLL1 as konflikt:
+        print("Gramatika nije LL(1), konflikti:")
+        print(konflikt)
+        sys.exit(1)
+
+    print("Tablica prijelaza:")
+    nazivi = {kod: simbol for simbol, kod in tablica["znakovi_stoga"].items()}
+    for simbol, redak in tablica["znakovi_stoga"].items():
+        for stupac, kod_stupca in tablica["unif_znakovi_ul_niza"].items():
+            akcija, na_stog = tablica["tablica_prijelaza"][redak][kod_stupca]
+            desna_strana = [nazivi[kod] for kod in reversed(na_stog)]
+            if akcija == ZAVRSNI_PRVI:
+                desna_strana.insert(0, stupac)
+            if akcija in (NEZAVRSNI_PRVI, ZAVRSNI_PRVI, EPSILON):
+                print(f"  {simbol}, {stupac}: {simbol} ::= {ispisi_produkciju(desna_strana)}")
+            elif akcija == POKLAPANJE:
+                print(f"  {simbol}, {stupac}: pomakni")
+            elif akcija == PRIHVATI:
+                print(f"  {simbol}, {stupac}: prihvati")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+from bisect import bisect_left
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_1.LeksickiAnalizator import GRESKA, KODOVI_VRSTA, NizTokena, obradi_redak
+from lab_2.SintaksniAnalizator import Stablo, parsiraj
+
+
+class InkrementalnaAnaliza:
+    # pamti tokene svakog retka, niz tokena cijelog programa, stablo i kontrolne tocke parsera iz
+    # prethodne analize, pa nakon izmjene ponovno leksira samo promijenjene retke i nastavlja
+    # parsiranje od zadnje granice naredbe na najvisoj razini prije prvog promijenjenog tokena
+    def __init__(self):
+        self.redci = []
+        self.tokeni_redaka = []
+        self.niz_tokena = NizTokena()
+        self.stablo = Stablo()
+        self.kontrolne_tocke = []
+        self.ispis = None
+
+        # podaci o zadnjoj analizi
+        self.ponovno_leksirano = 0
+        self.nastavak_od = 0
+
+    def analiziraj(self, tekst):
+        stari_redci = self.redci
+        novi_redci = tekst.split("\n")
+
+        # zajednicki pocetak i kraj starog i novog teksta
+        najvise = min(len(stari_redci), len(novi_redci))
+        pocetak = 0
+        while pocetak < najvise and stari_redci[pocetak] == novi_redci[pocetak]:
+            pocetak += 1
+        kraj = 0
+        while kraj < najvise - pocetak and stari_redci[-1 - kraj] == novi_redci[-1 - kraj]:
+            kraj += 1
+
+        if pocetak == len(stari_redci) == len(novi_redci):
+            self.ponovno_leksirano = 0
+            return self.ispis
+
+        promijenjeni = [obradi_redak(redak) for redak in novi_redci[pocetak:len(novi_redci) - kraj]]
+        self.tokeni_redaka[pocetak:len(stari_redci) - kraj] = promijenjeni
+        self.redci = novi_redci
+        self.ponovno_leksirano = len(promijenjeni)
+
+        # tokeni ispred prvog promijenjenog retka ostaju, ostatku se mogu pomaknuti brojevi redaka
+        prvi_token = bisect_left(self.niz_tokena.redci, pocetak + 1)
+        self.niz_tokena.skrati(prvi_token)
+        for rbr_redka in range(pocetak, len(novi_redci)):
+            for vrsta, leksem in self.tokeni_redaka[rbr_redka]:
+                self.niz_tokena.dodaj(vrsta, rbr_redka + 1, leksem)
+
+        # kontrolna tocka vrijedi samo ako parser do nje nije ni pogledao promijenjeni token
+        broj_tocaka = bisect_left(self.kontrolne_tocke, prvi_token, key=lambda tocka: tocka[0])
+        if broj_tocaka > 0:
+            nastavak = self.kontrolne_tocke[broj_tocaka - 1]
+            del self.kontrolne_tocke[broj_tocaka - 1:]
+            self.nastavak_od = nastavak[0]
+        else:
+            nastavak = None
+            self.kontrolne_tocke.clear()
+            self.stablo.skrati(0)
+            self.nastavak_od = 0
+
+        if KODOVI_VRSTA[GRESKA] in self.niz_tokena.vrste:
+            # leksicka greska; parser ne moze primiti takav niz, a stanje do nastavka ostaje valjano
+            if nastavak is not None:
+                self.kontrolne_tocke.append(nastavak)
+            self.ispis = GRESKA
+        else:
+            greska = parsiraj(self.niz_tokena, self.stablo, self.kontrolne_tocke, nastavak)
+            self.ispis = greska if greska is not None else "".join(self.stablo.redci(self.niz_tokena))
+        return self.ispis
+
+
+def cijela_izgradnja(tekst):
+    return InkrementalnaAnaliza().analiziraj(tekst)
+
+
+# prati datoteku i nakon svake promjene ponovno gradi stablo u <datoteka>.stablo
+def main():
+    putanja = sys.argv[1]
+    usporedi = "--usporedi" in sys.argv[2:]
+    analiza = InkrementalnaAnaliza()
+    zadnja_promjena = None
+
+    print(f"Pratim {putanja} (Ctrl+C za izlaz)", file=sys.stderr)
+    try:
+        while True:
+            promjena = os.stat(putanja).st_mtime_ns
+            if promjena != zadnja_promjena:
+                zadnja_promjena = promjena
+                with open(putanja) as f:
+                    tekst = f.read()
+
+                pocetak = time.perf_counter()
+                ispis = analiza.analiziraj(tekst)
+                trajanje = time.perf_counter() - pocetak
+                with open(putanja + ".stablo", "w") as f:
+                    f.write(ispis + "\n")
+
+                poruka = (f"{len(analiza.niz_tokena)} tokena, ponovno leksirano {analiza.ponovno_leksirano} redaka, "
+                          f"nastavak od tokena {analiza.nastavak_od}: {trajanje * 1000:.1f} ms")
+                if usporedi:
+                    pocetak = time.perf_counter()
+                    isti = cijela_izgradnja(tekst) == ispis
+                    poruka += f" (cijela izgradnja {(time.perf_counter() - pocetak) * 1000:.1f} ms"
+                    poruka += ", isti ispis)" if isti else ", RAZLICIT ISPIS!)"
+                print(poruka, file=sys.stderr)
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# rucno napisana tablica prijelaza iz prve verzije parsera; parser danas koristi tablicu koju
+# GeneratorTablice izvodi iz gramatika.txt, a ova ostaje za usporedbu (benchmark.py --pokretanje)
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_2.GeneratorTablice import EPSILON, GRESKA, NEZAVRSNI_PRVI, POKLAPANJE, PRIHVATI, ZAVRSNI_PRVI
+
+#funkcije:
+def je_li_nezavrsni(string):
+    izrazi = [
+        '<program>',
+        '<lista_naredbi>',
+        '<naredba>',
+        '<naredba_pridruzivanja>',
+        '<za_petlja>',
+        '<E>',
+        '<E_lista>',
+        '<T>',
+        '<T_lista>',
+        '<P>'
+    ]
+
+    # Provjera je li string u listi izraza
+    return string in izrazi
+
+def je_li_epsilon(string):
+    return string == "$"
+
+
+# strukture podataka:
+znakovi_stoga = {
+    '<program>': 0,
+    '<lista_naredbi>': 1,
+    '<naredba>': 2,
+    '<naredba_pridruzivanja>': 3,
+    '<za_petlja>': 4,
+    '<E>': 5,
+    '<E_lista>': 6,
+    '<T>': 7,
+    '<T_lista>': 8,
+    '<P>': 9,
+    'OP_PRIDRUZI': 10,
+    'IDN': 11,
+    'KR_OD': 12,
+    'KR_DO': 13,
+    'KR_AZ': 14,
+    'D_ZAGRADA': 15,
+    'dno_stoga': 16
+}
+unif_znakovi_ul_niza = {
+    'IDN': 0,
+    'BROJ': 1,
+    'OP_PRIDRUZI': 2,
+    'OP_PLUS': 3,
+    'OP_MINUS': 4,
+    'OP_PUTA': 5,
+    'OP_DIJELI': 6,
+    'L_ZAGRADA': 7,
+    'D_ZAGRADA': 8,
+    'KR_ZA': 9,
+    'KR_OD': 10,
+    'KR_DO': 11,
+    'KR_AZ': 12,
+    'kraj_niza': 13
+}
+funkcija_prijelaza = [
+    ["<lista_naredbi>", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "<lista_naredbi>", "-1", "-1", "-1", "<lista_naredbi>"],
+    ["<naredba> <lista_naredbi>", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "<naredba> <lista_naredbi>", "-1", "-1", "$", "$"],
+    ["<naredba_pridruzivanja>", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "<za_petlja>", "-1", "-1", "-1", "-1"],
+    ["IDN OP_PRIDRUZI <E>", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1"],
+    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "KR_ZA IDN KR_OD <E> KR_DO <E> <lista_naredbi> KR_AZ", "-1", "-1", "-1", "-1"],
+    ["<T> <E_lista>", "<T> <E_lista>", "-1", "<T> <E_lista>", "<T> <E_lista>", "-1", "-1", "<T> <E_lista>", "-1", "-1", "-1", "-1", "-1", "-1"],
+    ["$", "-1", "-1", "OP_PLUS <E>", "OP_MINUS <E>", "-1", "-1", "-1", "$", "$", "-1", "$", "$", "$"],
+    ["<P> <T_lista>", "<P> <T_lista>", "-1", "<P> <T_lista>", "<P> <T_lista>", "-1", "-1", "<P> <T_lista>", "-1", "-1", "-1", "-1", "-1", "-1"],
+    ["$", "-1", "-1", "$", "$", "OP_PUTA <T>", "OP_DIJELI <T>", "-1", "$", "$", "-1", "$", "$", "$"],
+    ["IDN", "BROJ", "-1", "OP_PLUS <P>", "OP_MINUS <P>", "-1", "-1", "L_ZAGRADA <E> D_ZAGRADA", "-1", "-1", "-1", "-1", "-1", "-1"],
+    ["-1", "-1", "", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1"],
+    ["", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1"],
+    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "", "-1", "-1", "-1"],
+    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "", "-1", "-1"],
+    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "", "-1"],
+    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "", "-1", "-1", "-1", "-1", "-1"],
+    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "0"]
+]
+
+def prevedi_produkciju(DS_produkcije):
+    if DS_produkcije == "-1":
+        return (GRESKA, ())
+    if DS_produkcije == "0":
+        return (PRIHVATI, ())
+    if DS_produkcije == "":
+        return (POKLAPANJE, ())
+    if je_li_epsilon(DS_produkcije):
+        return (EPSILON, ())
+    simboli = DS_produkcije.split(" ")
+    if je_li_nezavrsni(simboli[0]):
+        return (NEZAVRSNI_PRVI, tuple(znakovi_stoga[simbol] for simbol in reversed(simboli)))
+    # prvi zavrsni znak odmah trosi ulazni znak, pa na stog idu samo ostali
+    return (ZAVRSNI_PRVI, tuple(znakovi_stoga[simbol] for simbol in reversed(simboli[1:])))
+
+tablica_prijelaza = [[prevedi_produkciju(DS_produkcije) for DS_produkcije in redak] for redak in funkcija_prijelaza]
+
+# ista struktura koju slaze GeneratorTablice.izgradi_tablicu
+tablica = {
+    "znakovi_stoga": znakovi_stoga,
+    "unif_znakovi_ul_niza": unif_znakovi_ul_niza,
+    "tablica_prijelaza": tablica_prijelaza,
+    "pocetni_znak": "<program>",
+}
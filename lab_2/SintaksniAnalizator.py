@@ -1,195 +1,189 @@
+import os
+import shutil
 import sys
-
-#funkcije:
-def je_li_nezavrsni(string):
-    izrazi = [
-        '<program>',
-        '<lista_naredbi>',
-        '<naredba>',
-        '<naredba_pridruzivanja>',
-        '<za_petlja>',
-        '<E>',
-        '<E_lista>',
-        '<T>',
-        '<T_lista>',
-        '<P>'
-    ]
-
-    # Provjera je li string u listi izraza
-    return string in izrazi
-
-def je_li_zavrsni(string):
-    zavrsni_izrazi = [
-        'IDN',
-        'BROJ',
-        'OP_PRIDRUZI',
-        'OP_PLUS',
-        'OP_MINUS',
-        'OP_PUTA',
-        'OP_DIJELI',
-        'L_ZAGRADA',
-        'D_ZAGRADA',
-        'KR_ZA',
-        'KR_OD',
-        'KR_DO',
-        'KR_AZ'
-    ]
-
-    # Provjera je li string u listi zavrsnih izraza
-    return string in zavrsni_izrazi
-
-def je_li_epsilon(string):
-    return string == "$"
-
-
-# strukture podataka:
-znakovi_stoga = {
-    '<program>': 0,
-    '<lista_naredbi>': 1,
-    '<naredba>': 2,
-    '<naredba_pridruzivanja>': 3,
-    '<za_petlja>': 4,
-    '<E>': 5,
-    '<E_lista>': 6,
-    '<T>': 7,
-    '<T_lista>': 8,
-    '<P>': 9,
-    'OP_PRIDRUZI': 10,
-    'IDN': 11,
-    'KR_OD': 12,
-    'KR_DO': 13,
-    'KR_AZ': 14,
-    'D_ZAGRADA': 15,
-    'dno_stoga': 16
-}
-unif_znakovi_ul_niza = {
-    'IDN': 0,
-    'BROJ': 1,
-    'OP_PRIDRUZI': 2,
-    'OP_PLUS': 3,
-    'OP_MINUS': 4,
-    'OP_PUTA': 5,
-    'OP_DIJELI': 6,
-    'L_ZAGRADA': 7,
-    'D_ZAGRADA': 8,
-    'KR_ZA': 9,
-    'KR_OD': 10,
-    'KR_DO': 11,
-    'KR_AZ': 12,
-    'kraj_niza': 13
-}
-funkcija_prijelaza = [
-    ["<lista_naredbi>", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "<lista_naredbi>", "-1", "-1", "-1", "<lista_naredbi>"],
-    ["<naredba> <lista_naredbi>", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "<naredba> <lista_naredbi>", "-1", "-1", "$", "$"],
-    ["<naredba_pridruzivanja>", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "<za_petlja>", "-1", "-1", "-1", "-1"],
-    ["IDN OP_PRIDRUZI <E>", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1"],
-    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "KR_ZA IDN KR_OD <E> KR_DO <E> <lista_naredbi> KR_AZ", "-1", "-1", "-1", "-1"],
-    ["<T> <E_lista>", "<T> <E_lista>", "-1", "<T> <E_lista>", "<T> <E_lista>", "-1", "-1", "<T> <E_lista>", "-1", "-1", "-1", "-1", "-1", "-1"],
-    ["$", "-1", "-1", "OP_PLUS <E>", "OP_MINUS <E>", "-1", "-1", "-1", "$", "$", "-1", "$", "$", "$"],
-    ["<P> <T_lista>", "<P> <T_lista>", "-1", "<P> <T_lista>", "<P> <T_lista>", "-1", "-1", "<P> <T_lista>", "-1", "-1", "-1", "-1", "-1", "-1"],
-    ["$", "-1", "-1", "$", "$", "OP_PUTA <T>", "OP_DIJELI <T>", "-1", "$", "$", "-1", "$", "$", "$"],
-    ["IDN", "BROJ", "-1", "OP_PLUS <P>", "OP_MINUS <P>", "-1", "-1", "L_ZAGRADA <E> D_ZAGRADA", "-1", "-1", "-1", "-1", "-1", "-1"],
-    ["-1", "-1", "", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1"],
-    ["", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1"],
-    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "", "-1", "-1", "-1"],
-    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "", "-1", "-1"],
-    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "", "-1"],
-    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "", "-1", "-1", "-1", "-1", "-1"],
-    ["-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "-1", "0"]
-]
-
-# definiranje varijabli i struktura podataka:
-program_gotov = False
-stog = ["dno_stoga", "<program>"] # pocetni nezvarsni znak kao prvi znak na stogu
-dubina = 0 # inicijalna dubljina stabla
-generirano_stablo = [] # dodajem stringove u njega, kasnije ih sve spojim sa ''.join(generirano_stablo)
-
-# glavni program
-input_text = sys.stdin.read()
-polje_ulaznih_znakova = input_text.strip().split("\n")
-polje_ulaznih_znakova.append("kraj_niza")
-# print(polje_ulaznih_znakova)
-# print(stog)
-# print()
-# print()
-
-while not program_gotov:
-    # print(stog)
-    #1. korak - procitaj znak sa stoga; mkani ga
-    vrh_stoga = stog.pop()
-    # print(stog)
-    #2. korak - procitaj koliko ima praznina; makni ih
-    while stog and stog[-1] == " ":  # nadi trenutnu dubinu znaka stoga
-        stog.pop()  # Uklanjanje praznine sa stoga
-        dubina += 1  # Povećavanje broja praznina
-    #3. korak - ispisi u spremnik dubina * praznina + odgovarajuci cvor + \n
-    if (vrh_stoga != "dno_stoga"):
-        if (je_li_nezavrsni(vrh_stoga)):
-            redak_stabla = " " * dubina + vrh_stoga + "\n"
-            generirano_stablo.append(redak_stabla)
-        if (je_li_zavrsni(vrh_stoga)):
-            redak_stabla = " " * dubina + vrh_stoga + " "
-            generirano_stablo.append(redak_stabla)
-    # print(generirano_stablo)
-    #4. korak - povecaj dubinu za 1
-    dubina += 1
-
-    #5. korak
-    ulazni_znak = polje_ulaznih_znakova[0].split(" ")[0]   # !!!! po potrebi cu morat mkanut tja prvi element kansije
-    # print(f"ulazni znak: {ulazni_znak}")
-    DS_produkcije = funkcija_prijelaza[znakovi_stoga[vrh_stoga]][unif_znakovi_ul_niza[ulazni_znak]]
-    # print(DS_produkcije)
-
-    #6. korak - ovisno o tome sta smo dobili kao DS_produkcije raidmo različite stvari
-    if (DS_produkcije == "0"):     # uspjeh
-        print(''.join(generirano_stablo)) # ispisi stablo na stdout
-        program_gotov = True
-    elif (DS_produkcije == "-1"):   # postoji sintaksna greska
-        program_gotov = True
-        if polje_ulaznih_znakova[0] == "kraj_niza":
-            print("err kraj")
+import tempfile
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_1.LeksickiAnalizator import VRSTE_TOKENA, NizTokena
+from lab_2.GeneratorTablice import EPSILON, NEZAVRSNI_PRVI, POKLAPANJE, PRIHVATI, ZAVRSNI_PRVI, ucitaj_tablicu
+
+# tablica prijelaza se izvodi iz gramatika.txt (vidi GeneratorTablice) i ucitava iz spremista
+tablica = ucitaj_tablicu()
+znakovi_stoga = tablica["znakovi_stoga"]
+unif_znakovi_ul_niza = tablica["unif_znakovi_ul_niza"]
+tablica_prijelaza = tablica["tablica_prijelaza"]
+
+nazivi_simbola = {kod: simbol for simbol, kod in znakovi_stoga.items()}
+DNO_STOGA = znakovi_stoga["dno_stoga"]
+LISTA_NAREDBI = znakovi_stoga["<lista_naredbi>"]
+KRAJ_NIZA = unif_znakovi_ul_niza["kraj_niza"]
+# stupac tablice za svaki kod vrste iz NizTokena
+stupci_vrsta = [unif_znakovi_ul_niza.get(vrsta) for vrsta in VRSTE_TOKENA]
+
+# cvor stabla je indeks tokena (>= 0), epsilon ili nezavrsni znak kodiran kao -2 - kod simbola
+CVOR_EPSILON = -1
+
+
+class Stablo:
+    # generirano stablo u preorderu: za svaki redak dubina i cvor, tekst se slaze tek pri ispisu
+    prag_ispisa = sys.maxsize # cijelo stablo ostaje u memoriji
+
+    def __init__(self):
+        self.dubine = array("I")
+        self.cvorovi = array("i")
+
+    def __len__(self):
+        return len(self.cvorovi)
+
+    def skrati(self, duljina):
+        del self.dubine[duljina:]
+        del self.cvorovi[duljina:]
+
+    def redci(self, niz_tokena):
+        for dubina, cvor in zip(self.dubine, self.cvorovi):
+            if cvor >= 0:
+                yield " " * dubina + niz_tokena.redak_ispisa(cvor) + "\n"
+            elif cvor == CVOR_EPSILON:
+                yield " " * dubina + "$\n"
+            else:
+                yield " " * dubina + nazivi_simbola[-2 - cvor] + "\n"
+
+
+class TokStabla(Stablo):
+    # stablo koje se ispisuje dok nastaje: kad se skupi prag_ispisa cvorova, njihovi se redci
+    # pisu u privremenu datoteku; tek kad je niz prihvacen ona se prepisuje na izlaz, a kod
+    # sintaksne greske se odbacuje pa je ispis samo redak greske
+    prag_ispisa = 8192
+
+    def __init__(self, niz_tokena):
+        super().__init__()
+        self.niz_tokena = niz_tokena
+        self.ispisano = 0
+        self.privremena_datoteka = tempfile.TemporaryFile("w+")
+
+    def __len__(self):
+        return self.ispisano + len(self.cvorovi)
+
+    def isprazni(self):
+        self.privremena_datoteka.writelines(self.redci(self.niz_tokena))
+        self.ispisano += len(self.cvorovi)
+        del self.dubine[:]
+        del self.cvorovi[:]
+
+    def prepisi(self, izlaz):
+        self.isprazni()
+        self.privremena_datoteka.seek(0)
+        shutil.copyfileobj(self.privremena_datoteka, izlaz)
+        self.privremena_datoteka.close()
+
+    def odbaci(self):
+        self.privremena_datoteka.close()
+
+
+# vraca None ako je niz prihvacen (stablo je tada u stablo), a inace redak greske;
+# kontrolne_tocke (ako su zadane) dobivaju (pozicija, dubina, duljina stabla) na svakoj granici
+# naredbe na najvisoj razini, a nastavak je jedna takva tocka od koje se parsiranje nastavlja (samo uz
+# Stablo u memoriji, jer se dio TokStabla vec ispisao pa se ne moze skratiti)
+def parsiraj(niz_tokena, stablo, kontrolne_tocke=None, nastavak=None):
+    if nastavak is not None and isinstance(stablo, TokStabla):
+        raise ValueError("nastavak parsiranja nije moguc uz stablo koje se ispisuje dok nastaje")
+    # stog su dva usporedna polja: znak i njegova dubina u stablu, pa je svaki push i pop O(1)
+    simboli_stoga = array("B", [DNO_STOGA])
+    dubine_stoga = array("I", [0])
+    if nastavak is None:
+        simboli_stoga.append(znakovi_stoga[tablica["pocetni_znak"]]) # pocetni nezvarsni znak kao prvi znak na stogu
+        dubine_stoga.append(0)
+        pozicija = 0 # indeks trenutnog ulaznog znaka u niz_tokena; kad dode do broj_tokena citamo kraj_niza
+    else:
+        pozicija, dubina_liste, duljina_stabla = nastavak
+        simboli_stoga.append(LISTA_NAREDBI)
+        dubine_stoga.append(dubina_liste)
+        stablo.skrati(duljina_stabla)
+
+    broj_tokena = len(niz_tokena)
+    vrste = niz_tokena.vrste
+    dodaj_dubinu = stablo.dubine.append
+    dodaj_cvor = stablo.cvorovi.append
+    cvorovi = stablo.cvorovi
+    prag_ispisa = stablo.prag_ispisa
+    stavi_simbol = simboli_stoga.append
+    stavi_dubinu = dubine_stoga.append
+
+    while True:
+        simbol = simboli_stoga.pop()
+        dubina = dubine_stoga.pop()
+        # <lista_naredbi> ispod koje je samo dno stoga je granica naredbe na najvisoj razini
+        if simbol == LISTA_NAREDBI and len(simboli_stoga) == 1 and kontrolne_tocke is not None:
+            kontrolne_tocke.append((pozicija, dubina, len(stablo)))
+
+        stupac = stupci_vrsta[vrste[pozicija]] if pozicija < broj_tokena else KRAJ_NIZA
+        akcija, na_stog = tablica_prijelaza[simbol][stupac]
+
+        if akcija == NEZAVRSNI_PRVI:
+            dodaj_dubinu(dubina)
+            dodaj_cvor(-2 - simbol)
+            dubina += 1
+            for element in na_stog:
+                stavi_simbol(element)
+                stavi_dubinu(dubina)
+
+        elif akcija == POKLAPANJE:
+            # zavrsni znak sa stoga i ulazni znak daju jedan redak stabla
+            dodaj_dubinu(dubina)
+            dodaj_cvor(pozicija)
+            pozicija += 1
+            if len(cvorovi) >= prag_ispisa:
+                stablo.isprazni()
+
+        elif akcija == ZAVRSNI_PRVI:
+            dodaj_dubinu(dubina)
+            dodaj_cvor(-2 - simbol)
+            dubina += 1
+            dodaj_dubinu(dubina)
+            dodaj_cvor(pozicija)
+            pozicija += 1
+            if len(cvorovi) >= prag_ispisa:
+                stablo.isprazni()
+            for element in na_stog:
+                stavi_simbol(element)
+                stavi_dubinu(dubina)
+
+        elif akcija == EPSILON:
+            dodaj_dubinu(dubina)
+            dodaj_cvor(-2 - simbol)
+            dodaj_dubinu(dubina + 1)
+            dodaj_cvor(CVOR_EPSILON)
+            # zadrzavamo se na istom ulaznom znaku
+
+        elif akcija == PRIHVATI:
+            return None
+
+        else:   # postoji sintaksna greska
+            if pozicija == broj_tokena:
+                return "err kraj"
+            return f"err {niz_tokena.redak_ispisa(pozicija)}"
+
+
+if __name__ == "__main__":
+    # glavni program
+    niz_tokena = NizTokena.iz_teksta(sys.stdin)
+    if "--binarno" in sys.argv[1:]:
+        # stablo se pise u binarnom obliku (vidi BinarnoStablo) u zadanu datoteku umjesto na stdout
+        from lab_2.BinarnoStablo import zapisi
+        stablo = Stablo()
+        greska = parsiraj(niz_tokena, stablo)
+        if greska is None:
+            with open(sys.argv[sys.argv.index("--binarno") + 1], "wb") as datoteka:
+                zapisi(stablo, niz_tokena, datoteka)
         else:
-            print(f"err {polje_ulaznih_znakova[0]}")
-    elif je_li_nezavrsni(DS_produkcije.split(" ")[0]):
-        for element in reversed(DS_produkcije.split(" ")):
-            # Dodaj onoliko praznina " " na stog koliko je vrijednost varijable dubina
-            for _ in range(dubina):
-                stog.append(" ")  # Dodaj prazninu kao element stoga
-            # Dodaj element na stog
-            stog.append(element)
-        # nemoramo micat prvi ulazni znak jer ga nismo zapravo konzumirali
-        dubina = 0      # resetiramo dubinu
-        # print(stog)
-
-    elif je_li_zavrsni(DS_produkcije.split(" ")[0]):
-        redak_stabla = " " * dubina + polje_ulaznih_znakova[0] + "\n"   # prije je bilo DS_produkcije.split(" ")[0]
-        generirano_stablo.append(redak_stabla)
-        ostatak_produkcija = DS_produkcije.split(" ")[1:]   # uzmi ostatak znakova s DS produkcije osim prvog
-        for element in reversed(ostatak_produkcija):
-            # Dodaj onoliko praznina " " na stog koliko je vrijednost varijable dubina
-            for _ in range(dubina):
-                stog.append(" ")  # Dodaj prazninu kao element stoga
-            # Dodaj element na stog
-            stog.append(element)
-        dubina = 0
-        polje_ulaznih_znakova = polje_ulaznih_znakova[1:] # izbaci prvi element iz polja jer si ga sad obradio
-
-    elif je_li_epsilon(DS_produkcije.split(" ")[0]):
-        redak_stabla = " " * dubina + DS_produkcije.split(" ")[0] + "\n"
-        generirano_stablo.append(redak_stabla)
-        dubina = 0
-        # zadrzavamo se na istom ulaznom znaku
-
-    elif DS_produkcije == "":
-        dubina = 0
-        redak_stabla = polje_ulaznih_znakova[0].split(" ")[1] + " " + polje_ulaznih_znakova[0].split(" ")[2] + "\n"
-        generirano_stablo.append(redak_stabla)
-        polje_ulaznih_znakova = polje_ulaznih_znakova[1:]  # izbaci prvi element iz polja jer si ga sad obradio
-
+            print(greska)
     else:
-        print("Dogodila se neka gadna pogreska")
-        program_gotov = True
-
-
-
-
+        stablo = TokStabla(niz_tokena)
+        greska = parsiraj(niz_tokena, stablo)
+        if greska is None:
+            stablo.prepisi(sys.stdout) # ispisi stablo na stdout
+            print()
+        else:
+            stablo.odbaci()
+            print(greska)
@@ -0,0 +1,252 @@
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lab_1.benchmark import generiraj_izraz, generiraj_izvorni_kod
+from lab_1.LeksickiAnalizator import NizTokena, tokenize
+from lab_2 import BinarnoStablo, RucnaTablica
+from lab_2.GeneratorTablice import GRAMATIKA, izgradi_tablicu, procitaj_gramatiku, ucitaj_tablicu, usporedi_tablice
+from lab_2.InkrementalniAnalizator import InkrementalnaAnaliza, cijela_izgradnja
+from lab_2.SintaksniAnalizator import Stablo, TokStabla, parsiraj
+from lab_3.SemantickiAnalizator import parse_input
+
+
+# vrijeme samog parsiranja (bez slaganja teksta stabla) za sve vece ulaze
+def izmjeri_skaliranje():
+    print(f"{'tokena':>10} {'cvorova':>10} {'vrijeme':>10} {'us/token':>10}")
+    for broj_redaka in (170, 1700, 17000, 170000):
+        niz_tokena = NizTokena.iz_tokena(tokenize(io.StringIO(generiraj_izvorni_kod(broj_redaka))))
+        stablo = Stablo()
+        pocetak = time.perf_counter()
+        greska = parsiraj(niz_tokena, stablo)
+        trajanje = time.perf_counter() - pocetak
+        if greska is not None:
+            print(f"GRESKA: {greska}")
+            sys.exit(1)
+        print(f"{len(niz_tokena):10d} {len(stablo):10d} {trajanje:9.3f}s {trajanje / len(niz_tokena) * 1e6:10.2f}")
+
+
+# vrijeme jedne izmjene jednog retka: inkrementalna analiza prema cijeloj izgradnji ispocetka
+def izmjeri_inkrementalno(broj_redaka, broj_izmjena=10):
+    rnd = random.Random(1)
+    redci = generiraj_izvorni_kod(broj_redaka).split("\n")
+    analiza = InkrementalnaAnaliza()
+    analiza.analiziraj("\n".join(redci))
+
+    ukupno_inkrementalno = 0
+    ukupno_cijelo = 0
+    for _ in range(broj_izmjena):
+        # mijenjamo desnu stranu neke naredbe pridruzivanja
+        while True:
+            i = rnd.randrange(len(redci))
+            if "=" in redci[i]:
+                break
+        redci[i] = redci[i][:redci[i].index("=") + 1] + " " + generiraj_izraz(rnd)
+        tekst = "\n".join(redci)
+
+        pocetak = time.perf_counter()
+        ispis = analiza.analiziraj(tekst)
+        ukupno_inkrementalno += time.perf_counter() - pocetak
+
+        pocetak = time.perf_counter()
+        ispis_cijelo = cijela_izgradnja(tekst)
+        ukupno_cijelo += time.perf_counter() - pocetak
+
+        if ispis != ispis_cijelo:
+            print("GRESKA: inkrementalni ispis se razlikuje od cijele izgradnje!")
+            sys.exit(1)
+
+    print(f"{broj_redaka:9d} redaka  po izmjeni: inkrementalno {ukupno_inkrementalno / broj_izmjena * 1000:9.1f} ms"
+          f"  cijela izgradnja {ukupno_cijelo / broj_izmjena * 1000:9.1f} ms")
+
+
+# duboko ugnijezdene za petlje i zagrade; niz tokena slazemo izravno da ulaz ne bi bio golem tekst
+# (ispravnost parsiranja takvih ulaza provjerava test_dubina.py, a ovdje se mjeri samo vrijeme i memorija)
+def duboke_petlje(dubina):
+    niz_tokena = NizTokena()
+    for i in range(dubina):
+        for vrsta, leksem in (("KR_ZA", "za"), ("IDN", "i"), ("KR_OD", "od"), ("BROJ", "1"), ("KR_DO", "do"), ("BROJ", "2")):
+            niz_tokena.dodaj(vrsta, i + 1, leksem)
+    for i in range(dubina):
+        niz_tokena.dodaj("KR_AZ", dubina + i + 1, "az")
+    return niz_tokena
+
+
+def duboke_zagrade(dubina):
+    niz_tokena = NizTokena()
+    niz_tokena.dodaj("IDN", 1, "x")
+    niz_tokena.dodaj("OP_PRIDRUZI", 1, "=")
+    for _ in range(dubina):
+        niz_tokena.dodaj("L_ZAGRADA", 1, "(")
+    niz_tokena.dodaj("BROJ", 1, "1")
+    for _ in range(dubina):
+        niz_tokena.dodaj("D_ZAGRADA", 1, ")")
+    return niz_tokena
+
+
+def izmjeri_dubinu():
+    for naziv, slozi in (("za petlje", duboke_petlje), ("zagrade", duboke_zagrade)):
+        for dubina in (10000, 20000, 40000):
+            niz_tokena = slozi(dubina)
+            stablo = Stablo()
+            tracemalloc.start()
+            pocetak = time.perf_counter()
+            parsiraj(niz_tokena, stablo)
+            trajanje = time.perf_counter() - pocetak
+            _, vrh = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{naziv:10} dubina {dubina:6d}: {len(stablo):8d} cvorova, najveca dubina stabla {max(stablo.dubine):7d}, "
+                  f"{trajanje:6.3f} s, vrh memorije {vrh / 1e6:6.2f} MB ({vrh / len(stablo):5.1f} B/cvor)")
+
+
+# vrh memorije za cijelo stablo u memoriji i ispis s join-om prema TokStabla s privremenom datotekom
+def izmjeri_tok(broj_redaka):
+    niz_tokena = NizTokena.iz_tokena(tokenize(io.StringIO(generiraj_izvorni_kod(broj_redaka))))
+    rezultati = []
+    for tok in (False, True):
+        with open(os.devnull, "w") as izlaz:
+            tracemalloc.start()
+            pocetak = time.perf_counter()
+            if tok:
+                stablo = TokStabla(niz_tokena)
+                parsiraj(niz_tokena, stablo)
+                stablo.prepisi(izlaz)
+            else:
+                stablo = Stablo()
+                parsiraj(niz_tokena, stablo)
+                izlaz.write("".join(stablo.redci(niz_tokena)))
+            trajanje = time.perf_counter() - pocetak
+            _, vrh = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        rezultati.append((len(stablo), trajanje, vrh))
+        del stablo
+
+    (cvorova, t_memorija, vrh_memorija), (_, t_tok, vrh_tok) = rezultati
+    print(f"{cvorova:9d} cvorova  u memoriji: {t_memorija:6.2f} s {vrh_memorija / 1e6:8.2f} MB"
+          f"  tok: {t_tok:6.2f} s {vrh_tok / 1e6:8.2f} MB")
+
+
+# pokretanje parsera: izvrsavanje rucno napisane tablice (kao pri importu), ucitavanje slozene
+# tablice iz spremista i gradnja tablice iz gramatike kad spremiste ne postoji
+def izmjeri_pokretanje(ponavljanja=2000):
+    razlike = usporedi_tablice(ucitaj_tablicu(), RucnaTablica.tablica)
+    if razlike:
+        print(f"GRESKA: generirana tablica se razlikuje od rucne na {len(razlike)} mjesta, npr. {razlike[0]}")
+        sys.exit(1)
+
+    def gradnja():
+        with open(GRAMATIKA) as f:
+            return izgradi_tablicu(*procitaj_gramatiku(f.read()))
+
+    # kod modula se prevodi jednom, kao sto bi ga import procitao iz .pyc datoteke
+    with open(RucnaTablica.__file__) as f:
+        kod_modula = compile(f.read(), RucnaTablica.__file__, "exec")
+    put = list(sys.path)
+
+    rezultati = []
+    for naziv, funkcija in (("rucna tablica", lambda: exec(kod_modula, {"__file__": RucnaTablica.__file__})),
+                            ("spremiste", ucitaj_tablicu), ("gradnja", gradnja)):
+        pocetak = time.perf_counter()
+        for _ in range(ponavljanja):
+            funkcija()
+        rezultati.append((naziv, (time.perf_counter() - pocetak) / ponavljanja))
+        sys.path[:] = put
+
+    print("Generirana tablica jednaka je rucnoj")
+    for naziv, trajanje in rezultati:
+        print(f"{naziv:14} {trajanje * 1e6:9.1f} us  ({rezultati[0][1] / trajanje:5.2f}x)")
+
+
+# velicina tekstualnog i binarnog stabla i vrijeme ucitavanja listova u lab_3/lab_4
+# (parse_input nad tekstom prema BinarnoStablo.ucitaj nad mmapom)
+def izmjeri_binarno(broj_redaka, ponavljanja=3):
+    niz_tokena = NizTokena.iz_tokena(tokenize(io.StringIO(generiraj_izvorni_kod(broj_redaka))))
+    with tempfile.TemporaryDirectory() as mapa:
+        putanja_teksta = os.path.join(mapa, "stablo.txt")
+        putanja_binarnog = os.path.join(mapa, "stablo.bin")
+        stablo = TokStabla(niz_tokena)
+        parsiraj(niz_tokena, stablo)
+        with open(putanja_teksta, "w") as izlaz:
+            stablo.prepisi(izlaz)
+            izlaz.write("\n")
+
+        stablo = Stablo()
+        parsiraj(niz_tokena, stablo)
+        with open(putanja_binarnog, "wb") as izlaz:
+            BinarnoStablo.zapisi(stablo, niz_tokena, izlaz)
+
+        def iz_teksta():
+            stari_stdin = sys.stdin
+            with open(putanja_teksta) as sys.stdin:
+                try:
+                    return parse_input()
+                finally:
+                    sys.stdin = stari_stdin
+
+        def iz_binarnog():
+            return BinarnoStablo.ucitaj(putanja_binarnog).niz_tokena
+
+        vremena = []
+        for ucitaj in (iz_teksta, iz_binarnog):
+            najbolje = None
+            for _ in range(ponavljanja):
+                pocetak = time.perf_counter()
+                listovi = ucitaj()
+                trajanje = time.perf_counter() - pocetak
+                najbolje = trajanje if najbolje is None else min(najbolje, trajanje)
+            vremena.append((najbolje, list(listovi)))
+        (t_tekst, listovi_tekst), (t_binarno, listovi_binarno) = vremena
+
+        # binarno stablo mora dati i cijeli isti tekst stabla, ne samo iste listove (ispis stabla zavrsava
+        # praznim retkom)
+        with open(putanja_teksta) as f:
+            jednako = listovi_tekst == listovi_binarno and \
+                list(BinarnoStablo.ucitaj(putanja_binarnog).redci()) + ["\n"] == list(f)
+
+        velicina_teksta = os.path.getsize(putanja_teksta)
+        velicina_binarnog = os.path.getsize(putanja_binarnog)
+    print(f"{len(stablo):8d} cvorova  tekst: {velicina_teksta / 1e6:9.2f} MB {t_tekst * 1000:8.1f} ms"
+          f"  binarno: {velicina_binarnog / 1e6:7.3f} MB {t_binarno * 1000:6.1f} ms"
+          f"  ({velicina_teksta / velicina_binarnog:6.0f}x manje, {t_tekst / t_binarno:5.0f}x brze)"
+          f"  {'isto stablo' if jednako else 'RAZLICITO STABLO!'}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--inkrementalno":
+        for broj_redaka in (1000, 2000, 4000):
+            izmjeri_inkrementalno(broj_redaka)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--skaliranje":
+        izmjeri_skaliranje()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--dubina":
+        izmjeri_dubinu()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--tok":
+        for broj_redaka in (1000, 5000, 10000):
+            izmjeri_tok(broj_redaka)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--pokretanje":
+        izmjeri_pokretanje()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--binarno":
+        for broj_redaka in (100, 1000, 3000):
+            izmjeri_binarno(broj_redaka)
+        return
+
+    print("Upotreba: python benchmark.py --inkrementalno | --skaliranje | --dubina | --tok | --pokretanje | --binarno")
+
+
+if __name__ == "__main__":
+    main()
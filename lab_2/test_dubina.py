@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_1.LeksickiAnalizator import NizTokena
+from lab_2.benchmark import duboke_petlje, duboke_zagrade
+from lab_2.SintaksniAnalizator import Stablo, parsiraj
+
+# duboko ugnijezdeni ulazi (mnogo dublji od granice rekurzije Pythona) moraju se parsirati bez
+# rekurzije: provjerava se broj cvorova i najveca dubina stabla te ispis stabla; pokrece se s pytest
+# ili izravno (python test_dubina.py)
+
+DUBINE = (10000, 40000)
+
+
+def parsiraj_stablo(niz_tokena):
+    stablo = Stablo()
+    assert parsiraj(niz_tokena, stablo) is None
+    return stablo
+
+
+def test_duboke_petlje():
+    for dubina in DUBINE:
+        niz_tokena = duboke_petlje(dubina)
+        stablo = parsiraj_stablo(niz_tokena)
+        # svaka petlja dodaje 26 cvorova i 3 razine stabla
+        assert len(stablo) == 26 * dubina + 3
+        assert max(stablo.dubine) == 3 * dubina + 4
+        assert sum(1 for _ in stablo.redci(niz_tokena)) == len(stablo)
+
+
+def test_duboke_zagrade():
+    for dubina in DUBINE:
+        niz_tokena = duboke_zagrade(dubina)
+        stablo = parsiraj_stablo(niz_tokena)
+        # svaki par zagrada dodaje 9 cvorova i 3 razine stabla
+        assert len(stablo) == 9 * dubina + 16
+        assert max(stablo.dubine) == 3 * dubina + 7
+        assert sum(1 for _ in stablo.redci(niz_tokena)) == len(stablo)
+
+
+# bez zadnje zatvorene zagrade parser mora javiti gresku na kraju niza, a ne pasti
+def test_duboke_zagrade_bez_zadnje():
+    dubina = DUBINE[-1]
+    niz_tokena = NizTokena()
+    niz_tokena.dodaj("IDN", 1, "x")
+    niz_tokena.dodaj("OP_PRIDRUZI", 1, "=")
+    for _ in range(dubina):
+        niz_tokena.dodaj("L_ZAGRADA", 1, "(")
+    niz_tokena.dodaj("BROJ", 1, "1")
+    for _ in range(dubina - 1):
+        niz_tokena.dodaj("D_ZAGRADA", 1, ")")
+    greska = parsiraj(niz_tokena, Stablo())
+    assert greska == "err kraj"
+
+
+if __name__ == "__main__":
+    for naziv, test in list(globals().items()):
+        if naziv.startswith("test_"):
+            test()
+            print(f"{naziv}: OK")
@@ -0,0 +1,200 @@
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_1.LeksickiAnalizator import GRESKA, KODOVI_VRSTA, NizTokena, tokenize
+from lab_2.SintaksniAnalizator import Stablo, parsiraj
+from lab_3.Programi import pronadi_programe
+from lab_3.SemantickiAnalizator import TablicaDefinicija, razrijesi
+
+# trajni indeks definicija i koristenja varijabli za mnogo PJ datoteka, u SQLite bazi: za svaku
+# definiciju (ime, razina vidljivosti, redak) i sve redke u kojima se koristi, pa se pitanja "gdje je x
+# definiran / koristen" i "sto se definira / koristi u retku" odgovaraju upitom nad indeksom, bez
+# ponovne analize; pri azuriranju se ponovno analiziraju samo datoteke kojima se promijenio sadrzaj
+#
+# datoteka s leksickom ili sintaksnom greskom nema definicija, a kod semanticke greske ostaju
+# definicije i koristenja razrijeseni prije nje; greska se pamti uz datoteku
+
+# mijenja se kad se promijeni shema ili nacin analize, pa se stari indeks gradi ispocetka
+VERZIJA_INDEKSA = 1
+
+SHEMA = """
+CREATE TABLE datoteke (
+    id INTEGER PRIMARY KEY,
+    putanja TEXT NOT NULL UNIQUE,
+    sazetak TEXT NOT NULL,
+    greska TEXT
+);
+CREATE TABLE definicije (
+    id INTEGER PRIMARY KEY,
+    datoteka INTEGER NOT NULL REFERENCES datoteke(id) ON DELETE CASCADE,
+    ime TEXT NOT NULL,
+    razina INTEGER NOT NULL,
+    redak INTEGER NOT NULL
+);
+CREATE TABLE koristenja (
+    definicija INTEGER NOT NULL REFERENCES definicije(id) ON DELETE CASCADE,
+    datoteka INTEGER NOT NULL,
+    redak INTEGER NOT NULL
+);
+CREATE INDEX definicije_ime ON definicije(ime);
+CREATE INDEX definicije_redak ON definicije(datoteka, redak);
+CREATE INDEX koristenja_definicija ON koristenja(definicija);
+CREATE INDEX koristenja_redak ON koristenja(datoteka, redak);
+"""
+
+
+# tablica definicija koja uz otvorene razine pamti i sve definicije ikad dodane, redom, te indeks
+# svake definicije u tom redu (po id cvora)
+class ZapisnaTablica(TablicaDefinicija):
+    def __init__(self):
+        super().__init__()
+        self.sve_definicije = []
+        self.indeksi = {}
+
+    def definiraj(self, razina_vidljivosti, redak, ime):
+        super().definiraj(razina_vidljivosti, redak, ime)
+        cvor = self.definicije[ime][-1]
+        self.indeksi[id(cvor)] = len(self.sve_definicije)
+        self.sve_definicije.append(cvor)
+
+
+def otvori(putanja_baze):
+    veza = sqlite3.connect(putanja_baze)
+    veza.execute("PRAGMA foreign_keys = ON")
+    (verzija,) = veza.execute("PRAGMA user_version").fetchone()
+    if verzija != VERZIJA_INDEKSA:
+        with veza:
+            for (tablica,) in veza.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                veza.execute(f"DROP TABLE {tablica}")
+            veza.executescript(SHEMA)
+            veza.execute(f"PRAGMA user_version = {VERZIJA_INDEKSA}")
+    return veza
+
+
+# vraca (greska, definicije, koristenja); koristenja su parovi (indeks definicije, redak)
+def analiziraj(izvorni_kod):
+    niz_tokena = NizTokena.iz_tokena(tokenize(io.StringIO(izvorni_kod, newline="\n")))
+    if KODOVI_VRSTA[GRESKA] in niz_tokena.vrste:
+        return (GRESKA, [], [])
+    greska = parsiraj(niz_tokena, Stablo())
+    if greska is not None:
+        return (greska, [], [])
+
+    tablica = ZapisnaTablica()
+    koristenja = []
+    for token, cvor in razrijesi(niz_tokena, tablica):
+        if cvor is None:
+            greska = f"err {token.redak} {token.leksem}"
+            break
+        koristenja.append((tablica.indeksi[id(cvor)], token.redak))
+    return (greska, tablica.sve_definicije, koristenja)
+
+
+def indeksiraj(veza, putanja, sazetak, izvorni_kod):
+    greska, definicije, koristenja = analiziraj(izvorni_kod)
+    veza.execute("DELETE FROM datoteke WHERE putanja = ?", (putanja,))
+    datoteka = veza.execute("INSERT INTO datoteke (putanja, sazetak, greska) VALUES (?, ?, ?)",
+                            (putanja, sazetak, greska)).lastrowid
+    id_definicija = [
+        veza.execute("INSERT INTO definicije (datoteka, ime, razina, redak) VALUES (?, ?, ?, ?)",
+                     (datoteka, cvor.value, cvor.visibility_level, cvor.definition_line)).lastrowid
+        for cvor in definicije
+    ]
+    veza.executemany("INSERT INTO koristenja (definicija, datoteka, redak) VALUES (?, ?, ?)",
+                     ((id_definicija[indeks], datoteka, redak) for indeks, redak in koristenja))
+
+
+# analizira samo nove i promijenjene datoteke, a iz indeksa uklanja datoteke kojih vise nema na disku;
+# vraca (indeksirano, nepromijenjeno, uklonjeno)
+def azuriraj(veza, putanje):
+    sazeci = dict(veza.execute("SELECT putanja, sazetak FROM datoteke"))
+    indeksirano = nepromijenjeno = 0
+    with veza:
+        for putanja in pronadi_programe(putanje):
+            putanja = os.path.abspath(putanja)
+            with open(putanja, "rb") as f:
+                podaci = f.read()
+            sazetak = hashlib.sha256(podaci).hexdigest()
+            if sazeci.get(putanja) == sazetak:
+                nepromijenjeno += 1
+                continue
+            indeksiraj(veza, putanja, sazetak, podaci.decode("utf-8", "surrogateescape"))
+            indeksirano += 1
+        uklonjene = [(putanja,) for putanja in sazeci if not os.path.exists(putanja)]
+        veza.executemany("DELETE FROM datoteke WHERE putanja = ?", uklonjene)
+    return (indeksirano, nepromijenjeno, len(uklonjene))
+
+
+# sve definicije imena: (putanja, redak definicije, razina, [redci koristenja])
+def po_imenu(veza, ime):
+    rezultat = {}
+    for id_definicije, putanja, redak, razina, redak_koristenja in veza.execute(
+            "SELECT d.id, f.putanja, d.redak, d.razina, k.redak FROM definicije d"
+            " JOIN datoteke f ON f.id = d.datoteka LEFT JOIN koristenja k ON k.definicija = d.id"
+            " WHERE d.ime = ? ORDER BY f.putanja, d.redak, d.id, k.rowid", (ime,)):
+        _, _, _, koristenja = rezultat.setdefault(id_definicije, (putanja, redak, razina, []))
+        if redak_koristenja is not None:
+            koristenja.append(redak_koristenja)
+    return list(rezultat.values())
+
+
+# definicije u retku, (ime, razina, [redci koristenja]), i koristenja u retku, (ime, redak definicije)
+def po_retku(veza, putanja, redak):
+    definicije = {}
+    for id_definicije, ime, razina, redak_koristenja in veza.execute(
+            "SELECT d.id, d.ime, d.razina, k.redak FROM definicije d JOIN datoteke f ON f.id = d.datoteka"
+            " LEFT JOIN koristenja k ON k.definicija = d.id"
+            " WHERE f.putanja = ? AND d.redak = ? ORDER BY d.id, k.rowid", (putanja, redak)):
+        _, _, koristenja = definicije.setdefault(id_definicije, (ime, razina, []))
+        if redak_koristenja is not None:
+            koristenja.append(redak_koristenja)
+    koristenja = veza.execute(
+        "SELECT d.ime, d.redak FROM koristenja k JOIN datoteke f ON f.id = k.datoteka"
+        " JOIN definicije d ON d.id = k.definicija WHERE f.putanja = ? AND k.redak = ? ORDER BY k.rowid",
+        (putanja, redak)).fetchall()
+    return (list(definicije.values()), koristenja)
+
+
+# python IndeksKoristenja.py baza.db --azuriraj program.pj|mapa ...
+# python IndeksKoristenja.py baza.db --ime x
+# python IndeksKoristenja.py baza.db --redak program.pj:12
+def main():
+    if len(sys.argv) < 4 or sys.argv[2] not in ("--azuriraj", "--ime", "--redak"):
+        print("upotreba: IndeksKoristenja.py baza.db (--azuriraj putanja... | --ime ime | --redak datoteka:redak)",
+              file=sys.stderr)
+        sys.exit(2)
+    veza = otvori(sys.argv[1])
+
+    if sys.argv[2] == "--azuriraj":
+        pocetak = time.perf_counter()
+        indeksirano, nepromijenjeno, uklonjeno = azuriraj(veza, sys.argv[3:])
+        print(f"Indeksirano {indeksirano}, nepromijenjeno {nepromijenjeno}, uklonjeno {uklonjeno} datoteka "
+              f"({time.perf_counter() - pocetak:.2f} s)", file=sys.stderr)
+        for putanja, greska in veza.execute("SELECT putanja, greska FROM datoteke WHERE greska IS NOT NULL"
+                                            " ORDER BY putanja"):
+            print(f"{putanja}: {greska}", file=sys.stderr)
+
+    elif sys.argv[2] == "--ime":
+        ime = sys.argv[3]
+        for putanja, redak, razina, koristenja in po_imenu(veza, ime):
+            print(f"{putanja}:{redak} {ime} razina {razina} koristenja: {' '.join(map(str, koristenja))}")
+
+    else:
+        putanja, redak = sys.argv[3].rsplit(":", 1)
+        putanja = os.path.abspath(putanja)
+        definicije, koristenja = po_retku(veza, putanja, int(redak))
+        for ime, razina, redci in definicije:
+            print(f"{putanja}:{redak} definicija {ime} razina {razina} koristenja: {' '.join(map(str, redci))}")
+        for ime, redak_definicije in koristenja:
+            print(f"{putanja}:{redak} koristenje {ime} definicija u retku {redak_definicije}")
+
+    veza.close()
+
+
+if __name__ == "__main__":
+    main()
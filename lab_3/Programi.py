@@ -0,0 +1,16 @@
+import os
+
+# pronalazenje PJ programa za alate koji rade nad mnogo datoteka (IndeksKoristenja, VisestrukoPrevodenje)
+
+
+# datoteke i mape (u mapama se traze sve .pj datoteke)
+def pronadi_programe(putanje):
+    programi = []
+    for putanja in putanje:
+        if os.path.isdir(putanja):
+            for mapa, podmape, datoteke in os.walk(putanja):
+                podmape.sort()   # os.walk obilazi podmape redom iz ove liste, pa je redoslijed programa stalan
+                programi.extend(os.path.join(mapa, naziv) for naziv in sorted(datoteke) if naziv.endswith(".pj"))
+        else:
+            programi.append(putanja)
+    return programi
@@ -1,40 +1,27 @@
+import os
 import sys
 # rade svi osim 11, 12, 16 i 18, to je nekih 4 bod aod 5
 
-class Node:
-    def __init__(self, level, lex_type, line_num, value):
-        self.level = level
-        self.lex_type = lex_type
-        self.line_num = line_num
-        self.value = value
-
-    def __repr__(self):
-        base_output = f"{' ' * self.level}{self.lex_type} {self.line_num} {self.value}"
-        padding = ' ' * (100 - len(base_output) - len(f" - razina hijerarhije: {self.level:3}"))
-        return f"{base_output}{padding}- razina hijerarhije: {self.level:3}".rstrip()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_1.LeksickiAnalizator import NizTokena, Token
 
-def parse_input():
-    nodes = []
-    
-    for line in sys.stdin:
+# lijeno cita stablo redak po redak i vraca samo listove, kao Token(vrsta, redak, leksem)
+def listovi(stream):
+    for line in stream:
         stripped_line = line.strip()
 
         if stripped_line.startswith('<') and stripped_line.endswith('>') or stripped_line == "$":
             continue
 
-        level = len(line) - len(line.lstrip())
-
         parts = stripped_line.split()
         if len(parts) < 3:
             continue 
 
-        lex_type = parts[0]
-        line_num = int(parts[1])
-        value = " ".join(parts[2:])
-
-        nodes.append(Node(level, lex_type, line_num, value))
+        yield Token(parts[0], int(parts[1]), " ".join(parts[2:]))
 
-    return nodes
+def parse_input():
+    # listovi stabla su upravo tokeni programa, pa ih spremamo u kompaktni NizTokena
+    return NizTokena.iz_tokena(listovi(sys.stdin))
 
 class DefinedIdentifierNode:
     def __init__(self, visibility_level, definition_line, value):
@@ -45,63 +32,135 @@ class DefinedIdentifierNode:
     def __repr__(self):
         return f"visibility_level: {self.visibility_level}, definition_line: {self.definition_line}, value: {self.value}"
 
-# glavni dio koda:
-lista_ulaznih_podataka = parse_input()
-
-lista_definiranih = []
-razina_vidljivosti = 0
-redak_koji_se_provjerava = 0
-znak_koji_se_provjerava = "\0"
-
-
-for index, ulazni_podatak in enumerate(lista_ulaznih_podataka):
-   pravilno_je_definiran = False
-
-   if index != len(lista_ulaznih_podataka) - 1:
-      if ulazni_podatak.lex_type == "IDN" and lista_ulaznih_podataka[index + 1].value == "=":
-            if not any(definedNode.value == ulazni_podatak.value for definedNode in lista_definiranih):
-               lista_definiranih.append(DefinedIdentifierNode(razina_vidljivosti, ulazni_podatak.line_num, ulazni_podatak.value))
-               redak_koji_se_provjerava = ulazni_podatak.line_num
-               znak_koji_se_provjerava = ulazni_podatak.value
-
-      elif ulazni_podatak.lex_type == "IDN" and index != 0 and lista_ulaznih_podataka[index - 1].lex_type == "KR_ZA":
-            # treba provjeriti dali se do kraja retka nalazi ijendom tja isti znak
-            # to mozda treba i nekkao sve do tijela funckije sot nezma kako bi
-            redak_koji_se_provjerava = ulazni_podatak.line_num
-            znak_koji_se_provjerava = ulazni_podatak.value
-
-            razina_vidljivosti += 1
-            lista_definiranih.append(DefinedIdentifierNode(razina_vidljivosti, ulazni_podatak.line_num, ulazni_podatak.value))
-
-      elif ulazni_podatak.lex_type == "IDN":
-            # ukoliko se u isotm redu u za peltji nalazi znak koji se tke definrirao onda baci gresku, vjeorvatno bi trebalo radit cak i ak se za peltja prelomi mozda
-            if(ulazni_podatak.line_num == redak_koji_se_provjerava and ulazni_podatak.value == znak_koji_se_provjerava):
-               print(f"err {ulazni_podatak.line_num} {ulazni_podatak.value}")
-               break
-            for defined_node in reversed(lista_definiranih):
-               if ulazni_podatak.value == defined_node.value:
-                  print(f"{ulazni_podatak.line_num} {defined_node.definition_line} {ulazni_podatak.value}")
-                  pravilno_je_definiran = True
-                  break
-            if not pravilno_je_definiran:
-               print(f"err {ulazni_podatak.line_num} {ulazni_podatak.value}")
-               break
-
-      elif ulazni_podatak.lex_type == "KR_AZ":
-            lista_definiranih = list(filter(lambda definirani_podatak: definirani_podatak.visibility_level < razina_vidljivosti, lista_definiranih))
-            razina_vidljivosti -= 1
-
-   if index == len(lista_ulaznih_podataka) - 1:
-      if ulazni_podatak.lex_type == "IDN":
-            for defined_node in reversed(lista_definiranih):
-               if ulazni_podatak.value == defined_node.value:
-                  print(f"{ulazni_podatak.line_num} {defined_node.definition_line} {ulazni_podatak.value}")
-                  pravilno_je_definiran = True
-                  break
-            if not pravilno_je_definiran:
-               print(f"err {ulazni_podatak.line_num} {ulazni_podatak.value}")
-               break
-
-      elif ulazni_podatak.lex_type == "KR_AZ":
-            lista_definiranih = list(filter(lambda definirani_podatak: definirani_podatak.visibility_level < razina_vidljivosti, lista_definiranih))
-            razina_vidljivosti -= 1
+class ListaDefinicija:
+    # prvotna tablica: lista svih definicija koja se pretrazuje od kraja; ostaje za usporedbu (benchmark.py)
+    def __init__(self):
+        self.lista_definiranih = []
+
+    def definiraj(self, razina_vidljivosti, redak, ime):
+        self.lista_definiranih.append(DefinedIdentifierNode(razina_vidljivosti, redak, ime))
+
+    def je_li_definiran(self, ime):
+        return any(definedNode.value == ime for definedNode in self.lista_definiranih)
+
+    def pronadi(self, ime):
+        for defined_node in reversed(self.lista_definiranih):
+            if ime == defined_node.value:
+                return defined_node
+        return None
+
+    def izadi_iz_razine(self, razina_vidljivosti):
+        self.lista_definiranih = list(filter(lambda definirani_podatak: definirani_podatak.visibility_level < razina_vidljivosti, self.lista_definiranih))
+
+class TablicaDefinicija:
+    # za svako ime stog njegovih definicija (zadnja je na vrhu) i za svaku razinu dnevnik imena definiranih
+    # na njoj; definicije se uvijek dodaju na trenutnoj, najvisoj razini, pa izlazak iz razine skida upravo
+    # vrhove stogova imena iz njenog dnevnika, isto kao filter nad listom svih definicija
+    def __init__(self):
+        self.definicije = {}
+        self.dnevnik = {}
+
+    def definiraj(self, razina_vidljivosti, redak, ime):
+        self.definicije.setdefault(ime, []).append(DefinedIdentifierNode(razina_vidljivosti, redak, ime))
+        self.dnevnik.setdefault(razina_vidljivosti, []).append(ime)
+
+    def je_li_definiran(self, ime):
+        return ime in self.definicije
+
+    def pronadi(self, ime):
+        stog = self.definicije.get(ime)
+        return stog[-1] if stog else None
+
+    def izadi_iz_razine(self, razina_vidljivosti):
+        for ime in self.dnevnik.pop(razina_vidljivosti, ()):
+            stog = self.definicije[ime]
+            stog.pop()
+            if not stog:
+                del self.definicije[ime]
+
+# razrjesava tokene (listove stabla) u jednom prolazu: za svako koristenje varijable odmah vraca
+# (token, cvor definicije), a kod prve nedefinirane varijable (token, None) i staje; pamti se samo
+# sljedeci token, vrsta prethodnog i definicije u trenutno otvorenim razinama (u praznoj tablici definicije)
+def razrijesi(tokeni, definicije):
+   razina_vidljivosti = 0
+   redak_koji_se_provjerava = 0
+   znak_koji_se_provjerava = "\0"
+
+   tokeni = iter(tokeni)
+   prethodna_vrsta = None
+   ulazni_podatak = next(tokeni, None)
+
+   while ulazni_podatak is not None:
+      sljedeci = next(tokeni, None)
+
+      if sljedeci is not None:
+         if ulazni_podatak.vrsta == "IDN" and sljedeci.leksem == "=":
+               if not definicije.je_li_definiran(ulazni_podatak.leksem):
+                  definicije.definiraj(razina_vidljivosti, ulazni_podatak.redak, ulazni_podatak.leksem)
+                  redak_koji_se_provjerava = ulazni_podatak.redak
+                  znak_koji_se_provjerava = ulazni_podatak.leksem
+
+         elif ulazni_podatak.vrsta == "IDN" and prethodna_vrsta == "KR_ZA":
+               # treba provjeriti dali se do kraja retka nalazi ijendom tja isti znak
+               # to mozda treba i nekkao sve do tijela funckije sot nezma kako bi
+               redak_koji_se_provjerava = ulazni_podatak.redak
+               znak_koji_se_provjerava = ulazni_podatak.leksem
+
+               razina_vidljivosti += 1
+               definicije.definiraj(razina_vidljivosti, ulazni_podatak.redak, ulazni_podatak.leksem)
+
+         elif ulazni_podatak.vrsta == "IDN":
+               # ukoliko se u isotm redu u za peltji nalazi znak koji se tke definrirao onda baci gresku, vjeorvatno bi trebalo radit cak i ak se za peltja prelomi mozda
+               if(ulazni_podatak.redak == redak_koji_se_provjerava and ulazni_podatak.leksem == znak_koji_se_provjerava):
+                  yield (ulazni_podatak, None)
+                  return
+               defined_node = definicije.pronadi(ulazni_podatak.leksem)
+               yield (ulazni_podatak, defined_node)
+               if defined_node is None:
+                  return
+
+         elif ulazni_podatak.vrsta == "KR_AZ":
+               definicije.izadi_iz_razine(razina_vidljivosti)
+               razina_vidljivosti -= 1
+
+      else:
+         if ulazni_podatak.vrsta == "IDN":
+               defined_node = definicije.pronadi(ulazni_podatak.leksem)
+               yield (ulazni_podatak, defined_node)
+               if defined_node is None:
+                  return
+
+         elif ulazni_podatak.vrsta == "KR_AZ":
+               definicije.izadi_iz_razine(razina_vidljivosti)
+               razina_vidljivosti -= 1
+
+      prethodna_vrsta = ulazni_podatak.vrsta
+      ulazni_podatak = sljedeci
+
+# redci ispisa, cim su razrijeseni: za svako koristenje varijable "redak_koristenja redak_definicije ime",
+# a kod prve nedefinirane varijable redak greske
+def provjeri_tok(tokeni, tablica=TablicaDefinicija):
+   for ulazni_podatak, defined_node in razrijesi(tokeni, tablica()):
+      if defined_node is None:
+         yield f"err {ulazni_podatak.redak} {ulazni_podatak.leksem}"
+      else:
+         yield f"{ulazni_podatak.redak} {defined_node.definition_line} {ulazni_podatak.leksem}"
+
+# isto kao provjeri_tok, ali nad gotovim nizom tokena i s cijelim ispisom kao listom redaka
+def provjeri(lista_ulaznih_podataka, tablica=TablicaDefinicija):
+   return list(provjeri_tok(lista_ulaznih_podataka, tablica))
+
+
+if __name__ == "__main__":
+   # glavni dio koda: stablo se cita i provjerava redak po redak, a svaki razrijeseni redak
+   # odmah ide u izlazni medusprenik (i na terminalu, bez praznjenja po retku)
+   if "--binarno" in sys.argv[1:]:
+      # binarno stablo iz lab_2 (SintaksniAnalizator.py --binarno)
+      from lab_2.BinarnoStablo import ucitaj
+      tokeni = ucitaj(sys.argv[sys.argv.index("--binarno") + 1]).niz_tokena
+   else:
+      tokeni = listovi(sys.stdin)
+   sys.stdout.reconfigure(line_buffering=False)
+   izlaz = sys.stdout.write
+   for redak in provjeri_tok(tokeni):
+      izlaz(redak + "\n")
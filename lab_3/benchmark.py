@@ -0,0 +1,172 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lab_1.LeksickiAnalizator import NizTokena
+from lab_1.benchmark import generiraj_izvorni_kod
+from lab_3.IndeksKoristenja import analiziraj, azuriraj, otvori, po_imenu, po_retku
+from lab_3.SemantickiAnalizator import ListaDefinicija, TablicaDefinicija, listovi, provjeri, provjeri_tok
+from lab_4.Prevoditelj import leksiraj, parsiraj_u_stablo
+
+
+# dubina ugnijezdenih za petlji (svaka sa svojom varijablom), a u najdubljoj petlji broj_imena naredbi
+# xK = xK-1 + iJ, pa je broj razlicitih imena broj_imena + dubina; niz tokena slazemo izravno
+def program(broj_imena, dubina=1000):
+    niz_tokena = NizTokena()
+    redak = 0
+    for i in range(dubina):
+        redak += 1
+        for vrsta, leksem in (("KR_ZA", "za"), ("IDN", f"i{i}"), ("KR_OD", "od"), ("BROJ", "0"), ("KR_DO", "do"), ("BROJ", "1")):
+            niz_tokena.dodaj(vrsta, redak, leksem)
+    for k in range(broj_imena):
+        redak += 1
+        niz_tokena.dodaj("IDN", redak, f"x{k}")
+        niz_tokena.dodaj("OP_PRIDRUZI", redak, "=")
+        niz_tokena.dodaj("IDN", redak, f"x{k - 1}" if k > 0 else "i0")
+        niz_tokena.dodaj("OP_PLUS", redak, "+")
+        niz_tokena.dodaj("IDN", redak, f"i{k % dubina}")
+    for _ in range(dubina):
+        redak += 1
+        niz_tokena.dodaj("KR_AZ", redak, "az")
+    return niz_tokena
+
+
+# lista definicija (O(koristenja x definicija)) prema tablici sa stogom po imenu (O(1) po koristenju)
+def izmjeri_tablice():
+    dubina = 1000
+    najvise_za_listu = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    print(f"dubina ugnijezdenja {dubina}; lista se mjeri do {najvise_za_listu} imena")
+    for broj_imena in (1000, 10000, 100000):
+        niz_tokena = program(broj_imena, dubina)
+
+        pocetak = time.perf_counter()
+        ispis = provjeri(niz_tokena, TablicaDefinicija)
+        t_tablica = time.perf_counter() - pocetak
+
+        if broj_imena <= najvise_za_listu:
+            pocetak = time.perf_counter()
+            ispis_lista = provjeri(niz_tokena, ListaDefinicija)
+            t_lista = time.perf_counter() - pocetak
+            lista = f"{t_lista:8.2f} s"
+            usporedba = f"({t_lista / t_tablica:7.1f}x, {'isti ispis' if ispis == ispis_lista else 'RAZLICIT ISPIS!'})"
+        else:
+            lista = "   -     "
+            usporedba = ""
+        print(f"{broj_imena + dubina:7d} imena {len(niz_tokena):8d} tokena  lista: {lista}  "
+              f"tablica: {t_tablica:6.3f} s  {usporedba}")
+
+
+DEFINICIJE = "".join(f"{ime} = 0\n" for ime in ("x", "y", "brojac", "rez", "a1"))
+
+
+# vrsno zauzece memorije i trajanje: cijeli niz listova pa ispis kao lista redaka (parse_input + provjeri)
+# prema provjeri_tok nad stablom koje se cita redak po redak; ispis ide u datoteku
+def izmjeri_tok():
+    with tempfile.TemporaryDirectory() as mapa:
+        for broj_redaka in (1000, 2000, 4000):
+            # sve varijable generatora su definirane na pocetku, da provjera prode cijeli program
+            niz_tokena = leksiraj(DEFINICIJE + generiraj_izvorni_kod(broj_redaka))
+            _, stablo = parsiraj_u_stablo(niz_tokena)
+            putanja_stabla = os.path.join(mapa, "stablo.txt")
+            with open(putanja_stabla, "w") as f:
+                f.writelines(stablo.redci(niz_tokena))
+                f.write("\n")
+            velicina_stabla = os.path.getsize(putanja_stabla)
+            del niz_tokena, stablo
+
+            def cijeli_niz(izlaz):
+                with open(putanja_stabla) as ulaz:
+                    for redak in provjeri(NizTokena.iz_tokena(listovi(ulaz))):
+                        izlaz.write(redak + "\n")
+
+            def tok(izlaz):
+                with open(putanja_stabla) as ulaz:
+                    for redak in provjeri_tok(listovi(ulaz)):
+                        izlaz.write(redak + "\n")
+
+            rezultati = []
+            for naziv, funkcija in (("cijeli_niz", cijeli_niz), ("tok", tok)):
+                putanja_izlaza = os.path.join(mapa, naziv + ".txt")
+                with open(putanja_izlaza, "w") as izlaz:
+                    tracemalloc.start()
+                    pocetak = time.perf_counter()
+                    funkcija(izlaz)
+                    trajanje = time.perf_counter() - pocetak
+                    _, vrh = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                with open(putanja_izlaza) as f:
+                    rezultati.append((trajanje, vrh, f.read()))
+
+            (t_niz, m_niz, ispis_niz), (t_tok, m_tok, ispis_tok) = rezultati
+            broj_ispisanih = len(ispis_tok.splitlines())
+            print(f"{broj_redaka:5d} redaka, stablo {velicina_stabla / 2**20:7.1f} MiB  "
+                  f"cijeli niz: {t_niz:6.2f} s {m_niz / 2**10:8.0f} KiB  tok: {t_tok:6.2f} s {m_tok / 2**10:6.0f} KiB  "
+                  f"{broj_ispisanih:6d} redaka ispisa  {'isti ispis' if ispis_niz == ispis_tok else 'RAZLICIT ISPIS!'}")
+
+
+# korpus PJ datoteka: izgradnja indeksa, azuriranje bez promjena i nakon promjene 10% datoteka, te
+# trajanje upita po imenu i po retku prema ponovnoj analizi cijelog korpusa za isto pitanje
+def izmjeri_indeks(broj_programa=1000, broj_redaka=200, broj_upita=200):
+    with tempfile.TemporaryDirectory() as mapa:
+        programi = []
+        for seed in range(broj_programa):
+            putanja = os.path.join(mapa, f"program{seed}.pj")
+            with open(putanja, "w") as f:
+                f.write(DEFINICIJE + generiraj_izvorni_kod(broj_redaka, seed))
+            programi.append(putanja)
+        veza = otvori(os.path.join(mapa, "indeks.db"))
+
+        def azuriranje(opis):
+            pocetak = time.perf_counter()
+            indeksirano, nepromijenjeno, _ = azuriraj(veza, [mapa])
+            print(f"{opis:28} {time.perf_counter() - pocetak:7.3f} s  (indeksirano {indeksirano}, "
+                  f"nepromijenjeno {nepromijenjeno})")
+
+        azuriranje("izgradnja indeksa")
+        azuriranje("bez promjena")
+        for putanja in programi[::10]:
+            with open(putanja, "a") as f:
+                f.write("rez = rez + 1\n")
+        azuriranje("10% datoteka promijenjeno")
+
+        imena = ["x", "y", "brojac", "rez", "a1", "i0", "i3"]
+        pocetak = time.perf_counter()
+        for i in range(broj_upita):
+            po_imenu(veza, imena[i % len(imena)])
+        t_ime = (time.perf_counter() - pocetak) / broj_upita
+        pocetak = time.perf_counter()
+        for i in range(broj_upita):
+            po_retku(veza, programi[i % broj_programa], 1 + i % broj_redaka)
+        t_redak = (time.perf_counter() - pocetak) / broj_upita
+
+        # bez indeksa isto pitanje po imenu trazi analizu svih datoteka
+        pocetak = time.perf_counter()
+        for putanja in programi:
+            with open(putanja) as f:
+                _, definicije, _ = analiziraj(f.read())
+            [cvor for cvor in definicije if cvor.value == "rez"]
+        t_analiza = time.perf_counter() - pocetak
+        veza.close()
+
+    print(f"upit po imenu:  {t_ime * 1000:7.2f} ms   upit po retku: {t_redak * 1000:7.3f} ms   "
+          f"ponovna analiza korpusa: {t_analiza * 1000:8.0f} ms ({t_analiza / t_ime:.0f}x)")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--indeks":
+        izmjeri_indeks()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--tok":
+        izmjeri_tok()
+        return
+
+    izmjeri_tablice()
+
+
+if __name__ == "__main__":
+    main()
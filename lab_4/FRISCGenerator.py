@@ -1,28 +1,18 @@
 # !!! ovo predajem - radi u 16/20 posot slucajeva ako se dogdi timeout na 20 testu ili ako se ne dogodi onda 17/20, sot je od 4/5 do 4.25/5 bdoova s cime sam cisot zadovoljan
+import os
 import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_1.LeksickiAnalizator import NizTokena
 
 ##
-## 1) Definicija čvorova i parse_input
+## 1) parse_input
 ##
 
-class Node:
-    def __init__(self, level, lex_type, line_num, value):
-        self.level = level
-        self.lex_type = lex_type
-        self.line_num = line_num
-        self.value = value
-        self.children = []
-
-    def __repr__(self):
-        return (f"Node({self.lex_type},"
-                f"{self.line_num},"
-                f"{self.value},"
-                f"level={self.level},"
-                f"children={len(self.children)})")
-
-
 def parse_input():
-    nodes = []
+    # listovi stabla su upravo tokeni programa, pa ih spremamo u kompaktni NizTokena
+    niz_tokena = NizTokena()
     for line in sys.stdin:
         stripline = line.strip()
         if not stripline or stripline == "$":
@@ -31,7 +21,6 @@ def parse_input():
             # preskačemo npr. <program>, <lista_naredbi>...
             continue
 
-        level = len(line) - len(line.lstrip())
         parts = stripline.split()
         if len(parts) < 3:
             continue
@@ -40,10 +29,9 @@ def parse_input():
         line_num = int(parts[1])
         value = " ".join(parts[2:])
 
-        n = Node(level, lex_type, line_num, value)
-        nodes.append(n)
+        niz_tokena.dodaj(lex_type, line_num, value)
 
-    return nodes
+    return niz_tokena
 
 ##
 ## 2) AST klase
@@ -70,6 +58,12 @@ class ForAST(StatementAST):
         self.e2 = e2
         self.inner_stmts = inner_stmts
 
+class IncrementAST(StatementAST):
+    # brojac++ izmedu kopija tijela odmotane petlje (isti kod kao brojac++ na kraju petlje)
+    def __init__(self, var_name, line_num):
+        self.var_name = var_name
+        self.line_num = line_num
+
 #
 # Expressions
 #
@@ -147,20 +141,20 @@ def build_program_ast(nodes, start_i=0):
         nd = nodes[i]
 
         # KR_AZ => break
-        if nd.lex_type == "KR_AZ":
+        if nd.vrsta == "KR_AZ":
             break
 
         # KR_ZA => for-petlja
-        if nd.lex_type == "KR_ZA":
+        if nd.vrsta == "KR_ZA":
             scope_level += 1
             i+=1
             if i>=n: 
                 break
             brojac = nodes[i]
-            if brojac.lex_type!="IDN":
+            if brojac.vrsta!="IDN":
                 break
-            var_name = brojac.value
-            line_num = brojac.line_num
+            var_name = brojac.leksem
+            line_num = brojac.redak
             i+=1
 
             # stvori *NOVU* definiciju u trenutačnom scopeu (ako nema u tom scopeu)
@@ -172,14 +166,14 @@ def build_program_ast(nodes, start_i=0):
                 list_defined.append(DefinedIdentifier(scope_level,line_num,var_name))
 
             # KR_OD
-            if i<n and nodes[i].lex_type=="KR_OD":
+            if i<n and nodes.vrsta(i)=="KR_OD":
                 i+=1
                 (expr1, i) = parse_expression(nodes, i)
             else:
                 expr1=NumAST("0")
 
             # KR_DO
-            if i<n and nodes[i].lex_type=="KR_DO":
+            if i<n and nodes.vrsta(i)=="KR_DO":
                 i+=1
                 (expr2,i) = parse_expression(nodes,i)
             else:
@@ -190,7 +184,7 @@ def build_program_ast(nodes, start_i=0):
             inner_stmts=inner_prog.stmts
 
             # potroši KR_AZ
-            if i2<n and nodes[i2].lex_type=="KR_AZ":
+            if i2<n and nodes.vrsta(i2)=="KR_AZ":
                 i2+=1
 
             # sada izlazimo iz scopea
@@ -214,10 +208,10 @@ def build_program_ast(nodes, start_i=0):
             continue
 
         # Ako IDN i '=' => assign
-        if nd.lex_type=="IDN":
-            if i+1<n and nodes[i+1].lex_type=="OP_PRIDRUZI":
-                var_name = nd.value
-                line_num = nd.line_num
+        if nd.vrsta=="IDN":
+            if i+1<n and nodes.vrsta(i+1)=="OP_PRIDRUZI":
+                var_name = nd.leksem
+                line_num = nd.redak
                 i+=2
                 (expr, i) = parse_expression(nodes,i)
                 # ako nema definicije u scopeu => stvori
@@ -245,8 +239,8 @@ def parse_E_lista(nodes,start_i,left_ast):
     n = len(nodes)
     while i<n:
         tk=nodes[i]
-        if tk.lex_type in ["OP_PLUS","OP_MINUS"]:
-            op = tk.value
+        if tk.vrsta in ["OP_PLUS","OP_MINUS"]:
+            op = tk.leksem
             i+=1
             (right_ast, i)=parse_T(nodes,i)
             left_ast=BinaryOpAST(left_ast,op,right_ast)
@@ -263,8 +257,8 @@ def parse_T_lista(nodes,start_i,left_ast):
     n = len(nodes)
     while i<n:
         tk=nodes[i]
-        if tk.lex_type in ["OP_PUTA","OP_DIJELI"]:
-            op = tk.value
+        if tk.vrsta in ["OP_PUTA","OP_DIJELI"]:
+            op = tk.leksem
             i+=1
             (right_ast, i)=parse_P(nodes,i)
             left_ast=BinaryOpAST(left_ast,op,right_ast)
@@ -276,12 +270,12 @@ def parse_P(nodes,start_i):
     if start_i>=len(nodes):
         return (NumAST("0"), start_i)
     tk=nodes[start_i]
-    if tk.lex_type=="BROJ":
-        return (NumAST(tk.value), start_i+1)
-    if tk.lex_type=="IDN":
-        return (VarAST(tk.value,tk.line_num), start_i+1)
-    if tk.lex_type in ["OP_PLUS","OP_MINUS"]:
-        op = tk.value
+    if tk.vrsta=="BROJ":
+        return (NumAST(tk.leksem), start_i+1)
+    if tk.vrsta=="IDN":
+        return (VarAST(tk.leksem,tk.redak), start_i+1)
+    if tk.vrsta in ["OP_PLUS","OP_MINUS"]:
+        op = tk.leksem
         (sube, i2)=parse_P(nodes,start_i+1)
         return (UnaryOpAST(op,sube), i2)
     # fallback
@@ -290,10 +284,53 @@ def parse_P(nodes,start_i):
 ##
 ## 5) Generiranje FRISC
 ##
-frisc_file = open("a.frisc","w")
+frisc_file = None # postavlja ga generiraj()
+use_registers = False # postavlja ga generiraj(); izrazi u registrima R0-R5 umjesto na stogu
+fast_md = False # postavlja ga generiraj(); brzi MUL/DIV i mnozenje/dijeljenje konstantom bez poziva
+optimize_loops = False # postavlja ga generiraj(); petlje s granicom i brojacem u registrima (generate_loop)
+instructions = [] # generirane naredbe; generiraj() ih zapisuje u frisc_file na kraju
+constant_pool = {} # konstanta -> oznaka rijeci (DW) za konstante koje ne stanu u MOVE
+
+class Instruction:
+    # jedan redak FRISC koda: oznaka, mnemonik i operandi (op je None za redak samo s oznakom ili
+    # komentarom); text je izvorni redak, a naredbe koje stvori peephole ga nemaju
+    __slots__ = ("label", "op", "args", "text")
+
+    def __init__(self, op, args=(), label=None, text=None):
+        self.label = label
+        self.op    = op
+        self.args  = list(args)
+        self.text  = text
+
+    @classmethod
+    def parse(cls, line):
+        body = line.split(";", 1)[0]
+        label = None
+        if body and not body[0].isspace():
+            label, _, body = body.partition(" ")
+        parts = body.split(None, 1)
+        op = parts[0].upper() if parts else None
+        args = [a.strip() for a in parts[1].split(",")] if len(parts) > 1 else []
+        return cls(op, args, label, line)
+
+    def __str__(self):
+        if self.text is not None:
+            return self.text
+        return f"{self.label or ''}  {self.op} {', '.join(self.args)}".rstrip()
 
 def emit(line):
-    frisc_file.write(line+"\n")
+    for l in line.split("\n"):
+        instructions.append(Instruction.parse(l))
+
+def emit_constant(value, reg):
+    # MOVE prima 20-bitni broj s predznakom; veca konstanta se cita iz rijeci na kraju programa
+    value = wrap32(value)
+    if -(1 << 19) <= value < (1 << 19):
+        emit(f"  MOVE %D {value}, {reg}")
+    else:
+        if value not in constant_pool:
+            constant_pool[value] = f"K{len(constant_pool)}"
+        emit(f"  LOAD {reg}, ({constant_pool[value]})")
 
 label_counter=0
 def new_label(prefix="L"):
@@ -316,19 +353,28 @@ def generate_program(prog_ast):
 
 def generate_statement(stmt):
     if isinstance(stmt, AssignAST):
-        # generiraj expr => push
-        generate_expression(stmt.expr)
-        emit_pop("R0")
+        # generiraj expr => R0
+        generate_into(stmt.expr, "R0")
         lbl = find_var_label(stmt.var_name)
         if not lbl:
             # fallback: globalno
             lbl = alloc_var(stmt.var_name,0)
         emit(f"  STORE R0, ({lbl})")
 
+    elif isinstance(stmt, IncrementAST):
+        lbl = find_var_label(stmt.var_name)
+        if not lbl:
+            lbl = alloc_var(stmt.var_name,0)
+        emit(f"  LOAD R0, ({lbl})")
+        emit("  ADD R0, 1, R0")
+        emit(f"  STORE R0, ({lbl})")
+
+    elif isinstance(stmt, ForAST) and optimize_loops:
+        generate_loop(stmt)
+
     elif isinstance(stmt, ForAST):
         # inicijalizacija
-        generate_expression(stmt.e1)
-        emit_pop("R0")
+        generate_into(stmt.e1, "R0")
         lbl = find_var_label(stmt.var_name)
         if not lbl:
             lbl= alloc_var(stmt.var_name,0)
@@ -348,8 +394,7 @@ def generate_statement(stmt):
         emit(f"  STORE R0, ({lbl})")
 
         # do-izraz
-        generate_expression(stmt.e2)
-        emit_pop("R1")
+        generate_into(stmt.e2, "R1")
 
         emit(f"  LOAD R0, ({lbl})")
         emit("  SUB R1, R0, R2")
@@ -357,9 +402,18 @@ def generate_statement(stmt):
         emit(f"  JP {startL}")
         emit(f"{endL}")
 
+# vrijednost izraza u registar reg: na stogu (push svakog medurezultata) ili u registrima
+def generate_into(expr, reg):
+    if use_registers:
+        label_registers(expr)
+        generate_expression_regs(expr, [reg] + [r for r in REGISTERS if r != reg])
+    else:
+        generate_expression(expr)
+        emit_pop(reg)
+
 def generate_expression(expr):
     if isinstance(expr, NumAST):
-        emit(f"  MOVE %D {expr.value}, R0")
+        emit_constant(expr.value, "R0")
         emit_push("R0")
     elif isinstance(expr, VarAST):
         lbl = find_var_label(expr.name)
@@ -374,6 +428,13 @@ def generate_expression(expr):
             emit("  XOR R0, -1, R0")
             emit("  ADD R0, 1, R0")
         emit_push("R0")
+    elif isinstance(expr, BinaryOpAST) and strength_reduced(expr):
+        (operand, c) = strength_reduced(expr)
+        generate_expression(operand)
+        emit_pop("R0")
+        for step in constant_steps(expr.op, c, "R0", "R1"):
+            emit(step)
+        emit_push("R0")
     elif isinstance(expr, BinaryOpAST):
         generate_expression(expr.left)
         generate_expression(expr.right)
@@ -402,35 +463,405 @@ def generate_expression(expr):
         emit_push("R0")
 
 
-nodes = parse_input()
-(prog_ast, usedi)= build_program_ast(nodes,0)
+##
+## 6) Izrazi u registrima (Sethi-Ullman)
+##
+REGISTERS = ["R0", "R1", "R2", "R3", "R4", "R5"]
+MD_CLOBBERED = ["R0", "R1", "R2", "R3", "R4"]   # MUL i DIV (oba para potprograma) mijenjaju R0-R4 (i R6)
 
-emit("; ========== POCETAK PROGRAMA ===========")
-emit("    MOVE 40000, R7   ; init stog")
-emit("; ========== START MAIN ===========")
+def immediate(expr):
+    # ALU naredbe primaju 20-bitni broj s predznakom kao drugi operand
+    return isinstance(expr, NumAST) and -(1 << 19) <= expr.value < (1 << 19)
 
-generate_program(prog_ast)
+# Sethi-Ullman: expr.need je broj registara potreban da se izraz izracuna bez spremanja na stog
+def label_registers(expr):
+    if isinstance(expr, UnaryOpAST):
+        expr.need = label_registers(expr.expr)
+    elif isinstance(expr, BinaryOpAST):
+        l = label_registers(expr.left)
+        r = label_registers(expr.right)
+        reduced = strength_reduced(expr)
+        if reduced:
+            (operand, c) = reduced
+            expr.need = max(operand.need, 2 if uses_temp(expr.op, c) else 1)
+        elif expr.op in ("+", "-") and immediate(expr.right):
+            expr.need = l
+        elif expr.op == "+" and immediate(expr.left):
+            expr.need = r
+        else:
+            expr.need = l + 1 if l == r else max(l, r)
+    else:
+        expr.need = 1
+    return expr.need
 
-# load rez => HALT
-rez_lbl = None
-for d in list_defined:
-    if d.name=="rez" and d.scope_level==0:
-        rez_lbl = variable_map.get((d.name, 0), None)
-if not rez_lbl:
-    rez_lbl=alloc_var("rez",0)
+# racuna izraz u regs[0]; ostali registri iz regs su slobodni, a oni izvan regs cuvaju medurezultate
+# izraza iznad; zahtjevniji podizraz se racuna prvi, a tek kad oba trebaju sve registre, jedan ide na stog
+def generate_expression_regs(expr, regs):
+    target = regs[0]
+    if isinstance(expr, NumAST):
+        emit_constant(expr.value, target)
+    elif isinstance(expr, VarAST):
+        lbl = find_var_label(expr.name)
+        if not lbl:
+            lbl=alloc_var(expr.name,0)
+        emit(f"  LOAD {target}, ({lbl})")
+    elif isinstance(expr, UnaryOpAST):
+        generate_expression_regs(expr.expr, regs)
+        if expr.op=="-":
+            emit(f"  XOR {target}, -1, {target}")
+            emit(f"  ADD {target}, 1, {target}")
+    elif isinstance(expr, BinaryOpAST):
+        left, right = expr.left, expr.right
+        reduced = strength_reduced(expr)
+        if reduced:
+            (operand, c) = reduced
+            generate_expression_regs(operand, regs)
+            for step in constant_steps(expr.op, c, target, regs[1] if len(regs) > 1 else None):
+                emit(step)
+            return
+        if expr.op in ("+", "-") and immediate(right):
+            generate_expression_regs(left, regs)
+            emit(f"  {'ADD' if expr.op == '+' else 'SUB'} {target}, %D {right.value}, {target}")
+            return
+        if expr.op == "+" and immediate(left):
+            generate_expression_regs(right, regs)
+            emit(f"  ADD {target}, %D {left.value}, {target}")
+            return
+
+        if left.need >= right.need and right.need < len(regs):
+            generate_expression_regs(left, regs)
+            generate_expression_regs(right, regs[1:])
+            a, b = regs[0], regs[1]
+        elif right.need > left.need and left.need < len(regs):
+            generate_expression_regs(right, regs)
+            generate_expression_regs(left, regs[1:])
+            a, b = regs[1], regs[0]
+        else:
+            # oba podizraza trebaju sve registre: desni se sprema na stog dok se racuna lijevi
+            generate_expression_regs(right, regs)
+            emit(f"  PUSH {target}")
+            generate_expression_regs(left, regs)
+            emit(f"  POP {regs[1]}")
+            a, b = regs[0], regs[1]
+
+        if expr.op=="+":
+            emit(f"  ADD {a}, {b}, {target}")
+        elif expr.op=="-":
+            emit(f"  SUB {a}, {b}, {target}")
+        elif expr.op in ("*", "/"):
+            # operandi i rezultat idu preko stoga; zive medurezultate u R0-R4 treba sacuvati
+            saved = [r for r in MD_CLOBBERED if r not in regs]
+            for r in saved:
+                emit(f"  PUSH {r}")
+            emit(f"  PUSH {a}")
+            emit(f"  PUSH {b}")
+            emit(f"  CALL {'MUL' if expr.op == '*' else 'DIV'}")
+            emit(f"  POP {target}")
+            for r in reversed(saved):
+                emit(f"  POP {r}")
+        else:
+            emit(f"  MOVE %D 0, {target}")
+    else:
+        # fallback
+        emit(f"  MOVE %D 0, {target}")
+
+
+##
+## 7) Racunanje konstantnih izraza i propagacija konstanti
+##
+# sve varijable su pri generiranju globalne po imenu (find_var_label nade samo definicije razine 0,
+# inace se alocira (ime, 0)), pa je poznata vrijednost varijable vezana samo uz ime
+
+INT_MIN = -(1 << 31)
+INT_MAX = (1 << 31) - 1
+
+def wrap32(value):
+    value &= 0xFFFFFFFF
+    return value - (1 << 32) if value & 0x80000000 else value
+
+# vrijednost binarne operacije kakvu bi izracunao FRISC kod (32 bita, MUL i DIV preko apsolutnih
+# vrijednosti pa predznak, dijeljenje s 0 daje 0); None kad se ne smije izracunati unaprijed
+def fold_binary(op, a, b):
+    if op=="+":
+        return wrap32(a + b)
+    if op=="-":
+        return wrap32(a - b)
+    if op=="*":
+        return wrap32(a * b)
+    if op=="/":
+        if b == 0:
+            return 0
+        if a == INT_MIN:
+            return None   # prvotni DIV ne racuna apsolutnu vrijednost od INT_MIN, pa se to ostavlja za izvodenje
+        q = abs(a) // abs(b)
+        return wrap32(-q if (a < 0) != (b < 0) else q)
+    return None
+
+def fold_expression(expr, env):
+    if isinstance(expr, NumAST):
+        return expr
+    if isinstance(expr, VarAST):
+        if expr.name in env:
+            return NumAST(str(env[expr.name]))
+        return expr
+    if isinstance(expr, UnaryOpAST):
+        sube = fold_expression(expr.expr, env)
+        if expr.op=="+":
+            return sube
+        if isinstance(sube, NumAST):
+            return NumAST(str(wrap32(-sube.value)))
+        return UnaryOpAST(expr.op, sube)
+    if isinstance(expr, BinaryOpAST):
+        left = fold_expression(expr.left, env)
+        right = fold_expression(expr.right, env)
+        if isinstance(left, NumAST) and isinstance(right, NumAST):
+            value = fold_binary(expr.op, wrap32(left.value), wrap32(right.value))
+            if value is not None:
+                return NumAST(str(value))
+        return BinaryOpAST(left, expr.op, right)
+    return expr
+
+# imena svih varijabli kojima se pridruzuje u naredbama (i u ugnijezdenim petljama, s brojacima)
+def assigned_names(stmts):
+    names = set()
+    for st in stmts:
+        names.add(st.var_name)
+        if isinstance(st, ForAST):
+            names |= assigned_names(st.inner_stmts)
+    return names
+
+# env su poznate vrijednosti varijabli prije naredbi i nakon njih (mijenja se); tijelo petlje se izvodi
+# barem jednom (uvjet se provjerava na kraju), a na pocetku svakog prolaza vrijede samo vrijednosti
+# varijabli koje se u petlji ne mijenjaju
+def fold_statements(stmts, env):
+    new_stmts = []
+    for st in stmts:
+        if isinstance(st, AssignAST):
+            expr = fold_expression(st.expr, env)
+            if isinstance(expr, NumAST):
+                env[st.var_name] = wrap32(expr.value)
+            else:
+                env.pop(st.var_name, None)
+            new_stmts.append(AssignAST(st.var_name, st.line_num, expr))
+        elif isinstance(st, ForAST):
+            e1 = fold_expression(st.e1, env)
+            changed = assigned_names(st.inner_stmts) | {st.var_name}
+            for name in changed:
+                env.pop(name, None)
+            inner = fold_statements(st.inner_stmts, env)
+            env.pop(st.var_name, None)   # brojac je nakon tijela uvecan, pa granica ne vidi vrijednost iz tijela
+            e2 = fold_expression(st.e2, env)
+            new_stmts.append(ForAST(st.var_name, st.line_num, e1, e2, inner))
+        elif isinstance(st, IncrementAST) and st.var_name in env:
+            env[st.var_name] = wrap32(env[st.var_name] + 1)
+            new_stmts.append(AssignAST(st.var_name, st.line_num, NumAST(str(env[st.var_name]))))
+        else:
+            env.pop(st.var_name, None)
+            new_stmts.append(st)
+    return new_stmts
+
+# vraca novo stablo programa i poznate vrijednosti varijabli na kraju programa
+def fold_program(prog_ast):
+    env = {}
+    return (ProgramAST(fold_statements(prog_ast.stmts, env)), env)
 
-emit(f"  LOAD R6, ({rez_lbl})")
-emit("  HALT")
 
-# varijable
-emit("; ========== DEKLARACIJA VARIJABLI ===========")
-for (k,v) in variable_map.items():
-    nm,scp = k
-    emit(f"{v}  DW 0   ; var={nm}, scope={scp}")
+##
+## 8) Peephole optimizacija
+##
+# pravila gledaju prozor uzastopnih naredbi bez oznaka (oznaka je moguci cilj skoka, pa se preko nje
+# ne spaja) i vracaju (broj zamijenjenih naredbi, zamjena) ili None; prolazi se dok se ista mijenja
+
+INVERTED_CONDITION = {
+    "Z": "NZ", "NZ": "Z", "EQ": "NE", "NE": "EQ", "N": "NN", "NN": "N", "M": "P", "P": "M",
+    "C": "NC", "NC": "C", "V": "NV", "NV": "V", "ULT": "UGE", "UGE": "ULT", "ULE": "UGT", "UGT": "ULE",
+    "SLT": "SGE", "SGE": "SLT", "SLE": "SGT", "SGT": "SLE",
+}
+FLAG_SETTING = {"ADD", "ADC", "SUB", "SBC", "CMP", "AND", "OR", "XOR", "SHL", "SHR", "ASHR", "ROTL", "ROTR"}
+
+def same(ins, op, *args):
+    return ins.op == op and [a.replace(" ", "").upper() for a in ins.args] == list(args)
+
+def window(ins, i, n):
+    w = ins[i:i+n]
+    if len(w) == n and all(x.op is not None and x.label is None for x in w):
+        return w
+    return None
+
+def next_label_at(ins, j, label):
+    # je li label na sljedecoj naredbi (preskacu se redci samo s oznakom ili komentarom)
+    while j < len(ins):
+        if ins[j].label == label:
+            return True
+        if ins[j].op is not None:
+            return False
+        j += 1
+    return False
+
+def flags_live(ins, j):
+    # moze li se nakon j-te naredbe procitati zastavice prije nego ih nesto ponovno postavi
+    while j < len(ins):
+        op = ins[j].op
+        if op is None or op in ("MOVE", "LOAD", "STORE", "PUSH", "POP"):
+            j += 1
+            continue
+        if op == "HALT" or op in FLAG_SETTING:
+            return False
+        return True   # uvjetna naredba ili skok na nepoznato mjesto
+    return False
+
+def move_or_nothing(src, dst):
+    return [] if src == dst else [Instruction("MOVE", [src, dst])]
+
+def is_push(w, j):
+    # (registar, duljina) za push na w[j] (SUB R7,4,R7; STORE x,(R7) ili PUSH x), ili None
+    if w[j].op == "PUSH":
+        return (w[j].args[0], 1)
+    if j + 1 < len(w) and same(w[j], "SUB", "R7", "4", "R7") and w[j+1].op == "STORE" and w[j+1].args[1] == "(R7)":
+        return (w[j+1].args[0], 2)
+    return None
+
+def is_pop(w, j):
+    # (registar, duljina) za pop koji pocinje na w[j] (LOAD y,(R7); ADD R7,4,R7 ili POP y), ili None
+    if w[j].op == "POP":
+        return (w[j].args[0], 1)
+    if j + 1 < len(w) and w[j].op == "LOAD" and w[j].args[1] == "(R7)" and same(w[j+1], "ADD", "R7", "4", "R7"):
+        return (w[j].args[0], 2)
+    return None
+
+def rule_push_pop(ins, i):
+    # push x; do tri naredbe koje ne koriste stog i ne pisu u x; pop y  =>  te naredbe; MOVE x, y
+    # (push je SUB R7,4,R7; STORE x,(R7) ili PUSH x, a pop LOAD y,(R7); ADD R7,4,R7 ili POP y)
+    w = []
+    while i + len(w) < len(ins) and len(w) < 9 and window(ins, i + len(w), 1):
+        w.append(ins[i + len(w)])
+    push = is_push(w, 0) if w else None
+    if push is None:
+        return None
+    x, start = push
+    for end in range(start, min(start + 4, len(w))):
+        pop = is_pop(w, end)
+        if pop is not None:
+            y, length = pop
+            if flags_live(ins, i + end + length):
+                return None
+            return (end + length, w[start:end] + move_or_nothing(x, y))
+        m = w[end]
+        if (m.op not in ("MOVE", "LOAD", "STORE") and m.op not in FLAG_SETTING) or destination(m) == x \
+                or any("R7" in a for a in m.args):
+            return None
+    return None
+
+def rule_store_load(ins, i):
+    # STORE x,(M); LOAD y,(M)  =>  STORE x,(M); MOVE x, y
+    w = window(ins, i, 2)
+    if w and w[0].op == "STORE" and w[1].op == "LOAD" and w[0].args[1] == w[1].args[1]:
+        return (2, [w[0]] + move_or_nothing(w[0].args[0], w[1].args[0]))
+    # LOAD x,(M); STORE x,(M)  =>  LOAD x,(M)
+    if w and w[0].op == "LOAD" and w[1].op == "STORE" and w[0].args == w[1].args:
+        return (2, [w[0]])
+    return None
+
+def rule_jump_to_next(ins, i):
+    # JP(_cc) L kad je L odmah iduca naredba
+    w = window(ins, i, 1)
+    if w and w[0].op.startswith("JP") and len(w[0].args) == 1 and next_label_at(ins, i + 1, w[0].args[0]):
+        return (1, [])
+    return None
 
-# MULL, DIV
-emit("; ========== POTPROGRAMI ZA MUL, DIV ===========")
-emit("""\
+def rule_jump_over_jump(ins, i):
+    # JP_cc L1; JP L2; L1  =>  JP_!cc L2; L1
+    w = window(ins, i, 2)
+    if (w and w[0].op.startswith("JP_") and w[0].op[3:] in INVERTED_CONDITION and w[1].op == "JP"
+            and next_label_at(ins, i + 2, w[0].args[0])):
+        return (2, [Instruction("JP_" + INVERTED_CONDITION[w[0].op[3:]], w[1].args)])
+    return None
+
+def destination_index(ins):
+    # indeks operanda u koji naredba upisuje registar, ili None
+    if ins.op in ("LOAD", "POP"):
+        return 0
+    if ins.op == "MOVE" or (ins.op in FLAG_SETTING and ins.op != "CMP"):
+        return len(ins.args) - 1
+    return None
+
+def destination(ins):
+    index = destination_index(ins)
+    return None if index is None else ins.args[index]
+
+def reads(ins, reg):
+    # cita li naredba registar reg (i kao adresu)
+    if ins.op == "LOAD":
+        sources = [ins.args[1]]
+    elif ins.op in ("MOVE", "PUSH"):
+        sources = ins.args[:1]
+    elif ins.op == "STORE" or ins.op == "CMP":
+        sources = ins.args
+    elif ins.op in FLAG_SETTING:
+        sources = ins.args[:2]
+    else:
+        return True   # skokovi, pozivi i ostalo: pretpostavka da se registar koristi
+    return any(reg in s.replace("(", " ").replace(")", " ").replace("+", " ").split() for s in sources)
+
+def rule_move_forward(ins, i):
+    # X ..., a; MOVE a, b; Y ..., a (Y ne cita a)  =>  X ..., b; Y ..., a
+    w = window(ins, i, 3)
+    if not w or w[1].op != "MOVE":
+        return None
+    a, b = w[1].args
+    if a in REGISTERS and b in REGISTERS and destination(w[0]) == a and destination(w[2]) == a and not reads(w[2], a):
+        first = Instruction(w[0].op, w[0].args)
+        first.args[destination_index(w[0])] = b
+        return (2, [first])
+    return None
+
+def rule_move_self(ins, i):
+    # MOVE x, x
+    w = window(ins, i, 1)
+    if w and w[0].op == "MOVE" and len(w[0].args) == 2 and w[0].args[0] == w[0].args[1]:
+        return (1, [])
+    return None
+
+PEEPHOLE_RULES = {
+    "push_pop": rule_push_pop,
+    "store_load": rule_store_load,
+    "jump_to_next": rule_jump_to_next,
+    "jump_over_jump": rule_jump_over_jump,
+    "move_forward": rule_move_forward,
+    "move_self": rule_move_self,
+}
+
+# vraca (nove naredbe, broj primjena po pravilu); rules su nazivi pravila iz PEEPHOLE_RULES
+def peephole(ins, rules=tuple(PEEPHOLE_RULES)):
+    hits = Counter()
+    changed = True
+    while changed:
+        changed = False
+        out = []
+        i = 0
+        while i < len(ins):
+            for name in rules:
+                result = PEEPHOLE_RULES[name](ins, i)
+                if result is not None:
+                    consumed, replacement = result
+                    out.extend(replacement)
+                    i += consumed
+                    hits[name] += 1
+                    changed = True
+                    break
+            else:
+                out.append(ins[i])
+                i += 1
+        ins = out
+    return (ins, hits)
+
+
+##
+## 9) Mnozenje i dijeljenje
+##
+# prvotni potprogrami: MUL zbraja |a| puta, a DIV oduzima dok ne prijede nulu, pa traju onoliko koliko
+# je velik rezultat (za velike brojeve milijune naredbi); ostaju zadani, da se zadani ispis ne mijenja
+MD_ROUTINES_LOOP = """\
 ;----------------------------------
 ;  potprogram MUL
 ;----------------------------------
@@ -491,7 +922,447 @@ MD_RET1 POP R4
         PUSH R3
         PUSH R4
         RET
-""")
+"""
+
+# MUL zbraja pomaknuti veci operand za svaki bit manjeg (mnozenje u 32 bita ne ovisi o predznaku);
+# DIV dijeli apsolutne vrijednosti bit po bit: R4:R0 se pomice ulijevo, a bit kolicnika ulazi u R0
+# zdesna kad ostatak R4 nije manji od djelitelja (vodeci nulti bajtovi djeljenika se preskacu);
+# oba imaju najvise 32 prolaza, a poziv preko stoga i registri su isti kao kod prvotnih
+MD_ROUTINES_FAST = """\
+;----------------------------------
+;  potprogram MUL (pomak i zbrajanje, najvise 32 prolaza)
+;----------------------------------
+MUL     POP R3
+        POP R1
+        POP R0
+        CMP R0, R1
+        JP_UGE MUL_0
+        MOVE R0, R4
+        MOVE R1, R0
+        MOVE R4, R1
+MUL_0   MOVE 0, R2
+MUL_1   SHR R1, 1, R1
+        JP_NC MUL_2
+        ADD R2, R0, R2
+MUL_2   SHL R0, 1, R0
+        XOR R1, 0, R1
+        JP_NZ MUL_1
+        PUSH R2
+        PUSH R3
+        RET
+
+;----------------------------------
+;  potprogram DIV (dijeljenje bit po bit, 32 prolaza)
+;----------------------------------
+DIV     POP R3
+        POP R1
+        POP R0
+        MOVE 0, R6
+        XOR R0, 0, R0
+        JP_P DIV_1
+        XOR R0, -1, R0
+        ADD R0, 1, R0
+        MOVE 1, R6
+DIV_1   XOR R1, 0, R1
+        JP_Z DIV_0
+        JP_P DIV_2
+        XOR R1, -1, R1
+        ADD R1, 1, R1
+        XOR R6, 1, R6
+DIV_2   MOVE %D 32, R2
+DIV_B   SHR R0, %D 24, R4
+        JP_NZ DIV_L
+        SHL R0, %D 8, R0
+        SUB R2, 8, R2
+        JP_NZ DIV_B
+        JP DIV_RET
+DIV_L   MOVE 0, R4
+DIV_3   ADD R0, R0, R0
+        ADC R4, R4, R4
+        CMP R4, R1
+        JP_ULT DIV_4
+        SUB R4, R1, R4
+        OR R0, 1, R0
+DIV_4   SUB R2, 1, R2
+        JP_NZ DIV_3
+        XOR R6, 0, R6
+        JP_Z DIV_RET
+        XOR R0, -1, R0
+        ADD R0, 1, R0
+DIV_RET PUSH R0
+        PUSH R3
+        RET
+DIV_0   MOVE 0, R0
+        JP DIV_RET
+"""
+
+# mnozenje i dijeljenje konstantom bez poziva: (operand, konstanta) ili None
+def strength_reduced(expr):
+    if not fast_md or not isinstance(expr, BinaryOpAST):
+        return None
+    if expr.op=="*":
+        for operand, const in ((expr.left, expr.right), (expr.right, expr.left)):
+            if isinstance(const, NumAST) and constant_steps("*", wrap32(const.value), "x", "t") is not None:
+                return (operand, wrap32(const.value))
+    elif expr.op=="/" and isinstance(expr.right, NumAST):
+        if constant_steps("/", wrap32(expr.right.value), "x", "t") is not None:
+            return (expr.left, wrap32(expr.right.value))
+    return None
+
+def uses_temp(op, c):
+    m = abs(c)
+    return bin(m).count("1") >= 2 if op=="*" else m >= 2
+
+# naredbe koje x (registar s vrijednoscu operanda) pomnoze ili podijele s c, uz pomocni registar t:
+# potencije broja 2 i brojevi s dva postavljena bita ili oblika 2^k - 1 se mnoze pomacima i zbrajanjem,
+# a dijeli se samo potencijom broja 2 (ASHR zaokruzuje prema -beskonacno, pa se negativnom djeljeniku
+# prvo doda 2^k - 1); negativna konstanta je ista sekvenca i negacija; None kad treba poziv
+def constant_steps(op, c, x, t):
+    m = abs(c)   # za INT_MIN je m = 2^31, pa je i negacija rezultata ispravna u 32 bita
+    if m == 0:
+        return [f"  MOVE 0, {x}"]   # x * 0 = 0, a dijeljenje s 0 daje 0 kao i DIV
+    bits = [k for k in range(32) if m >> k & 1]
+    if op=="*":
+        if len(bits) == 1:
+            steps = [f"  SHL {x}, %D {bits[0]}, {x}"] if bits[0] else []
+        elif len(bits) == 2:
+            steps = [f"  SHL {x}, %D {bits[1]}, {t}"]
+            if bits[0]:
+                steps.append(f"  SHL {x}, %D {bits[0]}, {x}")
+            steps.append(f"  ADD {x}, {t}, {x}")
+        elif m & (m + 1) == 0:
+            steps = [f"  SHL {x}, %D {len(bits)}, {t}", f"  SUB {t}, {x}, {x}"]
+        else:
+            return None
+    else:
+        if len(bits) != 1:
+            return None
+        k = bits[0]
+        if k == 0:
+            steps = []
+        elif k == 1:
+            steps = [f"  SHR {x}, %D 31, {t}"]
+        else:
+            steps = [f"  ASHR {x}, %D 31, {t}", f"  SHR {t}, %D {32 - k}, {t}"]
+        if k:
+            steps += [f"  ADD {x}, {t}, {x}", f"  ASHR {x}, %D {k}, {x}"]
+    if c < 0:
+        steps += [f"  XOR {x}, -1, {x}", f"  ADD {x}, 1, {x}"]
+    return steps
+
+
+##
+## 10) Optimizacija petlji
+##
+# granica petlje se racuna jednom, prije petlje, kad tijelo ne mijenja nijednu varijablu iz nje (a ni
+# brojac); brojac se drzi u registru kad mu tijelo ne pridruzuje, a uvjet je jedan CMP i uvjetni skok
+# na pocetak; registri se biraju tek nakon sto je tijelo generirano, medu onima u koje tijelo (s
+# ugnijezdenim petljama i pozivima MUL/DIV) ne pise, a kad ih nema, granica ide u skrivenu varijablu
+
+LOOP_REGISTERS = ["R5", "R6", "R4", "R3", "R2"]   # R0 i R1 ostaju za kraj petlje
+
+def used_names(expr):
+    if isinstance(expr, VarAST):
+        return {expr.name}
+    if isinstance(expr, UnaryOpAST):
+        return used_names(expr.expr)
+    if isinstance(expr, BinaryOpAST):
+        return used_names(expr.left) | used_names(expr.right)
+    return set()
+
+def written_registers(ins):
+    regs = set()
+    for x in ins:
+        if x.op is not None and x.op.startswith("CALL"):
+            regs |= set(MD_CLOBBERED) | {"R6"}
+        elif destination(x):
+            regs.add(destination(x))
+    return regs
+
+def move_block(start, index):
+    # naredbe generirane od start nadalje premjesta ispred naredbe na mjestu index
+    block = instructions[start:]
+    del instructions[start:]
+    instructions[index:index] = block
+
+def generate_loop(stmt):
+    changed = assigned_names(stmt.inner_stmts)
+    resident = stmt.var_name not in changed
+    invariant = not used_names(stmt.e2) & (changed | {stmt.var_name})
+
+    # inicijalizacija
+    generate_into(stmt.e1, "R0")
+    lbl = find_var_label(stmt.var_name)
+    if not lbl:
+        lbl= alloc_var(stmt.var_name,0)
+    emit(f"  STORE R0, ({lbl})")
+
+    startL=new_label("PETLJA_")
+    prologue = len(instructions)
+    emit(f"{startL}")
+    for s in stmt.inner_stmts:
+        generate_statement(s)
+    body_end = len(instructions)
+    if not invariant:
+        generate_into(stmt.e2, "R1")
+
+    free = [r for r in LOOP_REGISTERS if r not in written_registers(instructions[prologue:])]
+    counter = free.pop(0) if resident and free else None
+    bound = free.pop(0) if invariant and free else None
+
+    if counter:
+        # tijelo i granica citaju brojac iz registra
+        for k in range(prologue, len(instructions)):
+            ins = instructions[k]
+            if ins.op == "LOAD" and ins.args[1] == f"({lbl})":
+                instructions[k] = Instruction("MOVE", [counter, ins.args[0]])
+
+    # uvjet: granica - brojac >= 0 => novi prolaz
+    if invariant and not bound:
+        slot = alloc_var(startL, "granica")
+        emit(f"  LOAD R1, ({slot})")
+    elif not invariant and not counter:
+        emit(f"  LOAD R0, ({lbl})")
+    emit(f"  CMP {bound or 'R1'}, {counter or 'R0'}")
+    emit(f"  JP_P {startL}")
+    if counter:
+        emit(f"  STORE {counter}, ({lbl})")
+
+    # brojac++ izmedu tijela i granice
+    start = len(instructions)
+    if counter:
+        emit(f"  ADD {counter}, 1, {counter}")
+    else:
+        emit(f"  LOAD R0, ({lbl})")
+        emit("  ADD R0, 1, R0")
+        emit(f"  STORE R0, ({lbl})")
+    move_block(start, body_end)
+
+    # prije petlje: granica i pocetna vrijednost brojaca
+    start = len(instructions)
+    if invariant:
+        generate_into(stmt.e2, bound or "R1")
+        if not bound:
+            emit(f"  STORE R1, ({slot})")
+    if counter:
+        emit(f"  LOAD {counter}, ({lbl})")
+    move_block(start, prologue)
+
 
-frisc_file.close()
+##
+## 11) Odmotavanje petlji s konstantnim granicama
+##
+# kad su od i do konstante, a tijelo ne pridruzuje brojacu, broj prolaza je poznat: petlja se zamjenjuje
+# kopijama tijela, a kad bi to bilo preveliko, petljom s factor kopija tijela po prolazu i ostatkom
+# prolaza kao kopijama; velicina (broj cvorova stabla) odmotane petlje ne smije prijeci budget;
+# brojac++ izmedu kopija je IncrementAST, koji racunanje konstanti pretvara u pridruzivanje konstante
+
+UNROLL_BUDGET = 64
+
+def expression_size(expr):
+    if isinstance(expr, UnaryOpAST):
+        return 1 + expression_size(expr.expr)
+    if isinstance(expr, BinaryOpAST):
+        return 1 + expression_size(expr.left) + expression_size(expr.right)
+    return 1
+
+def statements_size(stmts):
+    size = 0
+    for st in stmts:
+        if isinstance(st, ForAST):
+            size += 1 + expression_size(st.e1) + expression_size(st.e2) + statements_size(st.inner_stmts)
+        elif isinstance(st, AssignAST):
+            size += 1 + expression_size(st.expr)
+        else:
+            size += 1
+    return size
+
+# imena varijabli koje naredbe citaju (i u granicama ugnijezdenih petlji)
+def read_names(stmts):
+    names = set()
+    for st in stmts:
+        if isinstance(st, AssignAST):
+            names |= used_names(st.expr)
+        elif isinstance(st, ForAST):
+            names |= used_names(st.e1) | used_names(st.e2) | read_names(st.inner_stmts)
+    return names
+
+def constant_value(expr):
+    expr = fold_expression(expr, {})
+    return wrap32(expr.value) if isinstance(expr, NumAST) else None
+
+# broj prolaza petlje od e1 do e2 (tijelo pa brojac++, pa novi prolaz dok je e2 - brojac >= 0 u 32
+# bita), ili None kad bi brojac ili razlika preljevali
+def trip_count(e1, e2):
+    if e1 == INT_MAX or e2 == INT_MAX:
+        return None
+    d = e2 - e1
+    if 0 <= d <= INT_MAX:
+        return d + 1
+    if d < 0 and d - 1 >= INT_MIN:
+        return 1
+    return None
 
+def unroll_statements(stmts, factor, budget=UNROLL_BUDGET):
+    new_stmts = []
+    for st in stmts:
+        if not isinstance(st, ForAST):
+            new_stmts.append(st)
+            continue
+        inner = unroll_statements(st.inner_stmts, factor, budget)
+        e1 = constant_value(st.e1)
+        e2 = constant_value(st.e2)
+        trips = None
+        if e1 is not None and e2 is not None and st.var_name not in assigned_names(inner):
+            trips = trip_count(e1, e2)
+        if trips is None:
+            new_stmts.append(ForAST(st.var_name, st.line_num, st.e1, st.e2, inner))
+            continue
+
+        def set_counter(value):
+            return AssignAST(st.var_name, st.line_num, NumAST(str(value)))
+
+        def copies(n):
+            # n kopija tijela; ako tijelo cita brojac, izmedu kopija i nakon zadnje je brojac++
+            stmts = []
+            for _ in range(n):
+                stmts += inner + ([IncrementAST(st.var_name, st.line_num)] if reads else [])
+            return stmts
+
+        reads = st.var_name in read_names(inner)
+        size = statements_size(inner) + 1   # kopija tijela i brojac++
+        if trips * size <= budget:
+            new_stmts += [set_counter(e1)] if reads else []
+            new_stmts += copies(trips)
+            new_stmts += [] if reads else [set_counter(e1 + trips)]
+        elif factor > 1 and trips >= factor and (factor + trips % factor) * size <= budget:
+            # petlja s factor kopija po prolazu (zadnji brojac++ je od same petlje); kad tijelo ne cita
+            # brojac, petlja samo broji prolaze, a brojac na kraju dobiva svoju konacnu vrijednost
+            passes = trips // factor
+            body = copies(factor)
+            if reads:
+                body.pop()
+                new_stmts.append(ForAST(st.var_name, st.line_num, NumAST(str(e1)),
+                                        NumAST(str(e1 + passes * factor - 1)), body))
+            else:
+                new_stmts.append(ForAST(st.var_name, st.line_num, NumAST(str(e1)), NumAST(str(e1 + passes - 1)), body))
+            new_stmts += copies(trips % factor)
+            new_stmts += [] if reads else [set_counter(e1 + trips)]
+        else:
+            new_stmts.append(ForAST(st.var_name, st.line_num, st.e1, st.e2, inner))
+    return new_stmts
+
+def unroll_program(prog_ast, factor, budget=UNROLL_BUDGET):
+    return ProgramAST(unroll_statements(prog_ast.stmts, factor, budget))
+
+
+# generira FRISC kod za niz tokena (listove stabla) u otvorenu datoteku;
+# globalno stanje se postavlja ispocetka pa se moze pozvati vise puta u istom procesu;
+# registri=True racuna izraze u registrima R0-R5 (Sethi-Ullman) umjesto na stogu, konstante=True
+# prije generiranja racuna konstantne podizraze i uvrstava poznate vrijednosti varijabli, a
+# peephole_rules su nazivi pravila peephole optimizacije (PEEPHOLE_RULES) koja se primjenjuju prije
+# zapisivanja, brzi_md=True ukljucuje brze MUL i DIV te mnozenje i dijeljenje konstantom pomacima, a
+# petlje=True drzi granicu i brojac petlje u registrima kad god je to moguce, a odmotavanje je faktor
+# odmotavanja petlji s konstantnim granicama (0 bez odmotavanja, 1 samo potpuno); vraca broj primjena po pravilu
+def generiraj(nodes, datoteka, registri=False, konstante=False, peephole_rules=(), brzi_md=False, petlje=False,
+              odmotavanje=0):
+    global scope_level
+    list_defined.clear()
+    scope_level = 0
+
+    (prog_ast, usedi)= build_program_ast(nodes,0)
+    return generiraj_ast(prog_ast, datoteka, registri, konstante, peephole_rules, brzi_md, petlje, odmotavanje)
+
+# generira FRISC kod za vec izgradeno stablo programa; list_defined su definicije vidljive na kraju
+# programa (nakon build_program_ast), a varijable bez definicije su globalne
+def generiraj_ast(prog_ast, datoteka, registri=False, konstante=False, peephole_rules=(), brzi_md=False,
+                  petlje=False, odmotavanje=0):
+    global frisc_file, var_counter, label_counter, use_registers, fast_md, optimize_loops, instructions
+    frisc_file = datoteka
+    use_registers = registri
+    fast_md = brzi_md
+    optimize_loops = petlje
+    instructions = []
+    variable_map.clear()
+    constant_pool.clear()
+    var_counter = 0
+    label_counter = 0
+
+    if odmotavanje:
+        prog_ast = unroll_program(prog_ast, odmotavanje)
+    known = {}
+    if konstante:
+        (prog_ast, known) = fold_program(prog_ast)
+
+    emit("; ========== POCETAK PROGRAMA ===========")
+    emit("    MOVE 40000, R7   ; init stog")
+    emit("; ========== START MAIN ===========")
+
+    generate_program(prog_ast)
+
+    # load rez => HALT
+    rez_lbl = None
+    for d in list_defined:
+        if d.name=="rez" and d.scope_level==0:
+            rez_lbl = variable_map.get((d.name, 0), None)
+    if not rez_lbl:
+        rez_lbl=alloc_var("rez",0)
+
+    if "rez" in known:
+        emit_constant(known['rez'], "R6")
+    else:
+        emit(f"  LOAD R6, ({rez_lbl})")
+    emit("  HALT")
+
+    # varijable
+    emit("; ========== DEKLARACIJA VARIJABLI ===========")
+    for (k,v) in variable_map.items():
+        nm,scp = k
+        emit(f"{v}  DW 0   ; var={nm}, scope={scp}")
+    for (value, k) in constant_pool.items():
+        emit(f"{k}  DW %D {value}")
+
+    # MULL, DIV
+    emit("; ========== POTPROGRAMI ZA MUL, DIV ===========")
+    emit(MD_ROUTINES_FAST if fast_md else MD_ROUTINES_LOOP)
+
+    hits = Counter()
+    if peephole_rules:
+        (instructions, hits) = peephole(instructions, peephole_rules)
+    frisc_file.write("".join(f"{ins}\n" for ins in instructions))
+    return hits
+
+
+if __name__ == "__main__":
+    # --registri: izrazi u registrima umjesto na stogu; --konstante: racunanje konstantnih izraza i propagacija konstanti;
+    # --peephole[=pravilo,pravilo...]: peephole optimizacija (bez popisa sva pravila), primjene se ispisuju na stderr;
+    # --brzi-md: brzi potprogrami MUL i DIV i mnozenje konstantom bez poziva; --petlje: granica i brojac petlje u registrima;
+    # --odmotavanje[=faktor]: odmotavanje petlji s konstantnim granicama (bez faktora 4)
+    registri = "--registri" in sys.argv[1:]
+    konstante = "--konstante" in sys.argv[1:]
+    brzi_md = "--brzi-md" in sys.argv[1:]
+    petlje = "--petlje" in sys.argv[1:]
+    odmotavanje = 0
+    peephole_rules = ()
+    for arg in sys.argv[1:]:
+        if arg == "--peephole":
+            peephole_rules = tuple(PEEPHOLE_RULES)
+        elif arg.startswith("--peephole="):
+            peephole_rules = tuple(arg[len("--peephole="):].split(","))
+            for name in peephole_rules:
+                if name not in PEEPHOLE_RULES:
+                    sys.exit(f"nepoznato pravilo {name}; pravila su {', '.join(PEEPHOLE_RULES)}")
+        elif arg == "--odmotavanje":
+            odmotavanje = 4
+        elif arg.startswith("--odmotavanje="):
+            odmotavanje = int(arg[len("--odmotavanje="):])
+    with open("a.frisc","w") as datoteka:
+        if "--binarno" in sys.argv[1:]:
+            # binarno stablo iz lab_2 (SintaksniAnalizator.py --binarno)
+            from lab_2.BinarnoStablo import ucitaj
+            nodes = ucitaj(sys.argv[sys.argv.index("--binarno") + 1]).niz_tokena
+        else:
+            nodes = parse_input()
+        hits = generiraj(nodes, datoteka, registri, konstante, peephole_rules, brzi_md, petlje, odmotavanje)
+    for name in peephole_rules:
+        print(f"{name}: {hits[name]}", file=sys.stderr)
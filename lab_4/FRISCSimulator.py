@@ -0,0 +1,223 @@
+import sys
+from collections import namedtuple
+
+# simulator FRISC procesora za kod koji generira FRISCGenerator: prevodi mnemonicki kod (oznake u prvom
+# stupcu, naredbe uvucene, komentari iza ";") i izvodi ga od adrese 0 do HALT; broji izvedene naredbe
+# i pristupe podatkovnoj memoriji (LOAD, STORE, PUSH, POP, CALL, RET), pa sluzi za provjeru
+# generiranog koda i za mjerenje njegove brzine
+#
+# brojevi bez prefiksa su heksadekadski, kao u FRISC asembleru (%D dekadski, %B binarni, %H heksadekadski);
+# registri i memorija su 32-bitni; neposredna vrijednost u MOVE i ALU naredbama mora stati u 20 bitova
+# s predznakom (-2^19 .. 2^19-1), kao u asembleru, pa se kod koji asembler ne bi preveo odbacuje
+
+MASKA = 0xFFFFFFFF
+REGISTRI = ("R0", "R1", "R2", "R3", "R4", "R5", "R6", "R7")
+PRISTUP_MEMORIJI = {"LOAD", "STORE", "PUSH", "POP", "CALL", "RET"}
+ALU = {"ADD", "ADC", "SUB", "SBC", "CMP", "AND", "OR", "XOR", "SHL", "SHR", "ASHR", "ROTL", "ROTR"}
+NAJMANJA_NEPOSREDNA = -(1 << 19)
+NAJVECA_NEPOSREDNA = (1 << 19) - 1
+
+# procjena trajanja: svaka naredba traje dva takta (dohvat i izvodenje), a svaki pristup podatkovnoj
+# memoriji jos jedan
+TAKTOVA_PO_NAREDBI = 2
+TAKTOVA_PO_PRISTUPU = 1
+
+# registri na kraju, memorija (adresa -> rijec), adrese oznaka i brojaci
+Izvodenje = namedtuple("Izvodenje", ["registri", "memorija", "oznake", "instrukcije", "pristupi", "taktovi"])
+
+
+class GreskaSimulatora(Exception):
+    pass
+
+
+class PredugoIzvodenje(GreskaSimulatora):
+    pass
+
+
+def s_predznakom(vrijednost):
+    return vrijednost - (1 << 32) if vrijednost & 0x80000000 else vrijednost
+
+
+def broj(tekst):
+    tekst = tekst.strip()
+    for prefiks, baza in (("%D", 10), ("%B", 2), ("%H", 16)):
+        if tekst.upper().startswith(prefiks):
+            return int(tekst[2:].strip(), baza)
+    return int(tekst, 16)
+
+
+# operand: ("R", indeks registra), ("#", broj) ili ("@", oznaka) (razrjesava se nakon prvog prolaza);
+# memorijski operand (X) je ("M", operand)
+def operand(tekst):
+    tekst = tekst.strip()
+    if tekst.startswith("(") and tekst.endswith(")"):
+        return ("M", operand(tekst[1:-1]))
+    if tekst.upper() in REGISTRI:
+        return ("R", REGISTRI.index(tekst.upper()))
+    if tekst[0].isdigit() or tekst[0] in "+-%":
+        return ("#", broj(tekst))
+    return ("@", tekst)
+
+
+# vraca (naredbe, memorija, oznake); naredbe su po adresi/4 parovi (mnemonik, operandi) ili None za podatke
+def prevedi(tekst):
+    naredbe = []
+    memorija = {}
+    oznake = {}
+    for redak in tekst.splitlines():
+        redak = redak.split(";", 1)[0].rstrip()
+        if not redak.strip():
+            continue
+        if not redak[0].isspace():
+            oznaka, _, redak = redak.partition(" ")
+            oznake[oznaka.strip()] = 4 * len(naredbe)
+        dijelovi = redak.strip().split(None, 1)
+        if not dijelovi:
+            continue
+        mnemonik = dijelovi[0].upper()
+        operandi = [operand(o) for o in dijelovi[1].split(",")] if len(dijelovi) > 1 else []
+        if mnemonik == "DW":
+            for _, vrijednost in operandi:
+                memorija[4 * len(naredbe)] = vrijednost & MASKA
+                naredbe.append(None)
+        else:
+            # neposredni operand: prvi u MOVE, drugi u ALU naredbama
+            indeks = 0 if mnemonik == "MOVE" else 1 if mnemonik in ALU else None
+            if indeks is not None and len(operandi) > indeks and operandi[indeks][0] == "#" \
+                    and not NAJMANJA_NEPOSREDNA <= operandi[indeks][1] <= NAJVECA_NEPOSREDNA:
+                raise GreskaSimulatora(f"neposredna vrijednost {operandi[indeks][1]} ne stane u 20 bitova: {redak.strip()}")
+            naredbe.append((mnemonik, operandi))
+
+    def razrijesi(o):
+        if o[0] == "@":
+            if o[1] not in oznake:
+                raise GreskaSimulatora(f"nepoznata oznaka {o[1]}")
+            return ("#", oznake[o[1]])
+        if o[0] == "M":
+            return ("M", razrijesi(o[1]))
+        return o
+
+    naredbe = [None if n is None else (n[0], [razrijesi(o) for o in n[1]]) for n in naredbe]
+    return naredbe, memorija, oznake
+
+
+def uvjet(naziv, z, n, c, v):
+    return {
+        "": True, "Z": z, "EQ": z, "NZ": not z, "NE": not z, "N": n, "M": n, "NN": not n, "P": not n,
+        "C": c, "NC": not c, "V": v, "NV": not v, "ULT": not c, "UGE": c, "ULE": not c or z, "UGT": c and not z,
+        "SLT": n != v, "SGE": n == v, "SLE": n != v or z, "SGT": n == v and not z,
+    }[naziv]
+
+
+def izvedi(tekst, najvise_koraka=10_000_000):
+    naredbe, memorija, oznake = prevedi(tekst)
+    r = [0] * 8
+    z = n = c = v = False
+    pc = 0
+    instrukcije = pristupi = 0
+
+    def vrijednost(o):
+        return r[o[1]] if o[0] == "R" else o[1] & MASKA
+
+    def adresa(o):
+        return vrijednost(o[1]) & ~3
+
+    while True:
+        indeks = pc >> 2
+        if indeks >= len(naredbe) or naredbe[indeks] is None:
+            raise GreskaSimulatora(f"izvodenje izvan koda na adresi {pc:X}")
+        mnemonik, ops = naredbe[indeks]
+        instrukcije += 1
+        if instrukcije > najvise_koraka:
+            raise PredugoIzvodenje(f"vise od {najvise_koraka} naredbi")
+        pc += 4
+        naziv, _, uvjet_skoka = mnemonik.partition("_")
+
+        if naziv in ALU:
+            a = vrijednost(ops[0])
+            b = vrijednost(ops[1])
+            if naziv in ("ADD", "ADC"):
+                zbroj = a + b + (1 if naziv == "ADC" and c else 0)
+                rezultat = zbroj & MASKA
+                c = zbroj > MASKA
+                v = bool(~(a ^ b) & (a ^ rezultat) & 0x80000000)
+            elif naziv in ("SUB", "SBC", "CMP"):
+                # zastavica C je prijenos zbrajanja a + ~b + 1, tj. 1 kad nema posudbe
+                zbroj = a + (~b & MASKA) + (0 if naziv == "SBC" and not c else 1)
+                rezultat = zbroj & MASKA
+                c = zbroj > MASKA
+                v = bool((a ^ b) & (a ^ rezultat) & 0x80000000)
+            elif naziv in ("AND", "OR", "XOR"):
+                rezultat = a & b if naziv == "AND" else a | b if naziv == "OR" else a ^ b
+                c = v = False
+            else:
+                pomak = b & 31
+                if naziv == "SHL":
+                    rezultat = (a << pomak) & MASKA
+                    c = bool(pomak and (a >> (32 - pomak)) & 1)
+                elif naziv == "SHR":
+                    rezultat = a >> pomak
+                    c = bool(pomak and (a >> (pomak - 1)) & 1)
+                elif naziv == "ASHR":
+                    rezultat = (s_predznakom(a) >> pomak) & MASKA
+                    c = bool(pomak and (a >> (pomak - 1)) & 1)
+                elif naziv == "ROTL":
+                    rezultat = ((a << pomak) | (a >> (32 - pomak))) & MASKA
+                    c = bool(rezultat & 1)
+                else:
+                    rezultat = ((a >> pomak) | (a << (32 - pomak))) & MASKA
+                    c = bool(rezultat & 0x80000000)
+                v = False
+            z = rezultat == 0
+            n = bool(rezultat & 0x80000000)
+            if naziv != "CMP":
+                r[ops[2][1]] = rezultat
+        elif naziv == "MOVE":
+            r[ops[1][1]] = vrijednost(ops[0])
+        elif naziv == "LOAD":
+            pristupi += 1
+            r[ops[0][1]] = memorija.get(adresa(ops[1]), 0)
+        elif naziv == "STORE":
+            pristupi += 1
+            memorija[adresa(ops[1])] = r[ops[0][1]]
+        elif naziv == "PUSH":
+            pristupi += 1
+            r[7] = (r[7] - 4) & MASKA
+            memorija[r[7]] = r[ops[0][1]]
+        elif naziv == "POP":
+            pristupi += 1
+            r[ops[0][1]] = memorija.get(r[7], 0)
+            r[7] = (r[7] + 4) & MASKA
+        elif naziv in ("JP", "CALL", "RET", "JR"):
+            if not uvjet(uvjet_skoka, z, n, c, v):
+                continue
+            if naziv in PRISTUP_MEMORIJI:
+                pristupi += 1
+            if naziv == "RET":
+                pc = memorija.get(r[7], 0)
+                r[7] = (r[7] + 4) & MASKA
+                continue
+            cilj = adresa(ops[0]) if ops[0][0] == "M" else vrijednost(ops[0])
+            if naziv == "CALL":
+                r[7] = (r[7] - 4) & MASKA
+                memorija[r[7]] = pc
+            pc = cilj
+        elif naziv == "HALT":
+            taktovi = TAKTOVA_PO_NAREDBI * instrukcije + TAKTOVA_PO_PRISTUPU * pristupi
+            return Izvodenje(r, memorija, oznake, instrukcije, pristupi, taktovi)
+        else:
+            raise GreskaSimulatora(f"nepoznata naredba {mnemonik}")
+
+
+# python FRISCSimulator.py [a.frisc]: ispisuje rezultat (R6) i brojace
+def main():
+    putanja = sys.argv[1] if len(sys.argv) > 1 else "a.frisc"
+    with open(putanja) as f:
+        izvodenje = izvedi(f.read())
+    print(s_predznakom(izvodenje.registri[6]))
+    print(f"{izvodenje.instrukcije} naredbi, {izvodenje.pristupi} pristupa memoriji, {izvodenje.taktovi} taktova",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import json
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_4.Posluzitelj import IZLAZI, OKVIR, SOCKET, okvir
+
+# klijent za Posluzitelj.py; jedna veza se koristi za sve poslane programe
+
+
+class Klijent:
+    def __init__(self, putanja=SOCKET):
+        self.veza = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.veza.connect(putanja)
+
+    def primi(self, duljina):
+        podaci = bytearray()
+        while len(podaci) < duljina:
+            dio = self.veza.recv(duljina - len(podaci))
+            if not dio:
+                raise ConnectionError("posluzitelj je zatvorio vezu")
+            podaci += dio
+        return bytes(podaci)
+
+    def prevedi(self, izvorni_kod, izlazi=IZLAZI):
+        self.veza.sendall(okvir(json.dumps({"izvorni_kod": izvorni_kod, "izlazi": list(izlazi)}).encode()))
+        (duljina,) = OKVIR.unpack(self.primi(OKVIR.size))
+        odgovor = json.loads(self.primi(duljina))
+        if "greska_zahtjeva" in odgovor:
+            raise ValueError(odgovor["greska_zahtjeva"])
+        return odgovor
+
+    def zatvori(self):
+        self.veza.close()
+
+
+# python Klijent.py [--socket putanja] [--izlaz tokeni|stablo|semantika|frisc] [program.pj ...]
+# ispisuje trazeni izlaz za svaki program (bez datoteka cita jedan program sa stdin); ako prevodenje
+# stane na leksickoj ili sintaksnoj gresci prije trazene faze, ispisuje redak greske
+def main():
+    argumenti = sys.argv[1:]
+    putanja = SOCKET
+    izlaz = "semantika"
+    if "--socket" in argumenti:
+        putanja = argumenti.pop(argumenti.index("--socket") + 1)
+        argumenti.remove("--socket")
+    if "--izlaz" in argumenti:
+        izlaz = argumenti.pop(argumenti.index("--izlaz") + 1)
+        argumenti.remove("--izlaz")
+    if izlaz not in IZLAZI:
+        print(f"Nepoznat izlaz {izlaz}, moguci su: {', '.join(IZLAZI)}", file=sys.stderr)
+        sys.exit(2)
+
+    klijent = Klijent(putanja)
+    try:
+        for putanja_programa in argumenti or [None]:
+            if putanja_programa is None:
+                izvorni_kod = sys.stdin.read()
+            else:
+                with open(putanja_programa) as f:
+                    izvorni_kod = f.read()
+            odgovor = klijent.prevedi(izvorni_kod, [izlaz])
+            sys.stdout.write(odgovor[izlaz] if izlaz in odgovor else odgovor["greska"] + "\n")
+    finally:
+        klijent.zatvori()
+
+
+if __name__ == "__main__":
+    main()
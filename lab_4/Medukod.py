@@ -0,0 +1,510 @@
+import os
+import sys
+import time
+from collections import Counter, namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_4 import FRISCGenerator
+from lab_4.FRISCGenerator import (MD_CLOBBERED, MD_ROUTINES_FAST, AssignAST, BinaryOpAST, ForAST, IncrementAST,
+                                  NumAST, UnaryOpAST, VarAST, build_program_ast, constant_steps, fold_binary,
+                                  parse_input, wrap32)
+
+# troadresni medukod: stablo programa (ProgramAST) se snizava u niz naredbi oblika x = a op b, podijeljen
+# u osnovne blokove s grafom toka (sljedbenici svakog bloka); nad medukodom se izvodi niz prolaza, uz
+# mjerenje trajanja i promjene velicine svakog prolaza, a FRISC kod se generira iz medukoda
+#
+# operandi su cijeli brojevi (32-bitne konstante), imena varijabli programa (globalne po imenu, kao i u
+# FRISCGenerator) i privremene vrijednosti "%1", "%2"...; privremena se definira jednom i koristi samo
+# u bloku u kojem je definirana
+#
+# naredbe:
+#   =     odrediste = a
+#   + - * /  odrediste = a op b
+#   neg   odrediste = -a
+#   skok  skok na oznaku
+#   ako   ako je a - b >= 0 (32 bita), skok na oznaku (uvjet na kraju za petlje)
+#   oznaka  pocetak bloka (samo u linearnom obliku)
+
+Naredba = namedtuple("Naredba", ["op", "odrediste", "a", "b", "oznaka"], defaults=(None, None, None, None))
+
+ARITMETIKA = ("+", "-", "*", "/")
+
+
+def je_privremena(operand):
+    return isinstance(operand, str) and operand.startswith("%")
+
+
+def operandi(naredba):
+    return [o for o in (naredba.a, naredba.b) if o is not None]
+
+
+def ispis_naredbe(n):
+    if n.op == "oznaka":
+        return f"{n.oznaka}:"
+    if n.op == "skok":
+        return f"  skok {n.oznaka}"
+    if n.op == "ako":
+        return f"  ako {n.a} - {n.b} >= 0 skok {n.oznaka}"
+    if n.op == "=":
+        return f"  {n.odrediste} = {n.a}"
+    if n.op == "neg":
+        return f"  {n.odrediste} = -{n.a}"
+    return f"  {n.odrediste} = {n.a} {n.op} {n.b}"
+
+
+class Blok:
+    __slots__ = ("oznaka", "naredbe", "sljedbenici")
+
+    def __init__(self, oznaka, naredbe):
+        self.oznaka = oznaka
+        self.naredbe = naredbe
+        self.sljedbenici = []
+
+
+class Medukod:
+    def __init__(self, blokovi):
+        self.blokovi = blokovi
+
+    # linearni oblik: oznake blokova kao naredbe "oznaka"
+    def linearno(self):
+        naredbe = []
+        for blok in self.blokovi:
+            if blok.oznaka is not None:
+                naredbe.append(Naredba("oznaka", oznaka=blok.oznaka))
+            naredbe.extend(blok.naredbe)
+        return naredbe
+
+    def velicina(self):
+        return (sum(len(blok.naredbe) for blok in self.blokovi), len(self.blokovi))
+
+    def __str__(self):
+        redci = []
+        for i, blok in enumerate(self.blokovi):
+            sljedbenici = ", ".join(f"B{s}" for s in blok.sljedbenici) or "kraj"
+            redci.append(f"B{i}" + (f" {blok.oznaka}" if blok.oznaka else "") + f":   -> {sljedbenici}")
+            redci.extend(ispis_naredbe(n) for n in blok.naredbe)
+        return "\n".join(redci) + "\n"
+
+
+# osnovni blokovi iz linearnog niza: blok pocinje oznakom ili naredbom iza skoka, a zavrsava skokom
+def izgradi_blokove(naredbe):
+    blokovi = []
+    trenutni = None
+    for n in naredbe:
+        if n.op == "oznaka":
+            trenutni = Blok(n.oznaka, [])
+            blokovi.append(trenutni)
+            continue
+        if trenutni is None:
+            trenutni = Blok(None, [])
+            blokovi.append(trenutni)
+        trenutni.naredbe.append(n)
+        if n.op in ("skok", "ako"):
+            trenutni = None
+    if not blokovi:
+        blokovi.append(Blok(None, []))
+
+    indeksi = {blok.oznaka: i for i, blok in enumerate(blokovi) if blok.oznaka is not None}
+    for i, blok in enumerate(blokovi):
+        zadnja = blok.naredbe[-1] if blok.naredbe else None
+        if zadnja is not None and zadnja.op in ("skok", "ako"):
+            blok.sljedbenici.append(indeksi[zadnja.oznaka])
+        if (zadnja is None or zadnja.op != "skok") and i + 1 < len(blokovi):
+            blok.sljedbenici.append(i + 1)
+    return Medukod(blokovi)
+
+
+##
+## Snizavanje stabla u medukod
+##
+def snizi(prog_ast):
+    naredbe = []
+    brojac_privremenih = 0
+    brojac_oznaka = 0
+
+    def izraz(e):
+        nonlocal brojac_privremenih
+        if isinstance(e, NumAST):
+            return wrap32(e.value)
+        if isinstance(e, VarAST):
+            return e.name
+        if isinstance(e, UnaryOpAST):
+            a = izraz(e.expr)
+            if e.op != "-":
+                return a
+            brojac_privremenih += 1
+            naredbe.append(Naredba("neg", f"%{brojac_privremenih}", a))
+            return f"%{brojac_privremenih}"
+        if isinstance(e, BinaryOpAST):
+            a = izraz(e.left)
+            b = izraz(e.right)
+            brojac_privremenih += 1
+            naredbe.append(Naredba(e.op, f"%{brojac_privremenih}", a, b))
+            return f"%{brojac_privremenih}"
+        return 0
+
+    def pridruzi(ime, e):
+        o = izraz(e)
+        if je_privremena(o) and naredbe and naredbe[-1].odrediste == o:
+            # vrijednost izraza izravno u varijablu, bez kopiranja privremene
+            naredbe[-1] = naredbe[-1]._replace(odrediste=ime)
+        else:
+            naredbe.append(Naredba("=", ime, o))
+
+    def naredba(st):
+        nonlocal brojac_oznaka
+        if isinstance(st, AssignAST):
+            pridruzi(st.var_name, st.expr)
+        elif isinstance(st, IncrementAST):
+            naredbe.append(Naredba("+", st.var_name, st.var_name, 1))
+        elif isinstance(st, ForAST):
+            pridruzi(st.var_name, st.e1)
+            oznaka = f"PETLJA_{brojac_oznaka}"
+            brojac_oznaka += 1
+            naredbe.append(Naredba("oznaka", oznaka=oznaka))
+            for s in st.inner_stmts:
+                naredba(s)
+            naredbe.append(Naredba("+", st.var_name, st.var_name, 1))
+            naredbe.append(Naredba("ako", a=izraz(st.e2), b=st.var_name, oznaka=oznaka))
+
+    for st in prog_ast.stmts:
+        naredba(st)
+    return izgradi_blokove(naredbe)
+
+
+##
+## Prolazi
+##
+# algebarski identiteti s jednim konstantnim operandom (x + 0, x * 1, x * 0, x / 0 = 0 ...)
+def pojednostavi(n):
+    if n.b == 0 and n.op in ("+", "-") or n.b == 1 and n.op in ("*", "/"):
+        return Naredba("=", n.odrediste, n.a)
+    if n.a == 0 and n.op == "+" or n.a == 1 and n.op == "*":
+        return Naredba("=", n.odrediste, n.b)
+    if n.a == 0 and n.op == "-":
+        return Naredba("neg", n.odrediste, n.b)
+    if 0 in (n.a, n.b) and n.op == "*" or n.op == "/" and (n.a == 0 or n.b == 0):
+        return Naredba("=", n.odrediste, 0)
+    return n
+
+
+# racunanje konstanti i propagacija konstanti unutar bloka (na pocetku bloka nista nije poznato, jer se
+# u blok moze uci iz vise mjesta); uvjetni skok s poznatim ishodom postaje skok ili nestaje
+def prolaz_konstante(medukod):
+    naredbe = []
+    for blok in medukod.blokovi:
+        if blok.oznaka is not None:
+            naredbe.append(Naredba("oznaka", oznaka=blok.oznaka))
+        poznato = {}
+        for n in blok.naredbe:
+            if n.a in poznato or n.b in poznato:
+                n = n._replace(a=poznato.get(n.a, n.a), b=poznato.get(n.b, n.b))
+            if n.op in ARITMETIKA and isinstance(n.a, int) and isinstance(n.b, int):
+                vrijednost = fold_binary(n.op, n.a, n.b)
+                if vrijednost is not None:
+                    n = Naredba("=", n.odrediste, vrijednost)
+            elif n.op in ARITMETIKA:
+                n = pojednostavi(n)
+            if n.op == "neg" and isinstance(n.a, int):
+                n = Naredba("=", n.odrediste, wrap32(-n.a))
+            elif n.op == "ako" and isinstance(n.a, int) and isinstance(n.b, int):
+                if wrap32(n.a - n.b) < 0:
+                    continue
+                n = Naredba("skok", oznaka=n.oznaka)
+            if n.odrediste is not None:
+                if n.op == "=" and isinstance(n.a, int):
+                    poznato[n.odrediste] = n.a
+                else:
+                    poznato.pop(n.odrediste, None)
+            naredbe.append(n)
+    medukod.blokovi = izgradi_blokove(naredbe).blokovi
+
+
+# propagacija kopija unutar bloka: nakon x = y se x zamjenjuje s y dok se ni x ni y ne promijene
+def prolaz_kopije(medukod):
+    for blok in medukod.blokovi:
+        kopije = {}
+        nove = []
+        for n in blok.naredbe:
+            if n.a in kopije or n.b in kopije:
+                n = n._replace(a=kopije.get(n.a, n.a), b=kopije.get(n.b, n.b))
+            if n.odrediste is not None:
+                kopije = {x: y for x, y in kopije.items() if n.odrediste not in (x, y)}
+                if n.op == "=" and isinstance(n.a, str) and n.a != n.odrediste:
+                    kopije[n.odrediste] = n.a
+            nove.append(n)
+        blok.naredbe = nove
+
+
+# uklanja definicije privremenih koje se nigdje ne koriste (varijable programa ostaju, jer su vidljive
+# u memoriji nakon izvodenja); brojac koristenja svake privremene, pa uklanjanje definicije smanjuje
+# brojace njenih operanada, bez ponovnog prolaska kroz cijeli medukod
+def prolaz_mrtve_privremene(medukod):
+    koristenja = Counter(o for blok in medukod.blokovi for n in blok.naredbe for o in operandi(n) if je_privremena(o))
+    definicije = {n.odrediste: n for blok in medukod.blokovi for n in blok.naredbe if je_privremena(n.odrediste)}
+    mrtve = set()
+    za_obradu = [t for t in definicije if not koristenja[t]]
+    while za_obradu:
+        t = za_obradu.pop()
+        mrtve.add(t)
+        for o in operandi(definicije[t]):
+            if je_privremena(o):
+                koristenja[o] -= 1
+                if not koristenja[o] and o in definicije:
+                    za_obradu.append(o)
+    if mrtve:
+        for blok in medukod.blokovi:
+            blok.naredbe = [n for n in blok.naredbe if n.odrediste not in mrtve]
+
+
+# uklanja skokove na iducu naredbu i oznake na koje se ne skace, pa se spajaju susjedni blokovi
+def prolaz_skokovi(medukod):
+    naredbe = medukod.linearno()
+    promjena = True
+    while promjena:
+        promjena = False
+        ciljevi = {n.oznaka for n in naredbe if n.op in ("skok", "ako")}
+        nove = []
+        for i, n in enumerate(naredbe):
+            if n.op == "oznaka" and n.oznaka not in ciljevi:
+                promjena = True
+                continue
+            if n.op == "skok" and i + 1 < len(naredbe) and naredbe[i + 1] == Naredba("oznaka", oznaka=n.oznaka):
+                promjena = True
+                continue
+            nove.append(n)
+        naredbe = nove
+    medukod.blokovi = izgradi_blokove(naredbe).blokovi
+
+
+PROLAZI = {
+    "konstante": prolaz_konstante,
+    "kopije": prolaz_kopije,
+    "mrtve_privremene": prolaz_mrtve_privremene,
+    "skokovi": prolaz_skokovi,
+}
+ZADANI_PROLAZI = ("konstante", "kopije", "mrtve_privremene", "skokovi")
+
+# trajanje u sekundama te broj naredbi i blokova medukoda prije i poslije prolaza (ili faze)
+Zapis = namedtuple("Zapis", ["naziv", "trajanje", "naredbi_prije", "naredbi_poslije", "blokova_prije",
+                             "blokova_poslije"])
+
+
+# izvodi prolaze redom i vraca zapis za svaki; ispis_nakon je datoteka u koju se ispisuje medukod nakon
+# svakog prolaza (--print-after-all) ili None
+def izvedi_prolaze(medukod, prolazi=ZADANI_PROLAZI, ispis_nakon=None):
+    zapisi = []
+    for naziv in prolazi:
+        naredbi, blokova = medukod.velicina()
+        pocetak = time.perf_counter()
+        PROLAZI[naziv](medukod)
+        trajanje = time.perf_counter() - pocetak
+        (naredbi_poslije, blokova_poslije) = medukod.velicina()
+        zapisi.append(Zapis(naziv, trajanje, naredbi, naredbi_poslije, blokova, blokova_poslije))
+        if ispis_nakon is not None:
+            ispis_nakon.write(f"; ---------- nakon prolaza {naziv} ----------\n{medukod}")
+    return zapisi
+
+
+##
+## FRISC iz medukoda
+##
+# privremene su u registrima R0-R4 od definicije do zadnjeg koristenja u bloku (kad ih nema dovoljno,
+# u memoriji), a R5 i R6 su pomocni registri za operande i rezultat koji ide u varijablu; MUL i DIV
+# su isti potprogrami kao u FRISCGenerator, pa se zive privremene u R0-R4 oko poziva cuvaju na stogu
+PRIVREMENI_REGISTRI = ["R0", "R1", "R2", "R3", "R4"]
+
+
+def neposredna(c):
+    return isinstance(c, int) and -(1 << 19) <= c < (1 << 19)
+
+
+def frisc(medukod, datoteka):
+    redci = ["; ========== POCETAK PROGRAMA ===========", "    MOVE 40000, R7   ; init stog",
+             "; ========== START MAIN ==========="]
+    varijable = {}
+    memorija_privremenih = {}
+    konstante = {}   # konstante koje ne stanu u MOVE (20 bita s predznakom) citaju se iz rijeci K0, K1...
+
+    def adresa(ime):
+        if je_privremena(ime):
+            return memorija_privremenih.setdefault(ime, f"T{len(memorija_privremenih)}")
+        return varijable.setdefault(ime, f"V{len(varijable)}")
+
+    # privremene koje se koriste izvan bloka u kojem su definirane uvijek su u memoriji
+    blok_definicije = {}
+    izvan_bloka = set()
+    for i, blok in enumerate(medukod.blokovi):
+        for n in blok.naredbe:
+            for o in operandi(n):
+                if je_privremena(o) and blok_definicije.get(o) != i:
+                    izvan_bloka.add(o)
+            if je_privremena(n.odrediste):
+                blok_definicije[n.odrediste] = i
+
+    for blok in medukod.blokovi:
+        if blok.oznaka is not None:
+            redci.append(blok.oznaka)
+        zadnje_koristenje = {}
+        for k, n in enumerate(blok.naredbe):
+            for o in operandi(n):
+                if je_privremena(o):
+                    zadnje_koristenje[o] = k
+        registri = {}
+        slobodni = list(PRIVREMENI_REGISTRI)
+
+        def u_registar(o, registar):
+            # registar s vrijednoscu operanda; kad nije vec u registru, ucitava se u zadani
+            if isinstance(o, int) and neposredna(o):
+                redci.append(f"  MOVE %D {o}, {registar}")
+                return registar
+            if isinstance(o, int):
+                oznaka = konstante.setdefault(o, f"K{len(konstante)}")
+                redci.append(f"  LOAD {registar}, ({oznaka})")
+                return registar
+            if o in zateceni:
+                return zateceni[o]
+            redci.append(f"  LOAD {registar}, ({adresa(o)})")
+            return registar
+
+        for k, n in enumerate(blok.naredbe):
+            zateceni = dict(registri)   # registri operanada, i kad ih se oslobodi za rezultat
+            if n.op == "skok":
+                redci.append(f"  JP {n.oznaka}")
+                continue
+            if n.op == "ako":
+                a = u_registar(n.a, "R5")
+                if neposredna(n.b):
+                    redci.append(f"  CMP {a}, %D {n.b}")
+                else:
+                    redci.append(f"  CMP {a}, {u_registar(n.b, 'R6')}")
+                redci.append(f"  JP_P {n.oznaka}")
+                continue
+
+            # operandi kojima je ovo zadnje koristenje oslobadaju registar (rezultat ga moze preuzeti)
+            for o in set(operandi(n)):
+                if o in registri and zadnje_koristenje.get(o) == k:
+                    slobodni.insert(0, registri.pop(o))
+            u_memoriju = not je_privremena(n.odrediste) or n.odrediste in izvan_bloka or not slobodni
+            cilj = "R5" if u_memoriju else slobodni.pop(0)
+
+            if n.op == "=":
+                if u_memoriju and n.a in zateceni:
+                    cilj = zateceni[n.a]
+                else:
+                    izvor = u_registar(n.a, cilj)
+                    if izvor != cilj:
+                        redci.append(f"  MOVE {izvor}, {cilj}")
+            elif n.op == "neg":
+                a = u_registar(n.a, cilj)
+                redci.append(f"  XOR {a}, -1, {cilj}")
+                redci.append(f"  ADD {cilj}, 1, {cilj}")
+            elif n.op in ("+", "-") and neposredna(n.b):
+                a = u_registar(n.a, cilj)
+                redci.append(f"  {'ADD' if n.op == '+' else 'SUB'} {a}, %D {n.b}, {cilj}")
+            elif n.op == "+" and neposredna(n.a):
+                b = u_registar(n.b, cilj)
+                redci.append(f"  ADD {b}, %D {n.a}, {cilj}")
+            elif n.op in ("+", "-"):
+                a = u_registar(n.a, "R5")
+                b = u_registar(n.b, "R6")
+                redci.append(f"  {'ADD' if n.op == '+' else 'SUB'} {a}, {b}, {cilj}")
+            elif isinstance(n.b, int) and constant_steps(n.op, n.b, cilj, "R6") is not None:
+                a = u_registar(n.a, cilj)
+                if a != cilj:
+                    redci.append(f"  MOVE {a}, {cilj}")
+                redci.extend(constant_steps(n.op, n.b, cilj, "R6"))
+            elif n.op == "*" and isinstance(n.a, int) and constant_steps("*", n.a, cilj, "R6") is not None:
+                b = u_registar(n.b, cilj)
+                if b != cilj:
+                    redci.append(f"  MOVE {b}, {cilj}")
+                redci.extend(constant_steps("*", n.a, cilj, "R6"))
+            else:
+                # operandi i rezultat preko stoga; zive privremene u R0-R4 se cuvaju
+                sacuvani = [r for r in MD_CLOBBERED if r in registri.values()]
+                for r in sacuvani:
+                    redci.append(f"  PUSH {r}")
+                redci.append(f"  PUSH {u_registar(n.a, 'R5')}")
+                redci.append(f"  PUSH {u_registar(n.b, 'R6')}")
+                redci.append(f"  CALL {'MUL' if n.op == '*' else 'DIV'}")
+                redci.append(f"  POP {cilj}")
+                for r in reversed(sacuvani):
+                    redci.append(f"  POP {r}")
+
+            if u_memoriju:
+                redci.append(f"  STORE {cilj}, ({adresa(n.odrediste)})")
+            elif n.odrediste not in zadnje_koristenje:
+                slobodni.insert(0, cilj)   # vrijednost se ne koristi
+            else:
+                registri[n.odrediste] = cilj
+
+    redci.append(f"  LOAD R6, ({adresa('rez')})")
+    redci.append("  HALT")
+    redci.append("; ========== DEKLARACIJA VARIJABLI ===========")
+    for ime, oznaka in varijable.items():
+        redci.append(f"{oznaka}  DW 0   ; var={ime}")
+    for ime, oznaka in memorija_privremenih.items():
+        redci.append(f"{oznaka}  DW 0   ; {ime}")
+    for vrijednost, oznaka in konstante.items():
+        redci.append(f"{oznaka}  DW %D {vrijednost}")
+    redci.append("; ========== POTPROGRAMI ZA MUL, DIV ===========")
+    datoteka.write("".join(redak + "\n" for redak in redci) + MD_ROUTINES_FAST)
+
+
+# cijeli put od niza tokena (listova stabla) do FRISC koda, uz zapis za svaku fazu i prolaz
+def generiraj(nodes, datoteka, prolazi=ZADANI_PROLAZI, ispis_nakon=None):
+    zapisi = []
+
+    def faza(naziv, funkcija, *argumenti):
+        pocetak = time.perf_counter()
+        rezultat = funkcija(*argumenti)
+        trajanje = time.perf_counter() - pocetak
+        velicina = rezultat.velicina() if isinstance(rezultat, Medukod) else (None, None)
+        zapisi.append(Zapis(naziv, trajanje, None, velicina[0], None, velicina[1]))
+        return rezultat
+
+    FRISCGenerator.list_defined.clear()
+    FRISCGenerator.scope_level = 0
+    (prog_ast, _) = faza("stablo", build_program_ast, nodes, 0)
+    medukod = faza("snizavanje", snizi, prog_ast)
+    if ispis_nakon is not None:
+        ispis_nakon.write(f"; ---------- nakon snizavanja ----------\n{medukod}")
+    zapisi += izvedi_prolaze(medukod, prolazi, ispis_nakon)
+    faza("frisc", frisc, medukod, datoteka)
+    return zapisi
+
+
+def ispisi_vremena(zapisi, izlaz=sys.stderr):
+    ukupno = sum(z.trajanje for z in zapisi)
+    izlaz.write(f"{'faza / prolaz':18} {'ms':>10} {'udio':>6}   {'naredbe medukoda':18} {'blokovi'}\n")
+    for z in zapisi:
+        izlaz.write(f"{z.naziv:18} {z.trajanje * 1000:10.2f} {z.trajanje / ukupno * 100 if ukupno else 0:5.1f}%")
+        if z.naredbi_poslije is not None:
+            # faze bez medukoda na ulazu (snizavanje) ili izlazu (stablo, frisc) nemaju promjenu velicine
+            prije = "" if z.naredbi_prije is None else f"{z.naredbi_prije} ->"
+            blokova = "" if z.blokova_prije is None else f"{z.blokova_prije} ->"
+            izlaz.write(f"   {prije:>10} {z.naredbi_poslije:<7d} {blokova:>8} {z.blokova_poslije}")
+        izlaz.write("\n")
+    izlaz.write(f"{'ukupno':18} {ukupno * 1000:10.2f}\n")
+
+
+if __name__ == "__main__":
+    # python Medukod.py [--prolazi=konstante,kopije,...] [--print-after-all] [--vremena] [--binarno stablo.bin] < stablo.txt
+    # pise a.frisc; --print-after-all ispisuje medukod nakon snizavanja i svakog prolaza na stderr, a
+    # --vremena trajanje i promjenu velicine medukoda po fazi i prolazu
+    prolazi = ZADANI_PROLAZI
+    for arg in sys.argv[1:]:
+        if arg.startswith("--prolazi="):
+            prolazi = tuple(p for p in arg[len("--prolazi="):].split(",") if p)
+            for naziv in prolazi:
+                if naziv not in PROLAZI:
+                    sys.exit(f"nepoznat prolaz {naziv}; prolazi su {', '.join(PROLAZI)}")
+    if "--binarno" in sys.argv[1:]:
+        from lab_2.BinarnoStablo import ucitaj
+        nodes = ucitaj(sys.argv[sys.argv.index("--binarno") + 1]).niz_tokena
+    else:
+        nodes = parse_input()
+    with open("a.frisc", "w") as datoteka:
+        zapisi = generiraj(nodes, datoteka, prolazi, sys.stderr if "--print-after-all" in sys.argv[1:] else None)
+    if "--vremena" in sys.argv[1:]:
+        ispisi_vremena(zapisi)
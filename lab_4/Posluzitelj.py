@@ -0,0 +1,124 @@
+import asyncio
+import io
+import json
+import os
+import signal
+import struct
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_4.Prevoditelj import prevedi
+
+# posluzitelj koji ostaje pokrenut i prevodi PJ programe poslane preko Unix socketa, pa se
+# pokretanje Pythona i ucitavanje tablica placa jednom, a ne za svaku datoteku i svaku fazu
+#
+# svaka poruka (zahtjev i odgovor) je okvir: duljina u 4 bajta (big endian) pa JSON u UTF-8
+#   zahtjev:  {"izvorni_kod": "...", "izlazi": ["tokeni", "stablo", "semantika", "frisc"]}
+#   odgovor:  {"greska": null ili redak greske leksicke/sintaksne analize, i trazeni izlazi kao tekst
+#              kakav bi ispisali LeksickiAnalizator, SintaksniAnalizator, SemantickiAnalizator
+#              odnosno zapisao FRISCGenerator u a.frisc}
+# kod neispravnog zahtjeva, ili iznimke pri prevodenju, odgovor je {"greska_zahtjeva": "..."}; jedna veza
+# moze poslati vise zahtjeva
+
+SOCKET = os.path.join(tempfile.gettempdir(), "pj-prevoditelj.sock")
+OKVIR = struct.Struct(">I")
+NAJVECI_OKVIR = 64 << 20
+IZLAZI = ("tokeni", "stablo", "semantika", "frisc")
+
+
+def okvir(podaci):
+    return OKVIR.pack(len(podaci)) + podaci
+
+
+# izvodi se u procesu iz bazena: prima i vraca bajtove, pa se i JSON obraduje izvan petlje dogadaja
+def obradi_zahtjev(podaci):
+    try:
+        zahtjev = json.loads(podaci)
+        izvorni_kod = zahtjev["izvorni_kod"]
+        izlazi = zahtjev.get("izlazi", IZLAZI)
+        if not isinstance(izvorni_kod, str) or any(izlaz not in IZLAZI for izlaz in izlazi):
+            raise ValueError("neispravan izvorni_kod ili izlazi")
+    except (ValueError, KeyError, TypeError) as greska:
+        return json.dumps({"greska_zahtjeva": str(greska)}).encode()
+
+    # iznimka iz prevodenja bi inace srusila obradu veze, a klijent bi vidio samo zatvorenu vezu
+    try:
+        frisc = io.StringIO()
+        rezultat = prevedi(izvorni_kod, frisc)
+        niz_tokena = rezultat.niz_tokena
+        odgovor = {"greska": rezultat.greska}
+        if "tokeni" in izlazi:
+            odgovor["tokeni"] = "".join(niz_tokena.redak_ispisa(i) + "\n" for i in range(len(niz_tokena)))
+        if rezultat.greska is None:
+            if "stablo" in izlazi:
+                odgovor["stablo"] = "".join(rezultat.stablo.redci(niz_tokena)) + "\n"
+            if "semantika" in izlazi:
+                odgovor["semantika"] = "".join(redak + "\n" for redak in rezultat.semantika)
+            if "frisc" in izlazi:
+                odgovor["frisc"] = frisc.getvalue()
+    except Exception as iznimka:
+        odgovor = {"greska_zahtjeva": f"{type(iznimka).__name__}: {iznimka}"}
+    return json.dumps(odgovor).encode()
+
+
+class Posluzitelj:
+    def __init__(self, putanja=SOCKET, broj_poslova=None):
+        self.putanja = putanja
+        self.broj_poslova = broj_poslova or os.cpu_count()
+        self.izvrsitelj = ProcessPoolExecutor(max_workers=self.broj_poslova)
+        self.obradeno = 0
+
+    async def obradi_vezu(self, citac, pisac):
+        petlja = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    (duljina,) = OKVIR.unpack(await citac.readexactly(OKVIR.size))
+                except asyncio.IncompleteReadError:
+                    break   # klijent je zatvorio vezu
+                if duljina > NAJVECI_OKVIR:
+                    pisac.write(okvir(json.dumps({"greska_zahtjeva": "prevelik zahtjev"}).encode()))
+                    break
+                podaci = await citac.readexactly(duljina)
+                odgovor = await petlja.run_in_executor(self.izvrsitelj, obradi_zahtjev, podaci)
+                pisac.write(okvir(odgovor))
+                await pisac.drain()
+                self.obradeno += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            pisac.close()
+
+    async def pokreni(self):
+        if os.path.exists(self.putanja):
+            os.remove(self.putanja)     # ostatak prethodnog pokretanja
+        posluzitelj = await asyncio.start_unix_server(self.obradi_vezu, path=self.putanja)
+
+        zaustavi = asyncio.Event()
+        petlja = asyncio.get_running_loop()
+        for signal_zaustavljanja in (signal.SIGINT, signal.SIGTERM):
+            petlja.add_signal_handler(signal_zaustavljanja, zaustavi.set)
+
+        # bazen se zagrijava odmah, da prvi zahtjevi ne cekaju pokretanje procesa
+        await asyncio.gather(*(petlja.run_in_executor(self.izvrsitelj, obradi_zahtjev, b'{"izvorni_kod": ""}')
+                               for _ in range(self.broj_poslova)))
+        print(f"Posluzitelj slusa na {self.putanja}", file=sys.stderr)
+
+        async with posluzitelj:
+            await zaustavi.wait()
+        self.izvrsitelj.shutdown()
+        os.remove(self.putanja)
+        print(f"Posluzitelj zaustavljen, obradeno {self.obradeno} zahtjeva", file=sys.stderr)
+
+
+# python Posluzitelj.py [--socket putanja] [--jobs N]
+def main():
+    putanja = sys.argv[sys.argv.index("--socket") + 1] if "--socket" in sys.argv[1:] else SOCKET
+    broj_poslova = int(sys.argv[sys.argv.index("--jobs") + 1]) if "--jobs" in sys.argv[1:] else None
+    asyncio.run(Posluzitelj(putanja, broj_poslova).pokreni())
+
+
+if __name__ == "__main__":
+    main()
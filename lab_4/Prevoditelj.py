@@ -0,0 +1,122 @@
+import io
+import os
+import sys
+from collections import namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_1.LeksickiAnalizator import GRESKA, KODOVI_VRSTA, NizTokena, tokenize
+from lab_2.SintaksniAnalizator import Stablo, parsiraj
+from lab_3.SemantickiAnalizator import provjeri
+from lab_4.FRISCGenerator import generiraj
+from lab_4.Spremiste import Spremiste
+
+# sve cetiri faze prevodenja u jednom procesu: faze razmjenjuju NizTokena i Stablo umjesto teksta,
+# a ispis je isti kao kad se lab_1 | lab_2 | lab_3 i lab_4 pokrecu kao zasebni programi
+
+# greska je redak greske leksicke ili sintaksne analize (tada ostale faze ne rade), a
+# semantika su redci ispisa semanticke analize
+Rezultat = namedtuple("Rezultat", ["niz_tokena", "stablo", "greska", "semantika"])
+
+
+def leksiraj(izvorni_kod):
+    # kao i sys.stdin na Linuxu, redci se dijele samo na "\n"
+    return NizTokena.iz_tokena(tokenize(io.StringIO(izvorni_kod, newline="\n")))
+
+
+# stupci niza tokena kao bajtovi; isti niz tokena uvijek daje iste bajtove, pa sluze i kao ulaz kljuca spremista
+def zapis_niza(niz_tokena):
+    return (niz_tokena.vrste.tobytes(), niz_tokena.redci.tobytes(), niz_tokena.leksemi.tobytes(),
+            niz_tokena.tablica_leksema)
+
+
+def bajtovi_niza(zapis):
+    vrste, redci, leksemi, tablica_leksema = zapis
+    return b"%d %d\n" % (len(vrste), len(tablica_leksema)) + vrste + redci + leksemi + "\n".join(tablica_leksema).encode("utf-8", "surrogatepass")
+
+
+# rezultat faze iz spremista ako postoji, a inace ga izracunaj() racuna i sprema; u_zapis i iz_zapisa
+# pretvaraju rezultat u vrijednost koju marshal moze spremiti i natrag
+def faza(spremiste, naziv, ulaz, izracunaj, u_zapis=None, iz_zapisa=None):
+    if spremiste is None:
+        return izracunaj()
+    kljuc = spremiste.kljuc(naziv, ulaz)
+    zapis = spremiste.dohvati(naziv, kljuc)
+    if zapis is not None:
+        return iz_zapisa(zapis) if iz_zapisa else zapis
+    rezultat = izracunaj()
+    spremiste.spremi(naziv, kljuc, u_zapis(rezultat) if u_zapis else rezultat)
+    return rezultat
+
+
+def parsiraj_u_stablo(niz_tokena):
+    stablo = Stablo()
+    return (parsiraj(niz_tokena, stablo), stablo)
+
+
+def stablo_iz_zapisa(zapis):
+    greska, dubine, cvorovi = zapis
+    stablo = Stablo()
+    stablo.dubine.frombytes(dubine)
+    stablo.cvorovi.frombytes(cvorovi)
+    return (greska, stablo)
+
+
+def generiraj_u_tekst(niz_tokena):
+    frisc = io.StringIO()
+    generiraj(niz_tokena, frisc)
+    return frisc.getvalue()
+
+
+# prevodi izvorni kod i FRISC kod pise u datoteka (otvorenu za pisanje) ako nema leksicke ni sintaksne
+# greske; uz spremiste (lab_4/Spremiste.py) se svaka faza cije se ni ulaz ni kod nisu promijenili preskace
+def prevedi(izvorni_kod, datoteka, spremiste=None):
+    niz_tokena = faza(spremiste, "leksicki", izvorni_kod.encode("utf-8", "surrogatepass"), lambda: leksiraj(izvorni_kod),
+                      zapis_niza, lambda zapis: NizTokena.iz_polja(*zapis))
+    if KODOVI_VRSTA[GRESKA] in niz_tokena.vrste:
+        return Rezultat(niz_tokena, None, GRESKA, [])
+
+    # kasnije faze kao ulaz imaju niz tokena (listovi stabla su upravo tokeni programa)
+    ulaz = bajtovi_niza(zapis_niza(niz_tokena)) if spremiste is not None else None
+    greska, stablo = faza(spremiste, "sintaksni", ulaz, lambda: parsiraj_u_stablo(niz_tokena),
+                          lambda rezultat: (rezultat[0], rezultat[1].dubine.tobytes(), rezultat[1].cvorovi.tobytes()),
+                          stablo_iz_zapisa)
+    if greska is not None:
+        return Rezultat(niz_tokena, stablo, greska, [])
+
+    semantika = faza(spremiste, "semanticki", ulaz, lambda: provjeri(niz_tokena))
+    datoteka.write(faza(spremiste, "generator", ulaz, lambda: generiraj_u_tekst(niz_tokena)))
+    return Rezultat(niz_tokena, stablo, None, semantika)
+
+
+# python Prevoditelj.py [program.pj] [-o a.frisc] [--spremiste mapa]; bez datoteke cita izvorni kod sa stdin
+def main():
+    argumenti = sys.argv[1:]
+    izlaz = "a.frisc"
+    spremiste = None
+    if "-o" in argumenti:
+        izlaz = argumenti.pop(argumenti.index("-o") + 1)
+        argumenti.remove("-o")
+    if "--spremiste" in argumenti:
+        spremiste = Spremiste(argumenti.pop(argumenti.index("--spremiste") + 1))
+        argumenti.remove("--spremiste")
+    if argumenti:
+        with open(argumenti[0]) as f:
+            izvorni_kod = f.read()
+    else:
+        izvorni_kod = sys.stdin.read()
+
+    with open(izlaz, "w") as datoteka:
+        rezultat = prevedi(izvorni_kod, datoteka, spremiste)
+    if spremiste is not None:
+        spremiste.pocisti()
+        print(f"Spremiste: {spremiste.statistika()}", file=sys.stderr)
+    if rezultat.greska is not None:
+        os.remove(izlaz)
+        print(rezultat.greska)
+    else:
+        for redak in rezultat.semantika:
+            print(redak)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import hashlib
+import marshal
+import os
+import sys
+from collections import Counter
+
+# spremiste rezultata pojedinih faza prevodenja na disku: kljuc je sazetak ulaza faze i otiska faze
+# (sazetak izvornog koda te faze), pa se faza preskace dok god se ni njen ulaz ni njen kod nisu
+# promijenili, cak i ako se promijenila neka kasnija faza
+#
+# svaki zapis je zasebna datoteka <mapa>/<faza>/<kljuc[:2]>/<kljuc> s marshal vrijednosti; zapisuje se
+# u privremenu datoteku pa preimenuje, pa istovremeni procesi nikad ne vide pola zapisa; vrijeme
+# zadnje promjene datoteke je vrijeme zadnjeg koristenja, po kojem se brisu najstariji zapisi (LRU)
+# kad spremiste naraste preko najvece velicine
+#
+# velicina spremista na disku izmjeri se pri prvom zapisu procesa (i pri svakom ciscenju), a zatim se
+# uvecava za svaki zapis, pa granica vrijedi i kad svaki proces prevodi samo jednu datoteku
+
+KORIJEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MAPA = os.path.join(os.path.expanduser("~"), ".cache", "pj-prevoditelj")
+NAJVECA_VELICINA = 256 << 20
+# mijenja se kad se promijeni oblik zapisa
+VERZIJA_SPREMISTA = 1
+
+# datoteke o kojima ovisi rezultat pojedine faze
+FAZE = {
+    "leksicki": ["lab_1/LeksickiAnalizator.py"],
+    "sintaksni": ["lab_2/SintaksniAnalizator.py", "lab_2/GeneratorTablice.py", "lab_2/gramatika.txt"],
+    "semanticki": ["lab_3/SemantickiAnalizator.py"],
+    "generator": ["lab_4/FRISCGenerator.py"],
+}
+
+_otisci = {}
+
+
+def otisak_faze(faza):
+    if faza not in _otisci:
+        sazetak = hashlib.sha256(f"{VERZIJA_SPREMISTA} {faza} {sys.byteorder}\n".encode())
+        for datoteka in FAZE[faza]:
+            with open(os.path.join(KORIJEN, datoteka), "rb") as f:
+                sazetak.update(f.read())
+        _otisci[faza] = sazetak.digest()
+    return _otisci[faza]
+
+
+class Spremiste:
+    def __init__(self, mapa=MAPA, najveca_velicina=NAJVECA_VELICINA):
+        self.mapa = mapa
+        self.najveca_velicina = najveca_velicina
+        # (faza, "pogodak" ili "promasaj") -> broj
+        self.brojaci = Counter()
+        # velicina svih zapisa na disku, None dok nije izmjerena
+        self.ukupno = None
+
+    def kljuc(self, faza, ulaz):
+        return hashlib.sha256(otisak_faze(faza) + ulaz).hexdigest()
+
+    def putanja(self, faza, kljuc):
+        return os.path.join(self.mapa, faza, kljuc[:2], kljuc)
+
+    def dohvati(self, faza, kljuc):
+        putanja = self.putanja(faza, kljuc)
+        try:
+            with open(putanja, "rb") as f:
+                vrijednost = marshal.loads(f.read())
+            os.utime(putanja)   # zapis je upravo koristen
+        except (OSError, EOFError, ValueError, TypeError):
+            # nema zapisa, ili ga je drugi proces upravo obrisao
+            self.brojaci[faza, "promasaj"] += 1
+            return None
+        self.brojaci[faza, "pogodak"] += 1
+        return vrijednost
+
+    def spremi(self, faza, kljuc, vrijednost):
+        putanja = self.putanja(faza, kljuc)
+        # privremena datoteka je jedinstvena po procesu, a preimenovanje u istoj mapi je atomicno
+        privremena = f"{putanja}.{os.getpid()}.tmp"
+        podaci = marshal.dumps(vrijednost)
+        try:
+            try:
+                f = open(privremena, "wb")
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(putanja), exist_ok=True)
+                f = open(privremena, "wb")
+            with f:
+                f.write(podaci)
+            os.replace(privremena, putanja)
+        except OSError:
+            return  # spremiste je samo ubrzanje, prevodenje se nastavlja i bez njega
+        if self.ukupno is None:
+            self.pocisti()
+        else:
+            self.ukupno += len(podaci)
+            if self.ukupno > self.najveca_velicina:
+                self.pocisti()
+
+    # mjeri velicinu spremista na disku i, ako je veca od najvece, brise najdavnije koristene zapise dok
+    # spremiste ne padne na 90% najvece velicine
+    def pocisti(self):
+        zapisi = []
+        ukupno = 0
+        for mapa, _, datoteke in os.walk(self.mapa):
+            for naziv in datoteke:
+                putanja = os.path.join(mapa, naziv)
+                try:
+                    stanje = os.stat(putanja)
+                except OSError:
+                    continue
+                zapisi.append((stanje.st_mtime_ns, stanje.st_size, putanja))
+                ukupno += stanje.st_size
+        self.ukupno = ukupno
+        if ukupno <= self.najveca_velicina:
+            return
+        zapisi.sort()
+        for _, velicina, putanja in zapisi:
+            if ukupno <= self.najveca_velicina * 9 // 10:
+                break
+            try:
+                os.remove(putanja)
+            except OSError:
+                pass
+            ukupno -= velicina
+        self.ukupno = ukupno
+
+    def statistika(self):
+        return ", ".join(
+            f"{faza} {self.brojaci[faza, 'pogodak']}/{self.brojaci[faza, 'pogodak'] + self.brojaci[faza, 'promasaj']}"
+            for faza in FAZE
+        ) + " pogodaka"
@@ -0,0 +1,121 @@
+import io
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_3.Programi import pronadi_programe
+from lab_4.Prevoditelj import prevedi
+from lab_4.Spremiste import Spremiste
+
+# prevodi mnogo PJ programa odjednom: svaka datoteka prolazi sve cetiri faze u jednom od procesa
+# iz bazena, a FRISC kod ide u <program>.frisc (umjesto zajednickog a.frisc); greske se skupljaju
+# po datoteci i ne zaustavljaju ostatak prevodenja
+
+# datoteke se procesima salju u grupama, da se ne placa komunikacija za svaki mali program
+VELICINA_GRUPE = 64
+
+
+# bez izlazne mape <program>.frisc je uz program; u izlaznoj mapi svaki program zadrzava putanju u odnosu
+# na najdublju mapu zajednicku svim programima, pa istoimeni programi iz razlicitih mapa ne pisu u istu datoteku
+def izlazne_putanje(programi, izlazna_mapa=None):
+    nazivi = [os.path.splitext(putanja)[0] + ".frisc" for putanja in programi]
+    if izlazna_mapa is None or not programi:
+        return nazivi
+    korijen = os.path.commonpath([os.path.dirname(os.path.abspath(putanja)) for putanja in programi])
+    return [os.path.join(izlazna_mapa, os.path.relpath(os.path.abspath(naziv), korijen)) for naziv in nazivi]
+
+
+# jedno spremiste po procesu i mapi, da se velicina spremista na disku mjeri jednom po procesu, a ne po datoteci
+_spremista = {}
+
+
+# vraca (putanja, greska, brojaci spremista); greska je None, redak greske leksicke, sintaksne ili
+# semanticke analize, ili opis iznimke ako datoteku nije bilo moguce procitati ili prevesti
+def prevedi_datoteku(posao):
+    putanja, izlaz, mapa_spremista = posao
+    spremiste = None
+    if mapa_spremista is not None:
+        spremiste = _spremista.setdefault(mapa_spremista, Spremiste(mapa_spremista))
+        prije = Counter(spremiste.brojaci)
+    try:
+        with open(putanja) as f:
+            izvorni_kod = f.read()
+        frisc = io.StringIO()
+        rezultat = prevedi(izvorni_kod, frisc, spremiste)
+        if rezultat.greska is not None:
+            greska = rezultat.greska
+        else:
+            # FRISCGenerator ne ovisi o semantickoj analizi, pa se kod pise i kad ona javi gresku
+            os.makedirs(os.path.dirname(izlaz) or ".", exist_ok=True)
+            with open(izlaz, "w") as f:
+                f.write(frisc.getvalue())
+            greska = None
+            if rezultat.semantika and rezultat.semantika[-1].startswith("err"):
+                greska = rezultat.semantika[-1]
+    except Exception as iznimka:
+        greska = f"{type(iznimka).__name__}: {iznimka}"
+    return (putanja, greska, spremiste.brojaci - prije if spremiste is not None else None)
+
+
+def skupi_rezultate(rezultati, spremiste):
+    greske = []
+    for putanja, greska, brojaci in rezultati:
+        if greska is not None:
+            greske.append((putanja, greska))
+        if brojaci is not None:
+            spremiste.brojaci.update(brojaci)
+    return greske
+
+
+# vraca listu (putanja, greska) za sve datoteke s greskom, redom kojim su zadane; uz mapu spremista
+# vraca se i Spremiste cijim su brojacima zbrojeni pogoci i promasaji svih procesa
+def prevedi_sve(programi, broj_poslova=None, izlazna_mapa=None, mapa_spremista=None):
+    izlazi = izlazne_putanje(programi, izlazna_mapa)
+    poslovi = [(putanja, izlaz, mapa_spremista) for putanja, izlaz in zip(programi, izlazi)]
+    spremiste = Spremiste(mapa_spremista) if mapa_spremista is not None else None
+    if broj_poslova == 1:
+        greske = skupi_rezultate(map(prevedi_datoteku, poslovi), spremiste)
+    else:
+        with ProcessPoolExecutor(max_workers=broj_poslova or os.cpu_count()) as izvrsitelj:
+            greske = skupi_rezultate(izvrsitelj.map(prevedi_datoteku, poslovi, chunksize=VELICINA_GRUPE), spremiste)
+    if spremiste is not None:
+        spremiste.pocisti()
+    return greske, spremiste
+
+
+# python VisestrukoPrevodenje.py [--jobs N] [-o izlazna_mapa] [--spremiste mapa] program.pj|mapa ...
+def main():
+    argumenti = sys.argv[1:]
+    broj_poslova = None
+    izlazna_mapa = None
+    mapa_spremista = None
+    if "--jobs" in argumenti:
+        broj_poslova = int(argumenti.pop(argumenti.index("--jobs") + 1))
+        argumenti.remove("--jobs")
+    if "-o" in argumenti:
+        izlazna_mapa = argumenti.pop(argumenti.index("-o") + 1)
+        argumenti.remove("-o")
+        os.makedirs(izlazna_mapa, exist_ok=True)
+    if "--spremiste" in argumenti:
+        mapa_spremista = argumenti.pop(argumenti.index("--spremiste") + 1)
+        argumenti.remove("--spremiste")
+
+    programi = pronadi_programe(argumenti)
+    pocetak = time.perf_counter()
+    greske, spremiste = prevedi_sve(programi, broj_poslova, izlazna_mapa, mapa_spremista)
+    trajanje = time.perf_counter() - pocetak
+
+    for putanja, greska in greske:
+        print(f"{putanja}: {greska}", file=sys.stderr)
+    print(f"Prevedeno {len(programi) - len(greske)} od {len(programi)} programa, {len(greske)} s greskom "
+          f"({trajanje:.2f} s)", file=sys.stderr)
+    if spremiste is not None:
+        print(f"Spremiste: {spremiste.statistika()}", file=sys.stderr)
+    sys.exit(1 if greske else 0)
+
+
+if __name__ == "__main__":
+    main()
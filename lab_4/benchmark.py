@@ -0,0 +1,528 @@
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from lab_1.benchmark import generiraj_izvorni_kod
+from lab_4 import FRISCGenerator, Medukod
+from lab_4.FRISCGenerator import (PEEPHOLE_RULES, AssignAST, BinaryOpAST, NumAST, ProgramAST, UnaryOpAST, VarAST,
+                                  generiraj, generiraj_ast)
+from lab_4.FRISCSimulator import PRISTUP_MEMORIJI, PredugoIzvodenje, izvedi
+from lab_4.Posluzitelj import OKVIR, okvir
+from lab_4.Prevoditelj import leksiraj, prevedi
+from lab_4.VisestrukoPrevodenje import prevedi_sve
+
+KORIJEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+LANAC = (
+    '"{python}" "{korijen}/lab_1/LeksickiAnalizator.py" < program.pj'
+    ' | "{python}" "{korijen}/lab_2/SintaksniAnalizator.py" > stablo.txt;'
+    ' "{python}" "{korijen}/lab_3/SemantickiAnalizator.py" < stablo.txt > semantika.txt;'
+    ' "{python}" "{korijen}/lab_4/FRISCGenerator.py" < stablo.txt'
+)
+
+
+def najbolje_vrijeme(funkcija, ponavljanja):
+    najbolje = None
+    for _ in range(ponavljanja):
+        pocetak = time.perf_counter()
+        funkcija()
+        trajanje = time.perf_counter() - pocetak
+        najbolje = trajanje if najbolje is None else min(najbolje, trajanje)
+    return najbolje
+
+
+# cijelo prevodenje: cetiri procesa povezana tekstom prema Prevoditelj.py (jedan proces) i prevedi() u ovom procesu
+def izmjeri(broj_redaka, ponavljanja=3):
+    izvorni_kod = generiraj_izvorni_kod(broj_redaka)
+    with tempfile.TemporaryDirectory() as mapa:
+        with open(os.path.join(mapa, "program.pj"), "w") as f:
+            f.write(izvorni_kod)
+
+        def lanac():
+            naredba = LANAC.format(python=sys.executable, korijen=KORIJEN)
+            subprocess.run(naredba, shell=True, cwd=mapa, check=True)
+
+        def jedan_proces():
+            with open(os.path.join(mapa, "semantika_api.txt"), "w") as izlaz:
+                subprocess.run([sys.executable, os.path.join(KORIJEN, "lab_4", "Prevoditelj.py"), "program.pj",
+                                "-o", "api.frisc"], cwd=mapa, stdout=izlaz, check=True)
+
+        def u_procesu():
+            with open(os.path.join(mapa, "u_procesu.frisc"), "w") as datoteka:
+                return prevedi(izvorni_kod, datoteka)
+
+        t_lanac = najbolje_vrijeme(lanac, ponavljanja)
+        t_jedan = najbolje_vrijeme(jedan_proces, ponavljanja)
+        t_u_procesu = najbolje_vrijeme(u_procesu, ponavljanja)
+
+        def procitaj(naziv):
+            with open(os.path.join(mapa, naziv)) as f:
+                return f.read()
+
+        rezultat = u_procesu()
+        jednako = (procitaj("a.frisc") == procitaj("api.frisc") == procitaj("u_procesu.frisc")
+                   and procitaj("semantika.txt") == procitaj("semantika_api.txt")
+                   == "".join(redak + "\n" for redak in rezultat.semantika))
+
+    print(f"{broj_redaka:6d} redaka {len(rezultat.niz_tokena):7d} tokena  cetiri procesa: {t_lanac:7.3f} s"
+          f"  Prevoditelj.py: {t_jedan:7.3f} s ({t_lanac / t_jedan:6.1f}x)"
+          f"  prevedi(): {t_u_procesu:7.3f} s ({t_lanac / t_u_procesu:6.1f}x)"
+          f"  {'isti ispis' if jednako else 'RAZLICIT ISPIS!'}")
+
+
+# zahtjevi se salju kroz vise istovremenih veza; vraca odgovore redom kojim su programi zadani
+async def posalji_sve(putanja, programi, broj_veza):
+    odgovori = [None] * len(programi)
+    sljedeci = iter(range(len(programi)))
+
+    async def veza():
+        citac, pisac = await asyncio.open_unix_connection(putanja)
+        for i in sljedeci:
+            pisac.write(okvir(json.dumps({"izvorni_kod": programi[i]}).encode()))
+            await pisac.drain()
+            (duljina,) = OKVIR.unpack(await citac.readexactly(OKVIR.size))
+            odgovori[i] = json.loads(await citac.readexactly(duljina))
+        pisac.close()
+        await pisac.wait_closed()
+
+    await asyncio.gather(*(veza() for _ in range(broj_veza)))
+    return odgovori
+
+
+# zahtjevi u sekundi: cetiri skripte pokrenute za svaku datoteku prema posluzitelju (svi izlazi po zahtjevu)
+def izmjeri_posluzitelj(broj_programa=2000, broj_pokretanja=30, broj_veza=8):
+    programi = [generiraj_izvorni_kod(20, seed) for seed in range(broj_programa)]
+
+    with tempfile.TemporaryDirectory() as mapa:
+        naredba = LANAC.format(python=sys.executable, korijen=KORIJEN)
+        ocekivano = []
+        pocetak = time.perf_counter()
+        for program in programi[:broj_pokretanja]:
+            with open(os.path.join(mapa, "program.pj"), "w") as f:
+                f.write(program)
+            subprocess.run(naredba, shell=True, cwd=mapa, check=True)
+            with open(os.path.join(mapa, "semantika.txt")) as f, open(os.path.join(mapa, "a.frisc")) as frisc:
+                ocekivano.append((f.read(), frisc.read()))
+        t_skripte = time.perf_counter() - pocetak
+
+        putanja = os.path.join(mapa, "posluzitelj.sock")
+        posluzitelj = subprocess.Popen([sys.executable, os.path.join(KORIJEN, "lab_4", "Posluzitelj.py"),
+                                        "--socket", putanja], stderr=subprocess.PIPE, text=True)
+        try:
+            posluzitelj.stderr.readline()   # "Posluzitelj slusa na ..." kad je bazen spreman
+            pocetak = time.perf_counter()
+            odgovori = asyncio.run(posalji_sve(putanja, programi, broj_veza))
+            t_posluzitelj = time.perf_counter() - pocetak
+        finally:
+            posluzitelj.terminate()
+            posluzitelj.wait()
+
+    jednako = all((odgovor["semantika"], odgovor["frisc"]) == par for odgovor, par in zip(odgovori, ocekivano))
+    print(f"skripte po datoteci: {broj_pokretanja / t_skripte:8.1f} zahtjeva/s  ({broj_pokretanja} datoteka)")
+    print(f"posluzitelj:         {broj_programa / t_posluzitelj:8.1f} zahtjeva/s  ({broj_programa} programa, "
+          f"{broj_veza} veza, {os.cpu_count()} procesa)  ubrzanje {t_skripte / broj_pokretanja * broj_programa / t_posluzitelj:.0f}x"
+          f"  {'isti ispis' if jednako else 'RAZLICIT ISPIS!'}")
+
+
+# VisestrukoPrevodenje nad korpusom malih programa: programi u sekundi za 1, 2, 4... procesa
+def izmjeri_visestruko(broj_programa):
+    with tempfile.TemporaryDirectory() as mapa:
+        programi = []
+        for seed in range(broj_programa):
+            putanja = os.path.join(mapa, f"program{seed}.pj")
+            with open(putanja, "w") as f:
+                f.write(generiraj_izvorni_kod(20, seed))
+            programi.append(putanja)
+
+        print(f"Korpus: {broj_programa} programa, {os.cpu_count()} jezgri")
+        t_jedan = None
+        broj_poslova = 1
+        while True:
+            pocetak = time.perf_counter()
+            greske, _ = prevedi_sve(programi, broj_poslova)
+            trajanje = time.perf_counter() - pocetak
+            t_jedan = t_jedan or trajanje
+            print(f"--jobs {broj_poslova:<4} {trajanje:7.2f} s {broj_programa / trajanje:9.0f} programa/s"
+                  f"  ubrzanje {t_jedan / trajanje:5.2f}x  gresaka {len(greske)}")
+            if broj_poslova >= os.cpu_count():
+                break
+            broj_poslova = min(broj_poslova * 2, os.cpu_count())
+
+
+# nocna ponovna izgradnja korpusa: bez spremista, s praznim spremistem, bez ikakve promjene, nakon
+# promjene komentara u dijelu datoteka (mijenja se samo ulaz leksicke analize) i nakon promjene
+# generatora (simulirana brisanjem zapisa te faze)
+def izmjeri_spremiste(broj_programa=2000):
+    with tempfile.TemporaryDirectory() as mapa:
+        programi = []
+        for seed in range(broj_programa):
+            putanja = os.path.join(mapa, f"program{seed}.pj")
+            with open(putanja, "w") as f:
+                f.write(generiraj_izvorni_kod(20, seed))
+            programi.append(putanja)
+        mapa_spremista = os.path.join(mapa, "spremiste")
+
+        def izgradi(opis, s_spremistem=True):
+            izlazi = {}
+            pocetak = time.perf_counter()
+            _, spremiste = prevedi_sve(programi, 1, mapa_spremista=mapa_spremista if s_spremistem else None)
+            trajanje = time.perf_counter() - pocetak
+            for putanja in programi:
+                with open(putanja[:-3] + ".frisc") as f:
+                    izlazi[putanja] = f.read()
+            print(f"{opis:24} {trajanje:7.2f} s  {spremiste.statistika() if spremiste else ''}")
+            return izlazi
+
+        ocekivano = izgradi("bez spremista", False)
+        jednako = izgradi("prazno spremiste") == ocekivano
+        jednako &= izgradi("bez promjena") == ocekivano
+        for putanja in programi[::10]:
+            with open(putanja, "a") as f:
+                f.write("// izmijenjen komentar\n")
+        jednako &= izgradi("10% komentara izmijenjeno") == ocekivano
+        shutil.rmtree(os.path.join(mapa_spremista, "generator"))
+        jednako &= izgradi("promijenjen generator") == ocekivano
+    print("isti FRISC kod u svim izgradnjama" if jednako else "RAZLICIT FRISC KOD!")
+
+
+# slucajno stablo izraza s broj_listova listova (varijable a-f i mali brojevi), svih oblika:
+# od lijevo dubokih lanaca kakve daje parser do uravnotezenih stabala koja trebaju sve registre
+def slucajni_izraz(rnd, broj_listova):
+    if broj_listova == 1:
+        if rnd.random() < 0.5:
+            return VarAST(rnd.choice("abcdef"), 0)
+        return NumAST(str(rnd.randint(0, 20)))
+    lijevo = rnd.randint(1, broj_listova - 1)
+    izraz = BinaryOpAST(slucajni_izraz(rnd, lijevo), rnd.choice("++--*/"), slucajni_izraz(rnd, broj_listova - lijevo))
+    return UnaryOpAST("-", izraz) if rnd.random() < 0.05 else izraz
+
+
+# staticki broj naredbi i naredbi koje pristupaju memoriji u glavnom programu (bez MUL i DIV)
+def staticki_brojaci(frisc):
+    naredbe = pristupi = 0
+    for redak in frisc.split("; ========== DEKLARACIJA")[0].splitlines():
+        if redak.startswith("  ") and not redak.lstrip().startswith(";"):
+            naredbe += 1
+            pristupi += redak.split()[0] in PRISTUP_MEMORIJI
+    return naredbe, pristupi
+
+
+# korpus izraza: staticki broj naredbi i pristupa memoriji te izvedene naredbe i pristupi u simulatoru,
+# izrazi na stogu prema izrazima u registrima (Sethi-Ullman)
+def izmjeri_registre(broj_izraza=200):
+    rnd = random.Random(0)
+    print(f"{broj_izraza} izraza po velicini; staticki: naredbe / pristupi memoriji, izvedeno: naredbe / pristupi")
+    for broj_listova in (2, 4, 8, 16, 64):
+        zbroj = {False: [0, 0, 0, 0], True: [0, 0, 0, 0]}
+        jednako = True
+        preskoceno = 0
+        for _ in range(broj_izraza):
+            pocetne = [AssignAST(ime, 0, NumAST(str(rnd.randint(1, 9)))) for ime in "abcdef"]
+            program = ProgramAST(pocetne + [AssignAST("rez", 0, slucajni_izraz(rnd, broj_listova))])
+            FRISCGenerator.list_defined.clear()
+            rezultati = {}
+            brojaci = {}
+            for registri in (False, True):
+                frisc = io.StringIO()
+                generiraj_ast(program, frisc, registri)
+                naredbe, pristupi = staticki_brojaci(frisc.getvalue())
+                try:
+                    izvodenje = izvedi(frisc.getvalue(), 200_000)
+                except PredugoIzvodenje:
+                    break   # dugo mnozenje ili dijeljenje ponavljanim zbrajanjem
+                rezultati[registri] = izvodenje.registri[6]
+                brojaci[registri] = (naredbe, pristupi, izvodenje.instrukcije, izvodenje.pristupi)
+            if len(brojaci) < 2:
+                preskoceno += 1
+                continue
+            jednako &= rezultati[False] == rezultati[True]
+            for registri in (False, True):
+                zbroj[registri] = [a + b for a, b in zip(zbroj[registri], brojaci[registri])]
+
+        stog, registri = zbroj[False], zbroj[True]
+        print(f"{broj_listova:3d} listova  staticki: stog {stog[0]:6d} / {stog[1]:5d}  registri {registri[0]:6d} / {registri[1]:5d}"
+              f" ({stog[0] / registri[0]:.2f}x / {stog[1] / registri[1]:.2f}x)"
+              f"  izvedeno: stog {stog[2]:8d} / {stog[3]:7d}  registri {registri[2]:8d} / {registri[3]:7d}"
+              f"  {'isti rezultati' if jednako else 'RAZLICITI REZULTATI!'}"
+              + (f"  (preskoceno {preskoceno})" if preskoceno else ""))
+
+
+# ukupna velicina koda (staticki broj naredbi glavnog programa), izvedene naredbe, pristupi memoriji i
+# taktovi u simulatoru za korpus programa, za svaki nacin generiranja (rjecnik naziv -> argumenti
+# generiraj() ili funkcija (niz_tokena, datoteka) koja vraca primjene pravila), te zbroj primjena
+# peephole pravila po nacinu; programi koji se s nekim nacinom ne izvedu do granice koraka preskacu se
+# za sve nacine
+def usporedi_nacine(programi, nacini, najvise_koraka=2_000_000):
+    zbroj = {naziv: [0, 0, 0, 0] for naziv in nacini}
+    primjene = {naziv: Counter() for naziv in nacini}
+    preskoceno = 0
+    razliciti = 0
+    for izvorni_kod in programi:
+        niz_tokena = leksiraj(izvorni_kod)
+        brojaci = {}
+        pravila = {}
+        rezultati = set()
+        try:
+            for naziv, argumenti in nacini.items():
+                frisc = io.StringIO()
+                if callable(argumenti):
+                    pravila[naziv] = argumenti(niz_tokena, frisc)
+                else:
+                    pravila[naziv] = generiraj(niz_tokena, frisc, **argumenti)
+                izvodenje = izvedi(frisc.getvalue(), najvise_koraka)
+                rezultati.add(izvodenje.registri[6])
+                brojaci[naziv] = (staticki_brojaci(frisc.getvalue())[0], izvodenje.instrukcije, izvodenje.pristupi,
+                                  izvodenje.taktovi)
+        except PredugoIzvodenje:
+            preskoceno += 1
+            continue
+        razliciti += len(rezultati) > 1
+        for naziv in nacini:
+            zbroj[naziv] = [a + b for a, b in zip(zbroj[naziv], brojaci[naziv])]
+            primjene[naziv].update(pravila[naziv])
+    return zbroj, primjene, preskoceno, razliciti
+
+
+def ispisi_usporedbu(zbroj, primjene, preskoceno, razliciti, osnova):
+    naredbe, izvedeno, pristupi, taktovi = zbroj[osnova]
+    for naziv, (n, i, p, t) in zbroj.items():
+        print(f"{naziv:34} velicina {n:7d} ({n / naredbe:5.2f})  izvedeno {i:9d} ({i / izvedeno:5.2f})"
+              f"  pristupi memoriji {p:8d} ({p / pristupi:5.2f})  taktovi {t:9d} ({t / taktovi:5.2f})")
+        if primjene[naziv]:
+            print(f"{'':34} " + ", ".join(f"{pravilo} {broj}" for pravilo, broj in primjene[naziv].items()))
+    print(("isti rezultati" if not razliciti else f"RAZLICITI REZULTATI u {razliciti} programa")
+          + (f", preskoceno {preskoceno} programa (predugo izvodenje)" if preskoceno else ""))
+
+
+# korpus programa s mnogo konstanti: bez i s racunanjem konstantnih izraza i propagacijom konstanti
+def izmjeri_konstante(broj_programa=200, broj_redaka=40):
+    programi = [generiraj_izvorni_kod(broj_redaka, seed) for seed in range(broj_programa)]
+    nacini = {
+        "stog": {},
+        "stog + konstante": {"konstante": True},
+        "registri": {"registri": True},
+        "registri + konstante": {"registri": True, "konstante": True},
+    }
+    print(f"{broj_programa} programa od {broj_redaka} redaka")
+    ispisi_usporedbu(*usporedi_nacine(programi, nacini), "stog")
+
+
+# isti korpus bez i s peephole optimizacijom (sva pravila), na stogu i u registrima
+def izmjeri_peephole(broj_programa=200, broj_redaka=40):
+    programi = [generiraj_izvorni_kod(broj_redaka, seed) for seed in range(broj_programa)]
+    nacini = {
+        "stog": {},
+        "stog + peephole": {"peephole_rules": tuple(PEEPHOLE_RULES)},
+        "registri + konstante": {"registri": True, "konstante": True},
+        "registri + konstante + peephole": {"registri": True, "konstante": True, "peephole_rules": tuple(PEEPHOLE_RULES)},
+    }
+    print(f"{broj_programa} programa od {broj_redaka} redaka")
+    ispisi_usporedbu(*usporedi_nacine(programi, nacini), "stog")
+
+
+# najgori slucajevi za MUL i DIV: izvedene naredbe i taktovi cijelog programa s prvotnim potprogramima
+# (ponavljano zbrajanje/oduzimanje, do granice koraka) i s brzima (najvise 32 prolaza); zatim mnozenje
+# i dijeljenje konstantom: prvotni poziv, brzi poziv (konstanta u varijabli) i naredbe bez poziva;
+# na kraju isti korpus kao za --konstante s prvotnim i brzim potprogramima
+def izmjeri_mnozenje(najvise_koraka=2_000_000):
+    def izvedi_program(izvorni_kod, **argumenti):
+        frisc = io.StringIO()
+        generiraj(leksiraj(izvorni_kod), frisc, **argumenti)
+        try:
+            izvodenje = izvedi(frisc.getvalue(), najvise_koraka)
+        except PredugoIzvodenje:
+            return None
+        return izvodenje
+
+    def opis(izvodenje):
+        if izvodenje is None:
+            return f"{'> ' + str(najvise_koraka):>10} naredbi {'-':>10}"
+        return f"{izvodenje.instrukcije:10d} naredbi {izvodenje.taktovi:10d} taktova"
+
+    print(f"{'':28} {'prvotni MUL/DIV':37}  brzi MUL/DIV")
+    for a, op, b in ((7, "*", 9), (1000, "*", 1000), (3, "*", 2147483647), (-1, "*", -1),
+                     (100, "/", 7), (2147483647, "/", 1), (-2147483647, "/", 3), (2147483647, "/", 2147483647)):
+        izvorni_kod = f"a = 0 - {-a}\n" if a < 0 else f"a = {a}\n"
+        izvorni_kod += (f"b = 0 - {-b}\n" if b < 0 else f"b = {b}\n") + f"rez = a {op} b\n"
+        print(f"{f'{a} {op} {b}':28} {opis(izvedi_program(izvorni_kod)):37}"
+              f"  {opis(izvedi_program(izvorni_kod, brzi_md=True))}")
+
+    print(f"\n{'':14} {'prvotni poziv':37}  {'brzi poziv':37}  bez poziva")
+    for op, c in (("*", "8"), ("*", "10"), ("*", "7"), ("*", "100"), ("/", "16"), ("/", "4")):
+        konstanta = f"x = 0 - 123456\nrez = x {op} {c}\n"
+        varijabla = f"x = 0 - 123456\nc = {c}\nrez = x {op} c\n"
+        print(f"{'x ' + op + ' ' + c:14} {opis(izvedi_program(konstanta)):37}"
+              f"  {opis(izvedi_program(varijabla, brzi_md=True)):37}  {opis(izvedi_program(konstanta, brzi_md=True))}")
+
+    programi = [generiraj_izvorni_kod(40, seed) for seed in range(200)]
+    print("\n200 programa od 40 redaka")
+    nacini = {"prvotni MUL/DIV": {}, "brzi MUL/DIV": {"brzi_md": True}}
+    ispisi_usporedbu(*usporedi_nacine(programi, nacini, najvise_koraka), "prvotni MUL/DIV")
+    zavrseni = {naziv: 0 for naziv in nacini}
+    for izvorni_kod in programi:
+        for naziv, argumenti in nacini.items():
+            zavrseni[naziv] += izvedi_program(izvorni_kod, **argumenti) is not None
+    print("zavrseno do granice koraka: " + ", ".join(f"{naziv} {broj}" for naziv, broj in zavrseni.items()))
+
+
+# ugnijezdene petlje s granicom u varijabli: taktovi bez i s optimizacijom petlji (granica izracunata
+# jednom, brojac u registru, jedan CMP i skok) te usteda po prolazu najdublje petlje, za tijelo koje
+# zbraja brojace i tijelo koje ih mnozi (poziv MUL mijenja vecinu registara)
+def izmjeri_petlje(n=10):
+    nacini = {
+        "stog": {"brzi_md": True},
+        "registri": {"registri": True, "brzi_md": True},
+        "registri + konstante + peephole": {"registri": True, "konstante": True,
+                                            "peephole_rules": tuple(PEEPHOLE_RULES), "brzi_md": True},
+    }
+    print(f"{'':58}{'bez':>11} {'s petljama':>12}  usteda po prolazu")
+    for dubina in (1, 2, 3):
+        brojaci = "ijk"[:dubina]
+        for opis, operator in (("zbroj brojaca", " + "), ("umnozak brojaca", " * ")):
+            izvorni_kod = "n = %d\nrez = 0\n" % n
+            for razina, brojac in enumerate(brojaci):
+                izvorni_kod += "  " * razina + f"za {brojac} od 1 do n\n"
+            izvorni_kod += "  " * dubina + f"rez = rez + {operator.join(brojaci)}\n"
+            izvorni_kod += "".join("  " * razina + "az\n" for razina in reversed(range(dubina)))
+            niz_tokena = leksiraj(izvorni_kod)
+            for naziv, argumenti in nacini.items():
+                taktovi = []
+                rezultati = set()
+                for petlje in (False, True):
+                    frisc = io.StringIO()
+                    generiraj(niz_tokena, frisc, petlje=petlje, **argumenti)
+                    izvodenje = izvedi(frisc.getvalue())
+                    taktovi.append(izvodenje.taktovi)
+                    rezultati.add(izvodenje.registri[6])
+                print(f"dubina {dubina}, {opis:15}  {naziv:31} {taktovi[0]:10d} {taktovi[1]:12d}"
+                      f"  {(taktovi[0] - taktovi[1]) / n ** dubina:6.1f} taktova"
+                      + ("" if len(rezultati) == 1 else "  RAZLICITI REZULTATI!"))
+
+
+# programi s petljama s konstantnim granicama (od 1 do 4 ... 100, dijelom ugnijezdene), u tijelu
+# pridruzivanja koja koriste brojac
+def program_s_petljama(rnd, broj_petlji=4):
+    redci = ["x = 1", "y = 2", "rez = 0"]
+    for _ in range(broj_petlji):
+        brojaci = ["i", "j"][:rnd.randint(1, 2)]
+        for razina, brojac in enumerate(brojaci):
+            redci.append("  " * razina + f"za {brojac} od 1 do {rnd.choice([2, 4, 8, 16, 50, 100])}")
+        for _ in range(rnd.randint(1, 3)):
+            ime = rnd.choice(["x", "y", "rez"])
+            redci.append("  " * len(brojaci) + f"{ime} = {ime} + {rnd.choice(brojaci)} {rnd.choice('+-*')} "
+                         f"{rnd.choice(['x', 'y', str(rnd.randint(1, 9))])}")
+        redci += ["  " * razina + "az" for razina in reversed(range(len(brojaci)))]
+    redci.append("rez = rez + x + y")
+    return "\n".join(redci) + "\n"
+
+
+# odmotavanje petlji s konstantnim granicama: velicina koda i izvedene naredbe za razlicite faktore,
+# na stogu i uz registre, konstante i peephole, nad programima s takvim petljama i nad korpusom
+# iz lab_1 (u njemu su granice od i do rijetko obje konstantne)
+def izmjeri_odmotavanje(broj_programa=200):
+    rnd = random.Random(0)
+    korpusi = {
+        "petlje s konstantnim granicama": [program_s_petljama(rnd) for _ in range(broj_programa)],
+        "korpus iz lab_1": [generiraj_izvorni_kod(40, seed) for seed in range(broj_programa)],
+    }
+    optimizirano = {"registri": True, "konstante": True, "peephole_rules": tuple(PEEPHOLE_RULES), "brzi_md": True}
+    for opis, programi in korpusi.items():
+        print(f"{broj_programa} programa: {opis}")
+        for osnova, argumenti in (("stog", {"brzi_md": True}), ("registri + konstante + peephole", optimizirano)):
+            nacini = {osnova: argumenti}
+            nacini.update({f"{osnova}, faktor {faktor}": dict(argumenti, odmotavanje=faktor) for faktor in (1, 2, 4, 8)})
+            ispisi_usporedbu(*usporedi_nacine(programi, nacini), osnova)
+        print()
+
+
+def preko_medukoda(prolazi):
+    def generator(niz_tokena, frisc):
+        Medukod.generiraj(niz_tokena, frisc, prolazi)
+        return Counter()
+    return generator
+
+
+# generiranje preko medukoda: trajanje svake faze i prolaza za velike programe (uz izravno generiranje za
+# usporedbu), zatim velicina koda i izvedene naredbe nad korpusom prema izravnom generiranju (uz brze
+# MUL i DIV, kao u medukodu)
+def izmjeri_medukod(broj_programa=200):
+    for broj_redaka in (2000, 20000):
+        niz_tokena = leksiraj(generiraj_izvorni_kod(broj_redaka))
+        izravno = najbolje_vrijeme(lambda: generiraj(niz_tokena, io.StringIO()), 3)
+        najbolji = None
+        for _ in range(3):
+            zapisi = Medukod.generiraj(niz_tokena, io.StringIO())
+            if najbolji is None or sum(z.trajanje for z in zapisi) < sum(z.trajanje for z in najbolji):
+                najbolji = zapisi
+        print(f"{broj_redaka} redaka, {len(niz_tokena)} tokena (izravno generiranje {izravno * 1000:.2f} ms)")
+        Medukod.ispisi_vremena(najbolji, sys.stdout)
+        print()
+
+    programi = [generiraj_izvorni_kod(40, seed) for seed in range(broj_programa)]
+    nacini = {
+        "stog": {"brzi_md": True},
+        "registri + konstante + peephole": {"registri": True, "konstante": True,
+                                            "peephole_rules": tuple(PEEPHOLE_RULES), "brzi_md": True},
+        "medukod, bez prolaza": preko_medukoda(()),
+        "medukod": preko_medukoda(Medukod.ZADANI_PROLAZI),
+    }
+    print(f"{broj_programa} programa od 40 redaka")
+    ispisi_usporedbu(*usporedi_nacine(programi, nacini), "stog")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--medukod":
+        izmjeri_medukod()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--odmotavanje":
+        izmjeri_odmotavanje()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--petlje":
+        izmjeri_petlje()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--mnozenje":
+        izmjeri_mnozenje()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--peephole":
+        izmjeri_peephole()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--konstante":
+        izmjeri_konstante()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--registri":
+        izmjeri_registre()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--spremiste":
+        izmjeri_spremiste()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--visestruko":
+        izmjeri_visestruko(int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--posluzitelj":
+        izmjeri_posluzitelj()
+        return
+
+    for broj_redaka in (20, 200, 2000):
+        izmjeri(broj_redaka)
+
+
+if __name__ == "__main__":
+    main()
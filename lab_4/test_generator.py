@@ -0,0 +1,104 @@
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_4 import Medukod
+from lab_4.FRISCGenerator import generiraj
+from lab_4.FRISCSimulator import GreskaSimulatora, izvedi, s_predznakom
+from lab_4.Prevoditelj import leksiraj
+
+# provjere generiranog koda u simulatoru: optimizirani nacini generiranja moraju dati isti rezultat
+# (R6) kao generiranje bez optimizacija; pokrece se s pytest ili izravno (python test_generator.py)
+
+
+def generirano(izvorni_kod, **argumenti):
+    frisc = io.StringIO()
+    generiraj(leksiraj(izvorni_kod), frisc, **argumenti)
+    return frisc.getvalue()
+
+
+def generirano_preko_medukoda(izvorni_kod, prolazi=Medukod.ZADANI_PROLAZI):
+    frisc = io.StringIO()
+    Medukod.generiraj(leksiraj(izvorni_kod), frisc, prolazi)
+    return frisc.getvalue()
+
+
+def rezultat(izvorni_kod, **argumenti):
+    return s_predznakom(izvedi(generirano(izvorni_kod, **argumenti)).registri[6])
+
+
+# granica petlje se racuna nakon uvecanja brojaca, pa konstanta koju tijelo pridruzi brojacu ne smije
+# uci u granicu
+def test_granica_nakon_pridruzivanja_brojacu():
+    izvorni_kod = "x = 0\nza i od 1 do i + 5 - x\n  x = x + 1\n  i = 3\naz\nrez = x\n"
+    ocekivano = rezultat(izvorni_kod)
+    assert ocekivano == 6
+    assert rezultat(izvorni_kod, konstante=True) == ocekivano
+    assert rezultat(izvorni_kod, konstante=True, petlje=True) == ocekivano
+    assert rezultat(izvorni_kod, registri=True, konstante=True, petlje=True) == ocekivano
+
+
+# MOVE prima samo 20-bitni broj s predznakom (simulator odbacuje vece), pa se izracunate (i velike zadane)
+# konstante citaju iz memorije
+def test_velike_konstante():
+    izvorni_kod = "a = 1000 * 1000\nb = 3000000\nrez = a + 1 - b\n"
+    programi = [generirano(izvorni_kod, **argumenti)
+                for argumenti in ({}, {"konstante": True}, {"registri": True, "konstante": True})]
+    programi += [generirano_preko_medukoda(izvorni_kod, prolazi) for prolazi in ((), Medukod.ZADANI_PROLAZI)]
+    for frisc in programi:
+        assert s_predznakom(izvedi(frisc).registri[6]) == -1999999
+
+
+# i bez optimizacija zadana konstanta izvan 20 bitova cita se iz memorije (K0), a ostale ostaju MOVE %D
+def test_velika_konstanta_bez_optimizacija():
+    frisc = generirano("a = 3000000\nrez = a - 7\n")
+    glavni = frisc[frisc.index("; ========== START MAIN"):frisc.index("; ========== POTPROGRAMI")]
+    assert glavni.splitlines()[1:] == [
+        "  LOAD R0, (K0)",
+        "  SUB R7, 4, R7",
+        "  STORE R0, (R7)",
+        "  LOAD R0, (R7)",
+        "  ADD R7, 4, R7",
+        "  STORE R0, (V0)",
+        "  LOAD R0, (V0)",
+        "  SUB R7, 4, R7",
+        "  STORE R0, (R7)",
+        "  MOVE %D 7, R0",
+        "  SUB R7, 4, R7",
+        "  STORE R0, (R7)",
+        "  LOAD R1, (R7)",
+        "  ADD R7, 4, R7",
+        "  LOAD R0, (R7)",
+        "  ADD R7, 4, R7",
+        "  SUB R0, R1, R2",
+        "  SUB R7, 4, R7",
+        "  STORE R2, (R7)",
+        "  LOAD R0, (R7)",
+        "  ADD R7, 4, R7",
+        "  STORE R0, (V1)",
+        "  LOAD R6, (V1)",
+        "  HALT",
+        "; ========== DEKLARACIJA VARIJABLI ===========",
+        "V0  DW 0   ; var=a, scope=0",
+        "V1  DW 0   ; var=rez, scope=0",
+        "K0  DW %D 3000000",
+    ]
+    assert s_predznakom(izvedi(frisc).registri[6]) == 2999993
+
+
+def test_simulator_odbacuje_velike_neposredne():
+    for redak in ("  MOVE %D 524288, R0", "  ADD R0, %D -524289, R0", "  CMP R0, 80000"):
+        try:
+            izvedi(redak + "\n  HALT\n")
+        except GreskaSimulatora:
+            continue
+        raise AssertionError(f"prihvacena neposredna vrijednost izvan 20 bitova: {redak}")
+    assert izvedi("  MOVE %D -524288, R0\n  ADD R0, %D 524287, R0\n  HALT\n").registri[0] == 0xFFFFFFFF
+
+
+if __name__ == "__main__":
+    for naziv, test in list(globals().items()):
+        if naziv.startswith("test_"):
+            test()
+            print(f"{naziv}: OK")
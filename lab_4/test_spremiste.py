@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from lab_4.Spremiste import Spremiste
+
+# granica velicine spremista mora vrijediti i kad svaki proces (ovdje svaka instanca Spremiste) zapise
+# samo jedan zapis; pokrece se s pytest ili izravno (python test_spremiste.py)
+
+NAJVECA_VELICINA = 20000
+VELICINA_ZAPISA = 1000
+
+
+def velicina_na_disku(mapa):
+    return sum(os.path.getsize(os.path.join(podmapa, naziv))
+               for podmapa, _, datoteke in os.walk(mapa) for naziv in datoteke)
+
+
+def test_granica_kroz_vise_instanci():
+    with tempfile.TemporaryDirectory() as mapa:
+        kljucevi = []
+        for i in range(100):
+            spremiste = Spremiste(mapa, NAJVECA_VELICINA)
+            kljuc = spremiste.kljuc("leksicki", str(i).encode())
+            spremiste.spremi("leksicki", kljuc, b"x" * VELICINA_ZAPISA)
+            kljucevi.append(kljuc)
+            assert velicina_na_disku(mapa) <= NAJVECA_VELICINA
+        # brisu se najdavnije koristeni zapisi, pa zadnji zapis ostaje
+        assert Spremiste(mapa, NAJVECA_VELICINA).dohvati("leksicki", kljucevi[-1]) == b"x" * VELICINA_ZAPISA
+        Spremiste(mapa, NAJVECA_VELICINA).pocisti()
+        assert velicina_na_disku(mapa) <= NAJVECA_VELICINA
+
+
+if __name__ == "__main__":
+    for naziv, test in list(globals().items()):
+        if naziv.startswith("test_"):
+            test()
+            print(f"{naziv}: OK")